@@ -1,6 +1,11 @@
 # -*- mode: python ; coding: utf-8 -*-
+import subprocess
+import sys
 from PyInstaller.utils.hooks import collect_all
 
+# Plantilla de BD para el primer arranque (assets/plantilla.db, se empaqueta con assets)
+subprocess.run([sys.executable, '-m', 'data.database.plantilla'], check=True)
+
 datas = [('assets', 'assets')]
 binaries = []
 hiddenimports = []
@@ -1,14 +1,10 @@
 import flet as ft
-import sqlite3
 import os
 import sys
 import tempfile
-from data.database.estructuraBD import (
-    crear_estructura_db,
-    poblar_tablas_catalogo,
-    poblar_cuentas_contables,
-)
-from src.utils.paths import get_db_path
+from data.database.plantilla import preparar_db
+from src.utils.contexto import iniciar_contexto
+from src.utils.arranque import registrar_primer_render
 
 
 def _configure_tk_env():
@@ -39,33 +35,46 @@ def main(page: ft.Page):
     page.padding = 0
     page.theme_mode = ft.ThemeMode.LIGHT
 
-    # Inicializar / reparar BD si está vacía o incompleta
-    db_path = get_db_path()
+    # Ruta de la BD resuelta una sola vez; páginas y servicios la leen del contexto
+    contexto = iniciar_contexto()
+    db_path = contexto.db_path
 
-    # Inicializar / reparar BD en AppData si falta o está incompleta
-    needs_init = not os.path.exists(db_path) or os.path.getsize(db_path) == 0
+    # Inicializar (copia de la plantilla), reparar o migrar la BD según su estado
     try:
-        if not needs_init:
-            conn = sqlite3.connect(db_path)
-            conn.execute("SELECT 1 FROM plan_cuentas LIMIT 1")
-            conn.execute("SELECT 1 FROM libro_diario LIMIT 1")
-            conn.close()
-    except Exception:
-        needs_init = True
-
-    if needs_init:
-        try:
-            crear_estructura_db(db_path)
-            poblar_tablas_catalogo(db_path)
-            poblar_cuentas_contables(db_path)
-        except Exception as ex:
-            page.snack_bar = ft.SnackBar(
-                content=ft.Text(f"No se pudo inicializar la base de datos: {ex}"),
-                bgcolor=ft.Colors.RED_600,
-                duration=6000,
+        ok = preparar_db(db_path)
+    except Exception as ex:
+        print(f"❌ Error preparando la BD: {ex}")
+        ok = False
+    if not ok:
+        page.snack_bar = ft.SnackBar(
+            content=ft.Text("No se pudo inicializar la base de datos"),
+            bgcolor=ft.Colors.RED_600,
+            duration=6000,
+        )
+        page.snack_bar.open = True
+        # Con el esquema a medio migrar no se muestra nada que lea o escriba la BD:
+        # un comprobante guardado ahora se volvería a convertir en la próxima migración
+        page.add(
+            ft.Container(
+                expand=True,
+                alignment=ft.Alignment(0, 0),
+                content=ft.Column(
+                    [
+                        ft.Icon(ft.Icons.ERROR_OUTLINE, color=ft.Colors.RED_600, size=48),
+                        ft.Text("No se pudo preparar la base de datos", size=18, weight=ft.FontWeight.BOLD),
+                        ft.Text(
+                            f"{db_path}\nCierre otras ventanas que la estén usando y vuelva a abrir la aplicación.",
+                            text_align=ft.TextAlign.CENTER,
+                        ),
+                    ],
+                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                    tight=True,
+                ),
             )
-            page.snack_bar.open = True
-            page.update()
+        )
+        page.update()
+        registrar_primer_render()
+        return
 
     # Renderizar menú principal (menu_page crea y registra su propio FilePicker)
     content = menu_page(page)
@@ -74,3 +83,4 @@ def main(page: ft.Page):
     else:
         page.add(ft.Text("Error cargando menú"))
     page.update()
+    registrar_primer_render()
@@ -28,6 +28,10 @@ def main():
         print("No se encontraron carpetas tcl/tk en el Python base.")
         sys.exit(1)
 
+    # Plantilla de BD para el primer arranque (assets/plantilla.db, se empaqueta con assets)
+    raiz = Path(__file__).resolve().parent
+    subprocess.run([sys.executable, "-m", "data.database.plantilla"], cwd=raiz, check=True)
+
     # Build command with add-data for Tkinter runtime
     cmd = [
         "flet",
@@ -1,6 +1,8 @@
-import sqlite3
 from sqlite3 import Error
 
+from data.database.conexion import obtener_conexion
+from data.catalogoCache import invalidarCatalogo
+
 def actualizar_cuenta_contable(db_path: str, id_cuenta_contable: int, id_generico: int, descripcion: str, nombre_cuenta: str, codigo_cuenta: str) -> bool:
     """Actualiza una cuenta contable existente.
 
@@ -8,8 +10,7 @@ def actualizar_cuenta_contable(db_path: str, id_cuenta_contable: int, id_generic
     """
     conn = None
     try:
-        conn = sqlite3.connect(db_path, timeout=5)
-        conn.execute("PRAGMA busy_timeout=3000")
+        conn = obtener_conexion(db_path)
         cursor = conn.cursor()
         cursor.execute(
             """UPDATE cuenta_contable
@@ -18,13 +19,10 @@ def actualizar_cuenta_contable(db_path: str, id_cuenta_contable: int, id_generic
             (id_generico, descripcion, nombre_cuenta, codigo_cuenta, id_cuenta_contable)
         )
         conn.commit()
+        invalidarCatalogo(db_path)
         return cursor.rowcount > 0
     except Error as e:
         print(f"Error actualizando cuenta contable: {e}")
-        return False
-    finally:
         if conn:
-            try:
-                conn.close()
-            except Exception:
-                pass
+            conn.rollback()
+        return False
@@ -0,0 +1,72 @@
+import re
+from sqlite3 import Error
+from typing import Any, Dict, List
+
+from data.database.conexion import obtener_conexion
+
+# Peso de cada columna de asiento_fts en bm25: la descripción pesa más que las cuentas
+_PESO_DESCRIPCION = 2.0
+_PESO_CUENTAS = 1.0
+
+
+def consulta_fts(texto: str) -> str:
+    """Convierte lo que escribe el usuario en una consulta FTS5 segura.
+
+    Cada palabra se busca como prefijo ("alquil" encuentra "alquiler") y todas
+    deben aparecer, en la descripción o en las cuentas del asiento. Las comillas
+    y operadores de FTS5 se tratan como texto. Devuelve "" si no hay palabras.
+    """
+    palabras = re.findall(r"\w+", texto or "")
+    return " ".join(f'"{p}"*' for p in palabras)
+
+
+def buscarAsientos(
+    db_path: str,
+    texto: str,
+    id_libro_diario: int | None = None,
+    limite: int = 50,
+) -> List[Dict[str, Any]]:
+    """
+    Busca asientos por texto en uno o en todos los libros, ordenados por relevancia (bm25).
+    Estructura: {id_asiento, id_libro_diario, numero_asiento, fecha, descripcion,
+                 nombre_empresa, ano, id_mes}
+    """
+    consulta = consulta_fts(texto)
+    if not consulta:
+        return []
+    filtro, params = "", [consulta]
+    if id_libro_diario is not None:
+        filtro = "AND a.id_libro_diario = ?"
+        params.append(id_libro_diario)
+    params.append(limite)
+    try:
+        cur = obtener_conexion(db_path).cursor()
+        cur.execute(
+            f"""
+            SELECT a.id_asiento, a.id_libro_diario, a.numero_asiento, a.fecha, a.descripcion,
+                   l.nombre_empresa, l.ano, l.id_mes
+            FROM asiento_fts f
+            JOIN asiento a ON a.id_asiento = f.rowid
+            JOIN libro_diario l ON l.id_libro_diario = a.id_libro_diario
+            WHERE asiento_fts MATCH ? {filtro}
+            ORDER BY bm25(asiento_fts, {_PESO_DESCRIPCION}, {_PESO_CUENTAS}), a.fecha DESC
+            LIMIT ?
+            """,
+            params
+        )
+        return [
+            {
+                "id_asiento": r[0],
+                "id_libro_diario": r[1],
+                "numero_asiento": r[2],
+                "fecha": r[3] or "",
+                "descripcion": r[4] or "",
+                "nombre_empresa": r[5] or "",
+                "ano": r[6],
+                "id_mes": r[7],
+            }
+            for r in cur.fetchall()
+        ]
+    except Error as e:
+        print(f"Database error buscando asientos ({texto!r}): {e}")
+        return []
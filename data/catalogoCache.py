@@ -0,0 +1,182 @@
+import os
+import re
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from data.models.cuenta import CuentaContable, Generico, Rubro, TipoCuenta
+from src.utils.texto import normalizar
+
+T = TypeVar("T")
+
+
+@dataclass
+class CatalogoCuentas:
+    """Cuentas de un plan con su jerarquía enlazada e índices por id y por código."""
+    id_plan_cuenta: Optional[int]
+    cuentas: List[CuentaContable] = field(default_factory=list)
+    por_id: Dict[int, CuentaContable] = field(default_factory=dict, repr=False)
+    por_codigo: Dict[str, CuentaContable] = field(default_factory=dict, repr=False)
+    _indice_busqueda: Optional["_IndiceBusqueda"] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def desde_cuentas(cls, id_plan_cuenta: Optional[int], cuentas: List[CuentaContable]) -> "CatalogoCuentas":
+        catalogo = cls(id_plan_cuenta=id_plan_cuenta, cuentas=cuentas)
+        for c in cuentas:
+            catalogo.por_id[c.id_cuenta_contable] = c
+            codigo = (c.codigo_cuenta or "").strip()
+            # Ante códigos repetidos gana la primera cuenta, como en las búsquedas lineales
+            if codigo and codigo not in catalogo.por_codigo:
+                catalogo.por_codigo[codigo] = c
+        return catalogo
+
+    def buscar_por_codigo(self, codigo: str | None) -> Optional[CuentaContable]:
+        return self.por_codigo.get((codigo or "").strip())
+
+    def buscar_por_prefijo(self, prefijo: str, limite: int = 50) -> List[CuentaContable]:
+        """Cuentas cuyo código empieza con `prefijo` (sin distinguir mayúsculas), en orden de código."""
+        indice = self._indice()
+        p = (prefijo or "").strip().lower()
+        codigos, cuentas = indice.codigos, indice.cuentas_por_codigo
+        i = bisect_left(codigos, p)
+        resultado: List[CuentaContable] = []
+        while i < len(codigos) and len(resultado) < limite and codigos[i].startswith(p):
+            resultado.append(cuentas[i])
+            i += 1
+        return resultado
+
+    def buscar_por_nombre(self, texto: str, limite: int = 50) -> List[CuentaContable]:
+        """Cuentas con una palabra del nombre que empiece por cada palabra de `texto`.
+
+        Sin distinguir mayúsculas ni acentos; el resultado sigue el orden del catálogo.
+        """
+        indice = self._indice()
+        posiciones: set[int] | None = None
+        for palabra in re.findall(r"\w+", normalizar(texto)):
+            coincidencias: set[int] = set()
+            i = bisect_left(indice.tokens, palabra)
+            while i < len(indice.tokens) and indice.tokens[i].startswith(palabra):
+                coincidencias.update(indice.por_token[indice.tokens[i]])
+                i += 1
+            posiciones = coincidencias if posiciones is None else posiciones & coincidencias
+            if not posiciones:
+                return []
+        if posiciones is None:
+            return []
+        return [self.cuentas[i] for i in sorted(posiciones)[:limite]]
+
+    def _indice(self) -> "_IndiceBusqueda":
+        # Se arma la primera vez que se busca; el catálogo no cambia después de creado
+        indice = self._indice_busqueda
+        if indice is None:
+            indice = self._indice_busqueda = _IndiceBusqueda.desde_cuentas(self.cuentas)
+        return indice
+
+
+@dataclass
+class _IndiceBusqueda:
+    """Códigos ordenados (para bisect) y palabras del nombre -> posiciones en el catálogo."""
+    codigos: List[str]
+    cuentas_por_codigo: List[CuentaContable]
+    tokens: List[str]
+    por_token: Dict[str, List[int]]
+
+    @classmethod
+    def desde_cuentas(cls, cuentas: List[CuentaContable]) -> "_IndiceBusqueda":
+        pares = sorted(((c.codigo_cuenta or "").strip().lower(), i) for i, c in enumerate(cuentas))
+        por_token: Dict[str, List[int]] = {}
+        for i, c in enumerate(cuentas):
+            for token in set(re.findall(r"\w+", normalizar(c.nombre_cuenta))):
+                por_token.setdefault(token, []).append(i)
+        return cls(
+            codigos=[codigo for codigo, _ in pares],
+            cuentas_por_codigo=[cuentas[i] for _, i in pares],
+            tokens=sorted(por_token),
+            por_token=por_token,
+        )
+
+
+@dataclass
+class JerarquiaCatalogo:
+    """Árbol tipo → rubro → genérico de un plan, con los objetos ya enlazados entre sí."""
+    id_plan_cuenta: Optional[int]
+    tipos: List[TipoCuenta] = field(default_factory=list)
+    rubros: Dict[int, Rubro] = field(default_factory=dict, repr=False)
+    genericos: Dict[int, Generico] = field(default_factory=dict, repr=False)
+    rubros_por_tipo: Dict[int, List[Rubro]] = field(default_factory=dict, repr=False)
+    genericos_por_rubro: Dict[int, List[Generico]] = field(default_factory=dict, repr=False)
+
+    def rubros_de(self, id_tipo_cuenta: int) -> List[Rubro]:
+        return self.rubros_por_tipo.get(int(id_tipo_cuenta), [])
+
+    def genericos_de(self, id_rubro: int) -> List[Generico]:
+        return self.genericos_por_rubro.get(int(id_rubro), [])
+
+
+# (ruta absoluta de la BD, id_plan_cuenta o None = todas) -> catálogo / jerarquía
+_cache: Dict[Tuple[str, Optional[int]], CatalogoCuentas] = {}
+_cache_jerarquia: Dict[Tuple[str, Optional[int]], JerarquiaCatalogo] = {}
+_lock = threading.Lock()
+# Se incrementa en cada invalidación para descartar cargas que empezaron antes
+_generacion = 0
+
+
+def _clave(db_path: str, id_plan_cuenta: Optional[int]) -> Tuple[str, Optional[int]]:
+    return os.path.abspath(str(db_path)), (None if id_plan_cuenta is None else int(id_plan_cuenta))
+
+
+def obtenerCatalogo(db_path: str, id_plan_cuenta: Optional[int] = None) -> CatalogoCuentas:
+    """Devuelve el catálogo del plan (o de todas las cuentas si es None).
+
+    Se arma desde la BD solo la primera vez; las siguientes llamadas lo toman
+    de memoria hasta que una escritura sobre el catálogo lo invalide.
+    Lanza sqlite3.Error si la carga falla (no se guarda un catálogo vacío por error).
+    """
+    from data.obtenerCuentas import cargarCuentasContables
+    return _obtener(
+        _cache, _clave(db_path, id_plan_cuenta),
+        lambda plan: CatalogoCuentas.desde_cuentas(plan, cargarCuentasContables(db_path, plan)),
+    )
+
+
+def obtenerJerarquia(db_path: str, id_plan_cuenta: Optional[int] = None) -> JerarquiaCatalogo:
+    """Devuelve el árbol tipo/rubro/genérico del plan (o de todos si es None).
+
+    Se arma con una sola consulta y se comparte entre la lista de cuentas y los
+    diálogos de alta y edición hasta la próxima invalidación del catálogo.
+    Lanza sqlite3.Error si la carga falla.
+    """
+    from data.obtenerCuentas import cargarJerarquiaCatalogo
+    return _obtener(
+        _cache_jerarquia, _clave(db_path, id_plan_cuenta),
+        lambda plan: cargarJerarquiaCatalogo(db_path, plan),
+    )
+
+
+def _obtener(cache: Dict[Tuple[str, Optional[int]], T], clave: Tuple[str, Optional[int]], cargar: Callable[[Optional[int]], T]) -> T:
+    valor = cache.get(clave)
+    if valor is not None:
+        return valor
+    generacion = _generacion
+    valor = cargar(clave[1])
+    with _lock:
+        if generacion != _generacion:
+            # Hubo una escritura durante la carga: se usa pero no se guarda
+            return valor
+        # Si otro hilo lo cargó mientras tanto, se conserva el primero
+        return cache.setdefault(clave, valor)
+
+
+def invalidarCatalogo(db_path: str | None = None) -> None:
+    """Descarta los catálogos en memoria (de una BD o de todas)."""
+    global _generacion
+    with _lock:
+        _generacion += 1
+        for cache in (_cache, _cache_jerarquia):
+            if db_path is None:
+                cache.clear()
+                continue
+            ruta = os.path.abspath(str(db_path))
+            for clave in [k for k in cache if k[0] == ruta]:
+                del cache[clave]
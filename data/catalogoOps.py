@@ -1,6 +1,8 @@
-import sqlite3
 from typing import Tuple
 
+from data.database.conexion import obtener_conexion
+from data.catalogoCache import invalidarCatalogo
+
 
 def _split_codigo(numero: str):
     partes = (numero or "").split(".")
@@ -12,7 +14,7 @@ def _split_codigo(numero: str):
 def actualizar_tipo_cuenta(db_path: str, id_tipo_cuenta: int, nombre: str, numero: str) -> bool:
     """Actualiza nombre y número de un tipo de cuenta y propaga a rubros/genéricos/cuentas."""
     try:
-        with sqlite3.connect(db_path) as conn:
+        with obtener_conexion(db_path) as conn:
             cur = conn.cursor()
             cur.execute("SELECT numero_cuenta FROM tipo_cuenta WHERE id_tipo_cuenta = ?", (id_tipo_cuenta,))
             old_num = (cur.fetchone() or [""])[0]
@@ -70,6 +72,7 @@ def actualizar_tipo_cuenta(db_path: str, id_tipo_cuenta: int, nombre: str, numer
                         cur.execute("UPDATE cuenta_contable SET codigo_cuenta = ? WHERE id_cuenta_contable = ?", (new_cnum, cid))
 
             conn.commit()
+            invalidarCatalogo(db_path)
             return cur.rowcount > 0
     except Exception as ex:
         print(f"Error actualizando tipo_cuenta {id_tipo_cuenta}: {ex}")
@@ -79,7 +82,7 @@ def actualizar_tipo_cuenta(db_path: str, id_tipo_cuenta: int, nombre: str, numer
 def actualizar_rubro(db_path: str, id_rubro: int, nombre: str, numero: str, id_tipo_cuenta: int | None = None) -> bool:
     """Actualiza nombre, número y (opcional) tipo de un rubro. Propaga a genéricos/cuentas."""
     try:
-        with sqlite3.connect(db_path) as conn:
+        with obtener_conexion(db_path) as conn:
             cur = conn.cursor()
             cur.execute("SELECT numero_cuenta FROM rubro WHERE id_rubro = ?", (id_rubro,))
             old_num = (cur.fetchone() or [""])[0]
@@ -123,6 +126,7 @@ def actualizar_rubro(db_path: str, id_rubro: int, nombre: str, numero: str, id_t
                         cur.execute("UPDATE cuenta_contable SET codigo_cuenta = ? WHERE id_cuenta_contable = ?", (new_cnum, cid))
 
             conn.commit()
+            invalidarCatalogo(db_path)
             return cur.rowcount > 0
     except Exception as ex:
         print(f"Error actualizando rubro {id_rubro}: {ex}")
@@ -132,7 +136,7 @@ def actualizar_rubro(db_path: str, id_rubro: int, nombre: str, numero: str, id_t
 def actualizar_generico(db_path: str, id_generico: int, nombre: str, numero: str, id_rubro: int | None = None) -> bool:
     """Actualiza nombre, número y (opcional) rubro de un genérico. Propaga a cuentas."""
     try:
-        with sqlite3.connect(db_path) as conn:
+        with obtener_conexion(db_path) as conn:
             cur = conn.cursor()
             cur.execute("SELECT numero_cuenta FROM generico WHERE id_generico = ?", (id_generico,))
             old_num = (cur.fetchone() or [""])[0]
@@ -165,6 +169,7 @@ def actualizar_generico(db_path: str, id_generico: int, nombre: str, numero: str
                     cur.execute("UPDATE cuenta_contable SET codigo_cuenta = ? WHERE id_cuenta_contable = ?", (new_cnum, cid))
 
             conn.commit()
+            invalidarCatalogo(db_path)
             return cur.rowcount > 0
     except Exception as ex:
         print(f"Error actualizando generico {id_generico}: {ex}")
@@ -174,13 +179,14 @@ def actualizar_generico(db_path: str, id_generico: int, nombre: str, numero: str
 def eliminar_tipo_cuenta(db_path: str, id_tipo_cuenta: int) -> Tuple[bool, str]:
     """Elimina un tipo de cuenta si no tiene rubros asociados."""
     try:
-        with sqlite3.connect(db_path) as conn:
+        with obtener_conexion(db_path) as conn:
             cur = conn.cursor()
             cur.execute("SELECT COUNT(*) FROM rubro WHERE id_tipo_cuenta = ?", (id_tipo_cuenta,))
             if cur.fetchone()[0] > 0:
                 return False, "No se puede eliminar: tiene rubros asociados."
             cur.execute("DELETE FROM tipo_cuenta WHERE id_tipo_cuenta = ?", (id_tipo_cuenta,))
             conn.commit()
+            invalidarCatalogo(db_path)
             return cur.rowcount > 0, "Tipo de cuenta eliminado" if cur.rowcount > 0 else "No se pudo eliminar"
     except Exception as ex:
         print(f"Error eliminando tipo_cuenta {id_tipo_cuenta}: {ex}")
@@ -190,13 +196,14 @@ def eliminar_tipo_cuenta(db_path: str, id_tipo_cuenta: int) -> Tuple[bool, str]:
 def eliminar_rubro(db_path: str, id_rubro: int) -> Tuple[bool, str]:
     """Elimina un rubro si no tiene genéricos asociados."""
     try:
-        with sqlite3.connect(db_path) as conn:
+        with obtener_conexion(db_path) as conn:
             cur = conn.cursor()
             cur.execute("SELECT COUNT(*) FROM generico WHERE id_rubro = ?", (id_rubro,))
             if cur.fetchone()[0] > 0:
                 return False, "No se puede eliminar: tiene genéricos asociados."
             cur.execute("DELETE FROM rubro WHERE id_rubro = ?", (id_rubro,))
             conn.commit()
+            invalidarCatalogo(db_path)
             return cur.rowcount > 0, "Rubro eliminado" if cur.rowcount > 0 else "No se pudo eliminar"
     except Exception as ex:
         print(f"Error eliminando rubro {id_rubro}: {ex}")
@@ -206,13 +213,14 @@ def eliminar_rubro(db_path: str, id_rubro: int) -> Tuple[bool, str]:
 def eliminar_generico(db_path: str, id_generico: int) -> Tuple[bool, str]:
     """Elimina un genérico si no tiene cuentas asociadas."""
     try:
-        with sqlite3.connect(db_path) as conn:
+        with obtener_conexion(db_path) as conn:
             cur = conn.cursor()
             cur.execute("SELECT COUNT(*) FROM cuenta_contable WHERE id_generico = ?", (id_generico,))
             if cur.fetchone()[0] > 0:
                 return False, "No se puede eliminar: tiene cuentas asociadas."
             cur.execute("DELETE FROM generico WHERE id_generico = ?", (id_generico,))
             conn.commit()
+            invalidarCatalogo(db_path)
             return cur.rowcount > 0, "Genérico eliminado" if cur.rowcount > 0 else "No se pudo eliminar"
     except Exception as ex:
         print(f"Error eliminando generico {id_generico}: {ex}")
@@ -223,7 +231,7 @@ def eliminar_generico(db_path: str, id_generico: int) -> Tuple[bool, str]:
 def crear_tipo_cuenta(db_path: str, nombre: str, numero: str, id_plan_cuenta: int = 0) -> Tuple[bool, str, int]:
     """Crea un tipo de cuenta en el plan indicado. Retorna (ok, msg, new_id)."""
     try:
-        with sqlite3.connect(db_path) as conn:
+        with obtener_conexion(db_path) as conn:
             cur = conn.cursor()
             cur.execute(
                 "INSERT INTO tipo_cuenta (nombre_tipo_cuenta, numero_cuenta, id_plan_cuenta) VALUES (?, ?, ?)",
@@ -231,6 +239,7 @@ def crear_tipo_cuenta(db_path: str, nombre: str, numero: str, id_plan_cuenta: in
             )
             new_id = cur.lastrowid
             conn.commit()
+            invalidarCatalogo(db_path)
             return True, "Tipo de cuenta creado", int(new_id)
     except Exception as ex:
         print(f"Error creando tipo_cuenta: {ex}")
@@ -240,7 +249,7 @@ def crear_tipo_cuenta(db_path: str, nombre: str, numero: str, id_plan_cuenta: in
 def crear_rubro(db_path: str, id_tipo_cuenta: int, nombre: str, numero: str) -> Tuple[bool, str, int]:
     """Crea un rubro asociado a un tipo de cuenta. Retorna (ok, msg, new_id)."""
     try:
-        with sqlite3.connect(db_path) as conn:
+        with obtener_conexion(db_path) as conn:
             cur = conn.cursor()
             cur.execute(
                 "INSERT INTO rubro (id_tipo_cuenta, nombre_rubro, numero_cuenta) VALUES (?, ?, ?)",
@@ -248,6 +257,7 @@ def crear_rubro(db_path: str, id_tipo_cuenta: int, nombre: str, numero: str) ->
             )
             new_id = cur.lastrowid
             conn.commit()
+            invalidarCatalogo(db_path)
             return True, "Rubro creado", int(new_id)
     except Exception as ex:
         print(f"Error creando rubro: {ex}")
@@ -257,7 +267,7 @@ def crear_rubro(db_path: str, id_tipo_cuenta: int, nombre: str, numero: str) ->
 def crear_generico(db_path: str, id_rubro: int, nombre: str, numero: str) -> Tuple[bool, str, int]:
     """Crea un genérico asociado a un rubro. Retorna (ok, msg, new_id)."""
     try:
-        with sqlite3.connect(db_path) as conn:
+        with obtener_conexion(db_path) as conn:
             cur = conn.cursor()
             cur.execute(
                 "INSERT INTO generico (id_rubro, nombre_generico, numero_cuenta) VALUES (?, ?, ?)",
@@ -265,6 +275,7 @@ def crear_generico(db_path: str, id_rubro: int, nombre: str, numero: str) -> Tup
             )
             new_id = cur.lastrowid
             conn.commit()
+            invalidarCatalogo(db_path)
             return True, "Genérico creado", int(new_id)
     except Exception as ex:
         print(f"Error creando genérico: {ex}")
@@ -0,0 +1,116 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from data.database.orden import registrar_funciones
+
+# Conexiones abiertas por hilo y por ruta de BD. sqlite3 no permite compartir
+# una conexión entre hilos, así que cada hilo reutiliza la suya.
+_local = threading.local()
+_lock = threading.Lock()
+_todas: list[sqlite3.Connection] = []
+_generacion = 0
+
+# foreign_keys se deja desactivado: hay datos existentes (p. ej. libros
+# importados con id_mes = 0) que no cumplen las FK declaradas en el esquema.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=134217728",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def _clave(db_path: str) -> str:
+    return os.path.abspath(str(db_path))
+
+
+def _abrir(db_path: str) -> sqlite3.Connection:
+    # check_same_thread=False solo para poder cerrarla desde cerrar_todas_conexiones;
+    # cada conexión se usa únicamente desde el hilo que la abrió.
+    conn = sqlite3.connect(db_path, timeout=5, cached_statements=256, check_same_thread=False)
+    for pragma in PRAGMAS:
+        try:
+            conn.execute(pragma)
+        except sqlite3.Error as e:
+            print(f"No se pudo aplicar '{pragma}': {e}")
+    # Las bases anteriores a la migración 10 tienen triggers de `orden` que llaman a clave_orden
+    registrar_funciones(conn)
+    return conn
+
+
+def abrir_solo_lectura(db_path: str) -> sqlite3.Connection:
+    """Abre una conexión nueva de solo lectura (mode=ro, query_only).
+
+    Pensada para procesos que solo leen, como la exportación en lote: no se
+    comparte ni se registra, así que la cierra quien la abre.
+    """
+    uri = Path(_clave(db_path)).as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, timeout=5, cached_statements=256)
+    # journal_mode y synchronous no aplican a una conexión de lectura
+    for pragma in ("PRAGMA query_only=ON", *PRAGMAS[2:]):
+        try:
+            conn.execute(pragma)
+        except sqlite3.Error as e:
+            print(f"No se pudo aplicar '{pragma}': {e}")
+    registrar_funciones(conn)
+    return conn
+
+
+def obtener_conexion(db_path: str | None = None) -> sqlite3.Connection:
+    """Devuelve la conexión compartida del hilo actual para la BD indicada.
+
+    La conexión se crea la primera vez con los PRAGMAs de rendimiento y se
+    reutiliza en las llamadas siguientes. No debe cerrarse desde quien la usa;
+    para confirmar o deshacer cambios usar ``with conn:`` o commit/rollback.
+    """
+    if db_path is None:
+        from src.utils.contexto import obtener_contexto
+        db_path = obtener_contexto().db_path
+    conexiones = getattr(_local, "conexiones", None)
+    if conexiones is None or getattr(_local, "generacion", None) != _generacion:
+        conexiones = _local.conexiones = {}
+        _local.generacion = _generacion
+    clave = _clave(db_path)
+    conn = conexiones.get(clave)
+    if conn is None:
+        conn = _abrir(clave)
+        conexiones[clave] = conn
+        with _lock:
+            _todas.append(conn)
+    return conn
+
+
+def cerrar_conexiones(db_path: str | None = None) -> None:
+    """Cierra las conexiones compartidas del hilo actual (o solo las de db_path)."""
+    conexiones = getattr(_local, "conexiones", None) or {}
+    claves = [_clave(db_path)] if db_path is not None else list(conexiones)
+    for clave in claves:
+        conn = conexiones.pop(clave, None)
+        if conn is None:
+            continue
+        with _lock:
+            if conn in _todas:
+                _todas.remove(conn)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def cerrar_todas_conexiones() -> None:
+    """Cierra todas las conexiones abiertas por cualquier hilo (p. ej. al salir
+    o antes de reemplazar el archivo de la BD)."""
+    global _generacion
+    with _lock:
+        pendientes = list(_todas)
+        _todas.clear()
+        _generacion += 1
+    for conn in pendientes:
+        try:
+            conn.close()
+        except Exception:
+            pass
@@ -0,0 +1,559 @@
+import sqlite3
+from sqlite3 import Error
+
+from data.database.conexion import obtener_conexion
+from data.database.orden import registrar_funciones, sql_clave_orden
+
+
+def _agregar_columna(cursor: sqlite3.Cursor, table: str, column: str, ddl: str) -> None:
+    """Agrega la columna si todavía no existe (bases creadas con versiones viejas)."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    cols = [row[1] for row in cursor.fetchall()]
+    if column not in cols:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {ddl}")
+        print(f"✅ Columna agregada: {table}.{column}")
+
+
+def _migracion_1(cursor: sqlite3.Cursor) -> None:
+    """Columnas agregadas después de la primera versión del esquema."""
+    _agregar_columna(cursor, "libro_diario", "origen", "origen TEXT NOT NULL DEFAULT 'creado'")
+    _agregar_columna(cursor, "libro_diario", "fecha_importacion", "fecha_importacion TEXT")
+    _agregar_columna(cursor, "tipo_cuenta", "numero_cuenta", "numero_cuenta TEXT DEFAULT ''")
+    _agregar_columna(cursor, "tipo_cuenta", "id_plan_cuenta", "id_plan_cuenta INTEGER DEFAULT 0")
+    _agregar_columna(cursor, "rubro", "numero_cuenta", "numero_cuenta TEXT DEFAULT ''")
+    _agregar_columna(cursor, "generico", "numero_cuenta", "numero_cuenta TEXT DEFAULT ''")
+
+
+def asegurar_indices(cursor: sqlite3.Cursor) -> None:
+    """Índices de asientos, líneas y cuentas que usan el diario, el mayor y la exportación.
+
+    Idempotente: también se usa al reparar una BD a la que le faltaban tablas.
+    """
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_linea_asiento_asiento ON linea_asiento(id_asiento)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_linea_asiento_cuenta ON linea_asiento(id_cuenta_contable, id_asiento)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_asiento_libro_fecha ON asiento(id_libro_diario, fecha, id_asiento)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cuenta_contable_codigo ON cuenta_contable(codigo_cuenta)")
+
+
+def _migracion_2(cursor: sqlite3.Cursor) -> None:
+    """Índices para las consultas del diario, mayor, exportación y catálogo."""
+    asegurar_indices(cursor)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_rubro_tipo ON rubro(id_tipo_cuenta)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_generico_rubro ON generico(id_rubro)")
+    cursor.execute("ANALYZE")
+
+
+def _migracion_3(cursor: sqlite3.Cursor) -> None:
+    """Saldos por libro y cuenta mantenidos por triggers sobre linea_asiento."""
+    from data.saldosCuenta import recalcular_saldos_en_cursor
+
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS saldo_cuenta_libro (
+            id_libro_diario INTEGER NOT NULL,
+            id_cuenta_contable INTEGER NOT NULL,
+            debe REAL NOT NULL DEFAULT 0,
+            haber REAL NOT NULL DEFAULT 0,
+            movimientos INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (id_libro_diario, id_cuenta_contable)
+        ) WITHOUT ROWID
+        """
+    )
+    for sql in SQL_TRIGGERS_SALDO:
+        cursor.execute(sql)
+    recalcular_saldos_en_cursor(cursor)
+
+
+# Cuerpos reutilizables de los triggers: sumar la línea NEW / restar la línea OLD
+_SUMAR_NEW = """
+    INSERT INTO saldo_cuenta_libro (id_libro_diario, id_cuenta_contable, debe, haber, movimientos)
+    SELECT a.id_libro_diario, NEW.id_cuenta_contable, NEW.debe, NEW.haber, 1
+    FROM asiento a WHERE a.id_asiento = NEW.id_asiento
+    ON CONFLICT (id_libro_diario, id_cuenta_contable) DO UPDATE SET
+        debe = debe + excluded.debe,
+        haber = haber + excluded.haber,
+        movimientos = movimientos + 1;
+"""
+
+_RESTAR_OLD = """
+    UPDATE saldo_cuenta_libro
+       SET debe = debe - OLD.debe, haber = haber - OLD.haber, movimientos = movimientos - 1
+     WHERE id_cuenta_contable = OLD.id_cuenta_contable
+       AND id_libro_diario = (SELECT id_libro_diario FROM asiento WHERE id_asiento = OLD.id_asiento);
+    DELETE FROM saldo_cuenta_libro
+     WHERE id_cuenta_contable = OLD.id_cuenta_contable
+       AND movimientos <= 0
+       AND id_libro_diario = (SELECT id_libro_diario FROM asiento WHERE id_asiento = OLD.id_asiento);
+"""
+
+SQL_TRIGGERS_SALDO = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_linea_asiento_saldo_ins AFTER INSERT ON linea_asiento
+    BEGIN {_SUMAR_NEW} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_linea_asiento_saldo_del AFTER DELETE ON linea_asiento
+    BEGIN {_RESTAR_OLD} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_linea_asiento_saldo_upd
+    AFTER UPDATE OF id_asiento, id_cuenta_contable, debe, haber ON linea_asiento
+    BEGIN {_RESTAR_OLD} {_SUMAR_NEW} END
+    """,
+)
+
+
+def _tipo_columna(cursor: sqlite3.Cursor, table: str, column: str) -> str:
+    cursor.execute(f"PRAGMA table_info({table})")
+    for row in cursor.fetchall():
+        if row[1] == column:
+            return str(row[2] or "").upper()
+    return ""
+
+
+def _avisar_montos_ilegibles(cursor: sqlite3.Cursor, table: str, pk: str, montos: list[str]) -> None:
+    """Informa los montos guardados como texto que no se pueden leer: se migran como 0."""
+    from data.models.dinero import a_centavos
+
+    for columna in montos:
+        cursor.execute(f"SELECT {pk}, {columna} FROM {table} WHERE typeof({columna}) = 'text'")
+        for id_fila, valor in cursor.fetchall():
+            try:
+                a_centavos(valor)
+            except ValueError as e:
+                print(f"⚠️ {table} {id_fila}: {columna} ilegible ({e}), se migra como 0")
+
+
+def _a_centavos_o_cero(valor) -> int:
+    """a_centavos para la migración 4: un monto ilegible no debe abortarla (la BD
+    quedaría en la versión 3); _avisar_montos_ilegibles ya lo informó."""
+    from data.models.dinero import a_centavos
+
+    try:
+        return a_centavos(valor)
+    except ValueError:
+        return 0
+
+
+def _reconstruir_tabla(cursor: sqlite3.Cursor, table: str, ddl: str, columnas: list[str], montos: list[str]) -> None:
+    """Recrea `table` con el DDL actual copiando los datos y pasando `montos` a centavos."""
+    nueva = f"{table}_nueva"
+    _avisar_montos_ilegibles(cursor, table, columnas[0], montos)
+    cursor.execute(ddl.replace(f"EXISTS {table} (", f"EXISTS {nueva} (", 1))
+    select = ", ".join(f"a_centavos({c})" if c in montos else c for c in columnas)
+    cursor.execute(f"INSERT INTO {nueva} ({', '.join(columnas)}) SELECT {select} FROM {table}")
+    cursor.execute(f"DROP TABLE {table}")
+    cursor.execute(f"ALTER TABLE {nueva} RENAME TO {table}")
+
+
+# Esquema de las tablas que reconstruye la migración 4, copiado tal como era al
+# publicarla: si estructuraBD cambia, esta migración debe seguir haciendo lo mismo.
+_DDL_LINEA_ASIENTO_4 = """
+    CREATE TABLE IF NOT EXISTS linea_asiento (
+        id_linea_asiento INTEGER PRIMARY KEY AUTOINCREMENT,
+        id_asiento INTEGER NOT NULL,
+        debe INTEGER NOT NULL,  -- centavos
+        haber INTEGER NOT NULL,  -- centavos
+        id_cuenta_contable INTEGER NOT NULL,
+        foreign key (id_asiento) references asiento(id_asiento),
+        foreign key (id_cuenta_contable) references cuenta_contable(id_cuenta_contable)
+    );
+"""
+
+_DDL_LIBRO_DIARIO_4 = """
+    CREATE TABLE IF NOT EXISTS libro_diario (
+        id_libro_diario INTEGER PRIMARY KEY AUTOINCREMENT,
+        id_mes INTEGER NOT NULL,
+        ano INTEGER NOT NULL,
+        contador TEXT NOT NULL,
+        nombre_empresa TEXT NOT NULL,
+        total_debe INTEGER NOT NULL DEFAULT 0,  -- centavos
+        total_haber INTEGER NOT NULL DEFAULT 0,  -- centavos
+        id_plan_cuenta INTEGER,
+        origen TEXT NOT NULL DEFAULT 'creado',
+        fecha_importacion TEXT,
+        foreign key (id_mes) references mes(id_mes)
+    );
+"""
+
+
+def _migracion_4(cursor: sqlite3.Cursor) -> None:
+    """Montos debe/haber como INTEGER en centavos (antes REAL)."""
+    from data.saldosCuenta import recalcular_saldos_en_cursor
+
+    # Conversión exacta en Python (Decimal) en lugar de ROUND(x * 100) de SQLite
+    cursor.connection.create_function("a_centavos", 1, _a_centavos_o_cero, deterministic=True)
+
+    if _tipo_columna(cursor, "linea_asiento", "debe") != "INTEGER":
+        _reconstruir_tabla(
+            cursor, "linea_asiento", _DDL_LINEA_ASIENTO_4,
+            ["id_linea_asiento", "id_asiento", "debe", "haber", "id_cuenta_contable"],
+            ["debe", "haber"],
+        )
+        # DROP TABLE elimina también sus índices y triggers
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_linea_asiento_asiento ON linea_asiento(id_asiento)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_linea_asiento_cuenta ON linea_asiento(id_cuenta_contable, id_asiento)")
+        for sql in SQL_TRIGGERS_SALDO:
+            cursor.execute(sql)
+
+    if _tipo_columna(cursor, "libro_diario", "total_debe") != "INTEGER":
+        _reconstruir_tabla(
+            cursor, "libro_diario", _DDL_LIBRO_DIARIO_4,
+            ["id_libro_diario", "id_mes", "ano", "contador", "nombre_empresa", "total_debe",
+             "total_haber", "id_plan_cuenta", "origen", "fecha_importacion"],
+            ["total_debe", "total_haber"],
+        )
+
+    cursor.execute("DROP TABLE IF EXISTS saldo_cuenta_libro")
+    cursor.execute(SQL_TABLA_SALDOS)
+    recalcular_saldos_en_cursor(cursor)
+
+
+SQL_TABLA_SALDOS = """
+    CREATE TABLE IF NOT EXISTS saldo_cuenta_libro (
+        id_libro_diario INTEGER NOT NULL,
+        id_cuenta_contable INTEGER NOT NULL,
+        debe INTEGER NOT NULL DEFAULT 0,
+        haber INTEGER NOT NULL DEFAULT 0,
+        movimientos INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (id_libro_diario, id_cuenta_contable)
+    ) WITHOUT ROWID
+"""
+
+
+def asegurar_saldos(cursor: sqlite3.Cursor) -> None:
+    """Tabla saldo_cuenta_libro, sus triggers y su contenido recalculado.
+
+    Idempotente: también se usa al reparar una BD a la que le faltaban tablas.
+    """
+    from data.saldosCuenta import recalcular_saldos_en_cursor
+
+    cursor.execute(SQL_TABLA_SALDOS)
+    for sql in SQL_TRIGGERS_SALDO:
+        cursor.execute(sql)
+    recalcular_saldos_en_cursor(cursor)
+
+
+# Texto de las cuentas usadas por un asiento, para la columna `cuentas` de asiento_fts
+def _sql_cuentas_de(id_asiento: str) -> str:
+    return f"""
+    (SELECT COALESCE(group_concat(texto, ' '), '') FROM (
+        SELECT DISTINCT c.nombre_cuenta || ' ' || COALESCE(c.descripcion, '') AS texto
+        FROM linea_asiento l
+        JOIN cuenta_contable c ON c.id_cuenta_contable = l.id_cuenta_contable
+        WHERE l.id_asiento = {id_asiento}
+    ))
+    """
+
+
+SQL_TRIGGERS_FTS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_asiento_fts_ins AFTER INSERT ON asiento
+    BEGIN
+        INSERT INTO asiento_fts (rowid, descripcion, cuentas)
+        VALUES (NEW.id_asiento, COALESCE(NEW.descripcion, ''), '');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_asiento_fts_del AFTER DELETE ON asiento
+    BEGIN
+        DELETE FROM asiento_fts WHERE rowid = OLD.id_asiento;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_asiento_fts_upd AFTER UPDATE OF descripcion ON asiento
+    BEGIN
+        UPDATE asiento_fts SET descripcion = COALESCE(NEW.descripcion, '') WHERE rowid = NEW.id_asiento;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_linea_asiento_fts_ins AFTER INSERT ON linea_asiento
+    BEGIN
+        UPDATE asiento_fts SET cuentas = {_sql_cuentas_de("NEW.id_asiento")} WHERE rowid = NEW.id_asiento;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_linea_asiento_fts_del AFTER DELETE ON linea_asiento
+    BEGIN
+        UPDATE asiento_fts SET cuentas = {_sql_cuentas_de("OLD.id_asiento")} WHERE rowid = OLD.id_asiento;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_linea_asiento_fts_upd
+    AFTER UPDATE OF id_asiento, id_cuenta_contable ON linea_asiento
+    BEGIN
+        UPDATE asiento_fts SET cuentas = {_sql_cuentas_de("OLD.id_asiento")} WHERE rowid = OLD.id_asiento;
+        UPDATE asiento_fts SET cuentas = {_sql_cuentas_de("NEW.id_asiento")} WHERE rowid = NEW.id_asiento;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_cuenta_contable_fts_upd
+    AFTER UPDATE OF nombre_cuenta, descripcion ON cuenta_contable
+    BEGIN
+        UPDATE asiento_fts SET cuentas = {_sql_cuentas_de("asiento_fts.rowid")}
+        WHERE rowid IN (SELECT id_asiento FROM linea_asiento WHERE id_cuenta_contable = NEW.id_cuenta_contable);
+    END
+    """,
+)
+
+
+def asegurar_fts(cursor: sqlite3.Cursor) -> None:
+    """Tabla asiento_fts, sus triggers y su contenido reconstruido desde asiento.
+
+    Idempotente: también se usa al reparar una BD a la que le faltaban tablas.
+    """
+    cursor.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS asiento_fts USING fts5(
+            descripcion, cuentas, tokenize = 'unicode61 remove_diacritics 2'
+        )
+        """
+    )
+    for sql in SQL_TRIGGERS_FTS:
+        cursor.execute(sql)
+    cursor.execute("DELETE FROM asiento_fts")
+    cursor.execute(
+        f"""
+        INSERT INTO asiento_fts (rowid, descripcion, cuentas)
+        SELECT a.id_asiento, COALESCE(a.descripcion, ''), {_sql_cuentas_de("a.id_asiento")}
+        FROM asiento a
+        """
+    )
+
+
+def _migracion_5(cursor: sqlite3.Cursor) -> None:
+    """Índice FTS5 de asientos: su descripción y el nombre/descripción de sus cuentas."""
+    asegurar_fts(cursor)
+
+
+# Tabla -> (columna con el código, clave primaria) para la columna `orden`
+TABLAS_ORDEN = {
+    "tipo_cuenta": ("numero_cuenta", "id_tipo_cuenta"),
+    "rubro": ("numero_cuenta", "id_rubro"),
+    "generico": ("numero_cuenta", "id_generico"),
+    "cuenta_contable": ("codigo_cuenta", "id_cuenta_contable"),
+}
+
+
+def asegurar_orden(cursor: sqlite3.Cursor) -> None:
+    """Columna `orden` (clave natural del código), sus triggers e índices.
+
+    Idempotente: también se usa al reparar una BD a la que le faltaban tablas.
+    """
+    for tabla, (columna, pk) in TABLAS_ORDEN.items():
+        _agregar_columna(cursor, tabla, "orden", "orden TEXT NOT NULL DEFAULT ''")
+        actualizar = f"UPDATE {tabla} SET orden = {sql_clave_orden(f'NEW.{columna}')} WHERE {pk} = NEW.{pk};"
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{tabla}_orden_ins AFTER INSERT ON {tabla} BEGIN {actualizar} END")
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{tabla}_orden_upd AFTER UPDATE OF {columna} ON {tabla} BEGIN {actualizar} END")
+        clave = sql_clave_orden(columna)
+        cursor.execute(f"UPDATE {tabla} SET orden = {clave} WHERE orden IS NOT {clave}")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tipo_cuenta_plan_orden ON tipo_cuenta(id_plan_cuenta, orden)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_rubro_tipo_orden ON rubro(id_tipo_cuenta, orden)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_generico_rubro_orden ON generico(id_rubro, orden)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cuenta_contable_generico_orden ON cuenta_contable(id_generico, orden)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cuenta_contable_orden ON cuenta_contable(orden)")
+
+
+def _migracion_6(cursor: sqlite3.Cursor) -> None:
+    """Orden natural de códigos persistido en una columna indexada."""
+    asegurar_orden(cursor)
+    # Los índices (x, orden) cubren las búsquedas que hacían estos
+    cursor.execute("DROP INDEX IF EXISTS idx_rubro_tipo")
+    cursor.execute("DROP INDEX IF EXISTS idx_generico_rubro")
+    cursor.execute("ANALYZE")
+
+
+# Mantiene el contador si un asiento entra con número propio (p. ej. importación de Excel)
+SQL_TRIGGER_NUMERO_ASIENTO = """
+    CREATE TRIGGER IF NOT EXISTS trg_asiento_numero_ins AFTER INSERT ON asiento
+    BEGIN
+        UPDATE libro_diario SET ultimo_numero_asiento = NEW.numero_asiento
+        WHERE id_libro_diario = NEW.id_libro_diario AND ultimo_numero_asiento < NEW.numero_asiento;
+    END
+"""
+
+
+def asegurar_numeracion(cursor: sqlite3.Cursor) -> None:
+    """Columna libro_diario.ultimo_numero_asiento, su valor y su trigger.
+
+    Idempotente: también se usa al reparar una BD a la que le faltaban tablas.
+    El contador nunca baja, para no repetir números ya entregados.
+    """
+    _agregar_columna(cursor, "libro_diario", "ultimo_numero_asiento", "ultimo_numero_asiento INTEGER NOT NULL DEFAULT 0")
+    cursor.execute(
+        """
+        UPDATE libro_diario SET ultimo_numero_asiento = MAX(ultimo_numero_asiento, COALESCE(
+            (SELECT MAX(a.numero_asiento) FROM asiento a WHERE a.id_libro_diario = libro_diario.id_libro_diario), 0))
+        """
+    )
+    cursor.execute(SQL_TRIGGER_NUMERO_ASIENTO)
+
+
+def _migracion_7(cursor: sqlite3.Cursor) -> None:
+    """Contador de numero_asiento por libro (en lugar de MAX(numero_asiento) al guardar)."""
+    asegurar_numeracion(cursor)
+
+
+# Versión de contenido de cada libro: sube con cualquier alta, cambio o baja de
+# asientos y líneas (guardado de comprobantes, importación, eliminación) y con los
+# datos del encabezado que salen en la exportación. La usa la caché de exportaciones.
+SQL_TRIGGERS_VERSION = (
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_asiento_version_ins AFTER INSERT ON asiento
+    BEGIN
+        UPDATE libro_diario SET version = version + 1 WHERE id_libro_diario = NEW.id_libro_diario;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_asiento_version_upd AFTER UPDATE ON asiento
+    BEGIN
+        UPDATE libro_diario SET version = version + 1
+        WHERE id_libro_diario IN (OLD.id_libro_diario, NEW.id_libro_diario);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_asiento_version_del AFTER DELETE ON asiento
+    BEGIN
+        UPDATE libro_diario SET version = version + 1 WHERE id_libro_diario = OLD.id_libro_diario;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_linea_asiento_version_ins AFTER INSERT ON linea_asiento
+    BEGIN
+        UPDATE libro_diario SET version = version + 1
+        WHERE id_libro_diario = (SELECT id_libro_diario FROM asiento WHERE id_asiento = NEW.id_asiento);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_linea_asiento_version_upd AFTER UPDATE ON linea_asiento
+    BEGIN
+        UPDATE libro_diario SET version = version + 1
+        WHERE id_libro_diario IN (SELECT id_libro_diario FROM asiento WHERE id_asiento IN (OLD.id_asiento, NEW.id_asiento));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_linea_asiento_version_del AFTER DELETE ON linea_asiento
+    BEGIN
+        UPDATE libro_diario SET version = version + 1
+        WHERE id_libro_diario = (SELECT id_libro_diario FROM asiento WHERE id_asiento = OLD.id_asiento);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_libro_diario_version_upd
+    AFTER UPDATE OF nombre_empresa, contador, id_plan_cuenta, ano, id_mes ON libro_diario
+    BEGIN
+        UPDATE libro_diario SET version = version + 1 WHERE id_libro_diario = NEW.id_libro_diario;
+    END
+    """,
+)
+
+
+def asegurar_version(cursor: sqlite3.Cursor) -> None:
+    """Columna libro_diario.version y sus triggers.
+
+    Idempotente: también se usa al reparar una BD a la que le faltaban tablas.
+    """
+    _agregar_columna(cursor, "libro_diario", "version", "version INTEGER NOT NULL DEFAULT 0")
+    for sql in SQL_TRIGGERS_VERSION:
+        cursor.execute(sql)
+
+
+def _migracion_8(cursor: sqlite3.Cursor) -> None:
+    """Versión de contenido por libro, mantenida por triggers."""
+    asegurar_version(cursor)
+
+
+def asegurar_identidad(cursor: sqlite3.Cursor) -> None:
+    """Tabla `meta` con un identificador aleatorio de la BD (clave `id_bd`).
+
+    Idempotente: no cambia el identificador si ya existe.
+    """
+    cursor.execute("CREATE TABLE IF NOT EXISTS meta (clave TEXT PRIMARY KEY, valor TEXT NOT NULL)")
+    cursor.execute("INSERT OR IGNORE INTO meta (clave, valor) VALUES ('id_bd', lower(hex(randomblob(16))))")
+
+
+def renovar_identidad(cursor: sqlite3.Cursor) -> None:
+    """Asigna un identificador nuevo (p. ej. a una BD recién copiada de la plantilla)."""
+    asegurar_identidad(cursor)
+    cursor.execute("UPDATE meta SET valor = lower(hex(randomblob(16))) WHERE clave = 'id_bd'")
+
+
+def obtener_identidad(conn: sqlite3.Connection) -> str | None:
+    """Identificador de la BD, o None si su esquema es anterior a la migración 9."""
+    try:
+        row = conn.execute("SELECT valor FROM meta WHERE clave = 'id_bd'").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def _migracion_9(cursor: sqlite3.Cursor) -> None:
+    """Identificador propio de cada BD: los ids de libro y sus versiones se repiten
+    entre bases (o tras reinstalar la plantilla) y la caché de exportaciones no
+    debe confundirlas."""
+    asegurar_identidad(cursor)
+
+
+def _migracion_10(cursor: sqlite3.Cursor) -> None:
+    """Triggers de `orden` en SQL puro: los anteriores llamaban a la función
+    clave_orden de la aplicación y cualquier otra herramienta fallaba al escribir."""
+    for tabla in TABLAS_ORDEN:
+        cursor.execute(f"DROP TRIGGER IF EXISTS trg_{tabla}_orden_ins")
+        cursor.execute(f"DROP TRIGGER IF EXISTS trg_{tabla}_orden_upd")
+    asegurar_orden(cursor)
+
+
+# Lista ordenada de (versión, función). Para cambiar el esquema se agrega una
+# nueva entrada al final; nunca se modifica una migración ya publicada.
+MIGRACIONES = [
+    (1, _migracion_1),
+    (2, _migracion_2),
+    (3, _migracion_3),
+    (4, _migracion_4),
+    (5, _migracion_5),
+    (6, _migracion_6),
+    (7, _migracion_7),
+    (8, _migracion_8),
+    (9, _migracion_9),
+    (10, _migracion_10),
+]
+
+VERSION_ESQUEMA = MIGRACIONES[-1][0]
+
+
+def obtener_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def migrar_db(nombre_db: str) -> int:
+    """Aplica las migraciones pendientes según PRAGMA user_version.
+
+    Cada migración corre en su propia transacción junto con la actualización
+    de user_version, de modo que una falla deja la base en la versión anterior.
+    Devuelve la versión final del esquema.
+    """
+    return migrar_conexion(obtener_conexion(nombre_db))
+
+
+def migrar_conexion(conn: sqlite3.Connection) -> int:
+    """Igual que migrar_db pero sobre una conexión ya abierta (p. ej. en memoria)."""
+    if conn.in_transaction:
+        # Confirmarla acá mezclaría trabajo ajeno con la primera migración
+        raise sqlite3.ProgrammingError("migrar_conexion requiere una conexión sin transacción pendiente")
+    registrar_funciones(conn)
+    version = obtener_version(conn)
+    for numero, migracion in MIGRACIONES:
+        if numero <= version:
+            continue
+        try:
+            conn.execute("BEGIN")
+            migracion(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {int(numero)}")
+            conn.commit()
+            version = numero
+            print(f"✅ Migración {numero} aplicada")
+        except Error as e:
+            conn.rollback()
+            print(f"❌ Error aplicando migración {numero}: {e}")
+            break
+    return version
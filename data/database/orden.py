@@ -0,0 +1,62 @@
+"""
+Clave de orden natural para códigos jerárquicos ("1.1.10.02").
+
+Se guarda en la columna `orden` de tipo_cuenta, rubro, generico y cuenta_contable
+(la mantienen triggers con la expresión de sql_clave_orden, en SQL puro para que
+la BD se pueda escribir también desde otras herramientas), de modo que
+ORDER BY orden da el orden contable: "1.2" antes que "1.10".
+"""
+import re
+import sqlite3
+
+# Prefijo entero de un texto tal como lo toma CAST(x AS INTEGER) en SQLite
+_ENTERO = re.compile(r"[ \t\n\v\f\r]*([+-]?\d+)")
+_MIN_INT64, _MAX_INT64 = -(2 ** 63), 2 ** 63 - 1
+# Dígitos por segmento; alcanza para cualquier numeración de cuentas real
+_ANCHO = 10
+# Segmentos que entran en la clave; los siguientes solo desempatan por el código
+_MAX_SEGMENTOS = 8
+
+
+def _entero(texto: str) -> int:
+    coincidencia = _ENTERO.match(texto)
+    if coincidencia is None:
+        return 0
+    return min(max(int(coincidencia.group(1)), _MIN_INT64), _MAX_INT64)
+
+
+def clave_orden(codigo) -> str:
+    """'1.1.10.02' -> '0000000001.0000000001.0000000010.0000000002 1.1.10.02'.
+
+    Los segmentos (separados por punto) van como enteros rellenados con ceros
+    para que la comparación de texto coincida con la numérica; el código
+    original al final desempata. Equivale a sql_clave_orden.
+    """
+    codigo = "" if codigo is None else str(codigo).strip(" ")
+    segmentos = codigo.split(".")[:_MAX_SEGMENTOS] if codigo else []
+    return ".".join(f"{_entero(s):0{_ANCHO}d}" for s in segmentos) + " " + codigo
+
+
+def sql_clave_orden(expr: str) -> str:
+    """Expresión SQL equivalente a clave_orden(expr), sin funciones de Python.
+
+    Los triggers no admiten CTE, así que cada segmento se separa en una
+    subconsulta anidada: `p` acumula la clave y `r` lo que falta del código.
+    """
+    consulta = (
+        f"SELECT c, '' AS p, CASE WHEN c = '' THEN '' ELSE c || '.' END AS r "
+        f"FROM (SELECT COALESCE(trim({expr}), '') AS c)"
+    )
+    for _ in range(_MAX_SEGMENTOS):
+        consulta = (
+            "SELECT c, p || CASE WHEN r = '' THEN '' ELSE "
+            f"'.' || printf('%0{_ANCHO}d', CAST(substr(r, 1, instr(r, '.') - 1) AS INTEGER)) END AS p, "
+            f"substr(r, instr(r, '.') + 1) AS r FROM ({consulta})"
+        )
+    return f"(SELECT substr(p, 2) || ' ' || c FROM ({consulta}))"
+
+
+def registrar_funciones(conn: sqlite3.Connection) -> None:
+    """Registra clave_orden como función SQL: la usan los triggers de las bases
+    que todavía no pasaron por la migración 10."""
+    conn.create_function("clave_orden", 1, clave_orden, deterministic=True)
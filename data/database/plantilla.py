@@ -0,0 +1,205 @@
+"""
+Plantilla de la base de datos para el primer arranque y la reparación.
+
+En lugar de crear y poblar tabla por tabla sobre el archivo del usuario, se
+arma (o se lee) una BD plantilla ya migrada y se copia de una sola vez con la
+API de backup de sqlite3.
+
+- Si existe assets/plantilla.db (generada con `python -m data.database.plantilla`
+  antes de empaquetar) se usa esa.
+- Si no existe, la plantilla se construye en memoria en una sola transacción.
+"""
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from sqlite3 import Error
+
+from data.database import estructuraBD
+from data.database.conexion import cerrar_todas_conexiones, obtener_conexion
+from data.database.migraciones import (
+    VERSION_ESQUEMA, asegurar_fts, asegurar_identidad, asegurar_indices, asegurar_numeracion, asegurar_orden,
+    asegurar_saldos, asegurar_version, migrar_conexion, migrar_db, obtener_version, renovar_identidad,
+)
+
+RUTA_PLANTILLA = os.path.join("assets", "plantilla.db")
+
+# Tablas sin las que la aplicación no puede abrir
+TABLAS_REQUERIDAS = (
+    "plan_cuentas", "mes", "tipo_cuenta", "rubro", "generico",
+    "cuenta_contable", "libro_diario", "asiento", "linea_asiento",
+)
+
+_CABECERA_SQLITE = b"SQLite format 3\x00"
+
+
+def construir_plantilla(conn: sqlite3.Connection) -> int:
+    """Crea tablas, catálogos y plan de cuentas en `conn` y aplica las migraciones.
+
+    Devuelve la versión de esquema resultante.
+    """
+    with conn:
+        cursor = conn.cursor()
+        estructuraBD.crear_tablas_en_cursor(cursor)
+        estructuraBD.poblar_catalogo_en_cursor(cursor)
+        estructuraBD.poblar_cuentas_en_cursor(cursor)
+    return migrar_conexion(conn)
+
+
+def _abrir_plantilla() -> sqlite3.Connection:
+    """Conexión a la plantilla empaquetada o, si no hay, a una construida en memoria."""
+    from src.utils.paths import resource_path
+    ruta = resource_path(RUTA_PLANTILLA)
+    if os.path.isfile(ruta):
+        try:
+            # as_uri() escapa #, ? y % que pueda tener la carpeta de instalación
+            conn = sqlite3.connect(Path(ruta).resolve().as_uri() + "?mode=ro", uri=True)
+            if obtener_version(conn) <= VERSION_ESQUEMA:
+                return conn
+            conn.close()
+        except Error as e:
+            print(f"Plantilla empaquetada inválida ({ruta}): {e}")
+    conn = sqlite3.connect(":memory:")
+    construir_plantilla(conn)
+    return conn
+
+
+def migrar_completa(db_path: str) -> bool:
+    """Aplica las migraciones pendientes y confirma que la BD quedó en VERSION_ESQUEMA.
+
+    Si una migración falla (BD bloqueada, disco lleno) la base queda en una
+    versión anterior con la que esta aplicación no debe leer ni escribir.
+    """
+    version = migrar_db(db_path)
+    if version != VERSION_ESQUEMA:
+        print(f"❌ La BD quedó en la versión {version} del esquema (esta aplicación usa la {VERSION_ESQUEMA})")
+        return False
+    return True
+
+
+def instalar_plantilla(db_path: str) -> bool:
+    """Copia la plantilla sobre `db_path` (que debe estar vacío o ser descartable)."""
+    inicio = time.perf_counter()
+    origen = destino = None
+    try:
+        # Ninguna conexión compartida debe quedar apuntando al archivo anterior
+        cerrar_todas_conexiones()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        origen = _abrir_plantilla()
+        destino = sqlite3.connect(db_path)
+        origen.backup(destino)
+        destino.close()
+        destino = None
+        # La plantilla puede ser de una versión anterior del esquema
+        if not migrar_completa(db_path):
+            return False
+        # Cada instalación es una BD distinta aunque venga de la misma plantilla
+        conn = obtener_conexion(db_path)
+        with conn:
+            renovar_identidad(conn.cursor())
+        print(f"✅ BD inicializada desde plantilla en {(time.perf_counter() - inicio) * 1000:.0f} ms")
+        return True
+    except Error as e:
+        print(f"❌ Error instalando la plantilla de BD: {e}")
+        return False
+    finally:
+        for conn in (origen, destino):
+            if conn is not None:
+                conn.close()
+
+
+def estado_db(db_path: str) -> str:
+    """Chequeo rápido de la BD sin recorrer sus datos.
+
+    Devuelve:
+        "nueva"     si el archivo no existe o está vacío
+        "corrupta"  si no es un archivo SQLite legible
+        "incompleta" si faltan tablas requeridas
+        "ok"        en otro caso
+    """
+    try:
+        if not os.path.exists(db_path) or os.path.getsize(db_path) == 0:
+            return "nueva"
+        with open(db_path, "rb") as fh:
+            if fh.read(len(_CABECERA_SQLITE)) != _CABECERA_SQLITE:
+                return "corrupta"
+        cur = obtener_conexion(db_path).cursor()
+        cur.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        tablas = {row[0] for row in cur.fetchall()}
+    except (OSError, Error) as e:
+        print(f"No se pudo verificar la BD {db_path}: {e}")
+        return "corrupta"
+    return "ok" if tablas.issuperset(TABLAS_REQUERIDAS) else "incompleta"
+
+
+# (versión del esquema desde la que existe, función idempotente que lo restaura)
+REPARACIONES = (
+    (2, asegurar_indices),
+    (3, asegurar_saldos),
+    (5, asegurar_fts),
+    (6, asegurar_orden),
+    (7, asegurar_numeracion),
+    (8, asegurar_version),
+    (9, asegurar_identidad),
+)
+
+
+def reparar_db(db_path: str) -> bool:
+    """Crea las tablas que falten sobre una BD existente, conservando sus datos."""
+    try:
+        conn = obtener_conexion(db_path)
+        with conn:
+            cursor = conn.cursor()
+            estructuraBD.crear_tablas_en_cursor(cursor)
+            # Los catálogos solo se cargan si quedaron vacíos (no tienen claves únicas)
+            if cursor.execute("SELECT COUNT(*) FROM tipo_cuenta").fetchone()[0] == 0:
+                estructuraBD.poblar_catalogo_en_cursor(cursor)
+            if cursor.execute("SELECT COUNT(*) FROM cuenta_contable").fetchone()[0] == 0:
+                estructuraBD.poblar_cuentas_en_cursor(cursor)
+            # Las tablas recreadas no pasan por las migraciones ya aplicadas: se
+            # restauran sus columnas, índices y triggers. Las pendientes las aplica migrar_completa.
+            version = obtener_version(conn)
+            for desde, asegurar in REPARACIONES:
+                if version >= desde:
+                    asegurar(cursor)
+        return migrar_completa(db_path)
+    except Error as e:
+        print(f"❌ Error reparando la BD: {e}")
+        return False
+
+
+def preparar_db(db_path: str) -> bool:
+    """Deja `db_path` lista para usar: instala la plantilla, repara o migra según su estado."""
+    estado = estado_db(db_path)
+    if estado == "nueva":
+        return instalar_plantilla(db_path)
+    if estado == "corrupta":
+        cerrar_todas_conexiones()
+        respaldo = f"{db_path}.corrupta-{time.strftime('%Y%m%d%H%M%S')}"
+        try:
+            os.replace(db_path, respaldo)
+            # El WAL de la BD anterior no debe aplicarse sobre la nueva
+            for sufijo in ("-wal", "-shm"):
+                if os.path.exists(db_path + sufijo):
+                    os.replace(db_path + sufijo, respaldo + sufijo)
+            print(f"⚠️ BD ilegible movida a {respaldo}")
+        except OSError as e:
+            print(f"❌ No se pudo apartar la BD ilegible: {e}")
+            return False
+        return instalar_plantilla(db_path)
+    if estado == "incompleta":
+        return reparar_db(db_path)
+    return migrar_completa(db_path)
+
+
+if __name__ == "__main__":
+    # Genera la plantilla empaquetable: python -m data.database.plantilla [destino]
+    destino = sys.argv[1] if len(sys.argv) > 1 else RUTA_PLANTILLA
+    if os.path.exists(destino):
+        os.remove(destino)
+    memoria = sqlite3.connect(":memory:")
+    version = construir_plantilla(memoria)
+    memoria.execute("VACUUM INTO ?", (destino,))
+    memoria.close()
+    print(f"✅ Plantilla v{version} escrita en {destino}")
@@ -1,6 +1,8 @@
-import sqlite3
 from sqlite3 import Error
 
+from data.database.conexion import obtener_conexion
+from data.database.migraciones import obtener_identidad
+
 def eliminar_libro_diario(db_path: str, id_libro_diario: int) -> bool:
     """
     Elimina un libro diario y todas sus dependencias (asientos y líneas de asiento).
@@ -8,10 +10,9 @@ def eliminar_libro_diario(db_path: str, id_libro_diario: int) -> bool:
     """
     conn = None
     try:
-        conn = sqlite3.connect(db_path, timeout=5)
-        conn.execute("PRAGMA foreign_keys=ON")
-        conn.execute("PRAGMA busy_timeout=3000")
+        conn = obtener_conexion(db_path)
         cursor = conn.cursor()
+        id_bd = obtener_identidad(conn)
 
         # 1) Eliminar líneas de asientos de los asientos de este libro
         cursor.execute(
@@ -28,14 +29,15 @@ def eliminar_libro_diario(db_path: str, id_libro_diario: int) -> bool:
             "DELETE FROM libro_diario WHERE id_libro_diario = ?",
             (id_libro_diario,)
         )
+        eliminado = cursor.rowcount > 0
         conn.commit()
-        return cursor.rowcount > 0
+        if eliminado and id_bd is not None:
+            # El id puede reutilizarse: sus Excel en caché ya no valen
+            from src.services.cacheExportacion import invalidar_libro
+            invalidar_libro(db_path, id_bd, id_libro_diario)
+        return eliminado
     except Error as e:
         print(f"Error eliminando libro diario: {e}")
-        return False
-    finally:
         if conn:
-            try:
-                conn.close()
-            except Exception:
-                pass
+            conn.rollback()
+        return False
@@ -0,0 +1,118 @@
+from datetime import datetime
+from sqlite3 import Cursor, Error
+from typing import List, Optional, Tuple
+
+from data.database.conexion import obtener_conexion
+from data.models.dinero import Centavos
+
+# (id_cuenta_contable, debe, haber), con montos en centavos
+Linea = Tuple[int, Centavos, Centavos]
+
+
+def _fecha_en_periodo(cur: Cursor, id_libro_diario: int, dia: Optional[int]) -> str:
+    """Fecha AAAA-MM-DD con el año/mes del libro y el día indicado (1 si no hay)."""
+    cur.execute("SELECT ano, id_mes FROM libro_diario WHERE id_libro_diario = ?", (id_libro_diario,))
+    row = cur.fetchone()
+    if not row:
+        # Fallback a hoy si no se encuentra el libro
+        return datetime.now().strftime("%Y-%m-%d")
+    ano, mes = row
+    mes = min(12, max(1, int(mes or 1)))
+    dia = min(31, max(1, int(dia or 1)))
+    return f"{int(ano):04d}-{mes:02d}-{dia:02d}"
+
+
+def guardarAsiento(
+    db_path: str,
+    id_libro_diario: int,
+    dia: Optional[int],
+    descripcion: str,
+    lineas: List[Linea],
+    id_asiento: Optional[int] = None,
+) -> Optional[int]:
+    """
+    Crea (id_asiento=None) o actualiza un asiento con sus líneas en una sola transacción.
+
+    - Al editar, las líneas se comparan por posición con las guardadas: solo se
+      actualizan las que cambiaron y se insertan/borran las que sobran.
+    - El número de un asiento nuevo sale del contador del libro (ultimo_numero_asiento).
+    - Los totales del libro se ajustan por la diferencia en la misma transacción.
+    Devuelve el id del asiento, o None si falló (no queda nada a medias).
+    """
+    conn = None
+    try:
+        conn = obtener_conexion(db_path)
+        if conn.in_transaction:
+            # No se confirma (ni se deshace) trabajo ajeno pendiente en la conexión del hilo
+            print("Error guardando asiento: la conexión tiene una transacción sin terminar")
+            return None
+        # IMMEDIATE: toma el bloqueo de escritura al empezar y no a mitad de camino
+        conn.execute("BEGIN IMMEDIATE")
+        cur = conn.cursor()
+        fecha = _fecha_en_periodo(cur, id_libro_diario, dia)
+
+        anteriores: List[Tuple[int, int, int, int]] = []
+        if id_asiento:
+            cur.execute(
+                "UPDATE asiento SET fecha = ?, descripcion = ? WHERE id_asiento = ? AND id_libro_diario = ?",
+                (fecha, descripcion, id_asiento, id_libro_diario)
+            )
+            if cur.rowcount == 0:
+                # Borrado mientras se editaba (o de otro libro): sus líneas quedarían huérfanas
+                print(f"Error guardando asiento: el asiento {id_asiento} no existe en el libro {id_libro_diario}")
+                conn.rollback()
+                return None
+            cur.execute(
+                "SELECT id_linea_asiento, id_cuenta_contable, debe, haber FROM linea_asiento WHERE id_asiento = ? ORDER BY id_linea_asiento",
+                (id_asiento,)
+            )
+            anteriores = [(r[0], r[1], int(r[2] or 0), int(r[3] or 0)) for r in cur.fetchall()]
+        else:
+            cur.execute(
+                "UPDATE libro_diario SET ultimo_numero_asiento = ultimo_numero_asiento + 1 WHERE id_libro_diario = ?",
+                (id_libro_diario,)
+            )
+            cur.execute("SELECT ultimo_numero_asiento FROM libro_diario WHERE id_libro_diario = ?", (id_libro_diario,))
+            row = cur.fetchone()
+            numero = int(row[0]) if row else 1
+            cur.execute(
+                "INSERT INTO asiento (id_libro_diario, fecha, numero_asiento, descripcion) VALUES (?, ?, ?, ?)",
+                (id_libro_diario, fecha, numero, descripcion)
+            )
+            id_asiento = cur.lastrowid
+
+        comunes = min(len(anteriores), len(lineas))
+        cambiadas = [
+            (id_cuenta, debe, haber, anteriores[i][0])
+            for i, (id_cuenta, debe, haber) in enumerate(lineas[:comunes])
+            if anteriores[i][1:] != (id_cuenta, debe, haber)
+        ]
+        nuevas = [(id_asiento, debe, haber, id_cuenta) for id_cuenta, debe, haber in lineas[comunes:]]
+        sobrantes = [(a[0],) for a in anteriores[comunes:]]
+        if cambiadas:
+            cur.executemany(
+                "UPDATE linea_asiento SET id_cuenta_contable = ?, debe = ?, haber = ? WHERE id_linea_asiento = ?",
+                cambiadas
+            )
+        if nuevas:
+            cur.executemany(
+                "INSERT INTO linea_asiento (id_asiento, debe, haber, id_cuenta_contable) VALUES (?, ?, ?, ?)",
+                nuevas
+            )
+        if sobrantes:
+            cur.executemany("DELETE FROM linea_asiento WHERE id_linea_asiento = ?", sobrantes)
+
+        delta_debe = sum(l[1] for l in lineas) - sum(a[2] for a in anteriores)
+        delta_haber = sum(l[2] for l in lineas) - sum(a[3] for a in anteriores)
+        if delta_debe or delta_haber:
+            cur.execute(
+                "UPDATE libro_diario SET total_debe = total_debe + ?, total_haber = total_haber + ? WHERE id_libro_diario = ?",
+                (delta_debe, delta_haber, id_libro_diario)
+            )
+        conn.commit()
+        return id_asiento
+    except Error as e:
+        print(f"Error guardando asiento: {e}")
+        if conn is not None and conn.in_transaction:
+            conn.rollback()
+        return None
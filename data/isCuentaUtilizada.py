@@ -1,10 +1,10 @@
 import sqlite3
 
+from data.database.conexion import obtener_conexion
+
 def is_cuenta_utilizada(db_path: str, id_cuenta_contable: int) -> bool:
-    conn = None
     try:
-        conn = sqlite3.connect(db_path, timeout=5)
-        conn.execute("PRAGMA busy_timeout=3000")
+        conn = obtener_conexion(db_path)
         cursor = conn.cursor()
         
         # Check in transactions table
@@ -16,7 +16,3 @@ def is_cuenta_utilizada(db_path: str, id_cuenta_contable: int) -> bool:
     except sqlite3.Error as e:
         print(f"Error checking cuenta contable usage: {e}")
         return False
-    finally:
-        if conn:
-            try: conn.close()
-            except Exception: pass
\ No newline at end of file
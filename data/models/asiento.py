@@ -1,13 +1,12 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from data.models.libro import LibroDiario
-import sqlite3
-from sqlite3 import Error
 from typing import List
 from data.models.lineaAsiento import LineaAsiento
 from data.models.cuenta import CuentaContable
+from data.models.dinero import Centavos
 
 @dataclass
 class Asiento:
@@ -15,10 +14,11 @@ class Asiento:
     id_libro_diario: int = 0
     fecha_asiento: str = ''
     descripcion_asiento: str = ''
-    total_debe: float = 0.0
-    total_haber: float = 0.0
+    total_debe: Centavos = 0
+    total_haber: Centavos = 0
     numero_asiento: int = 0
     libro: Optional["LibroDiario"] = None  # Relación directa (forward reference)
+    _lineas: Optional[List[LineaAsiento]] = field(default=None, init=False, repr=False, compare=False)
     
     def __str__(self):
         return f"Asiento {self.id_asiento} - {self.descripcion_asiento}"
@@ -26,15 +26,19 @@ class Asiento:
     def __post_init__(self):
         pass
     
-    def get_lineas(self, db_path: str = "libro_facil.db") -> List[LineaAsiento]:
+    def get_lineas(self, db_path: str | None = None) -> List[LineaAsiento]:
         """Devuelve la lista de LineaAsiento asociadas a este Asiento.
 
         Usa la función en `data.obtenerLineaAsiento` para mantener la
-        lógica de acceso a datos separada del modelo.
+        lógica de acceso a datos separada del modelo. Si las líneas ya se
+        precargaron con `precargar_lineas`, no consulta la BD.
         """
+        if self._lineas is not None:
+            return self._lineas
         try:
             from data.obtenerLineaAsiento import obtenerLineasPorAsiento
-            return obtenerLineasPorAsiento(db_path, self.id_asiento)
+            self._lineas = obtenerLineasPorAsiento(db_path, self.id_asiento)
+            return self._lineas
         except Exception as ex:
             print(f"Error obteniendo lineas para asiento {self.id_asiento}: {ex}")
             return []
@@ -43,5 +47,13 @@ class Asiento:
     def lineas(self) -> List[LineaAsiento]:
         return self.get_lineas()
 
-    
-    
\ No newline at end of file
+    @staticmethod
+    def precargar_lineas(asientos: List["Asiento"], db_path: str | None = None) -> None:
+        """Carga las líneas de varios asientos con una sola consulta."""
+        pendientes = [a for a in asientos if a._lineas is None]
+        if not pendientes:
+            return
+        from data.obtenerLineaAsiento import obtenerLineasPorAsientos
+        por_asiento = obtenerLineasPorAsientos(db_path, [a.id_asiento for a in pendientes])
+        for a in pendientes:
+            a._lineas = por_asiento.get(a.id_asiento, [])
@@ -0,0 +1,77 @@
+import re
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Any
+
+# Montos en unidades mínimas (centavos). Así se guardan en la BD y se suman
+# de forma exacta; solo se convierten a texto/decimal al mostrarlos o exportarlos.
+Centavos = int
+
+_CENTAVO = Decimal("0.01")
+# Enteros agrupados de a miles con `sep`: 1.234 / 12,345,678
+_MILES = {sep: re.compile(rf"\d{{1,3}}(?:{re.escape(sep)}\d{{3}})+") for sep in (",", ".")}
+# "1.234" o "1,234": igual de válido como 1234 que como 1 con 234 milésimos
+_AMBIGUO = re.compile(r"[1-9]\d{0,2}[.,]\d{3}")
+
+
+def _normalizar(texto: str) -> str:
+    """Deja el separador decimal como punto y quita los de miles.
+
+    '1.234,50' y '1,234.50' -> '1234.50'; '12,5' -> '12.5'; '1.234.567' -> '1234567'.
+    Lanza ValueError si no se puede saber cuál es el separador decimal.
+    """
+    original, signo = texto, ""
+    if texto[:1] in "+-":
+        signo, texto = texto[0], texto[1:]
+    if "," in texto and "." in texto:
+        # Con los dos, el último es el decimal y el otro debe agrupar de a miles
+        decimal = "," if texto.rfind(",") > texto.rfind(".") else "."
+        miles = "." if decimal == "," else ","
+        entero, _, fraccion = texto.rpartition(decimal)
+        if not _MILES[miles].fullmatch(entero):
+            raise ValueError(f"Monto con separadores inválidos: {original!r}")
+        return f"{signo}{entero.replace(miles, '')}.{fraccion}"
+    for sep in (",", "."):
+        if texto.count(sep) > 1:
+            if not _MILES[sep].fullmatch(texto):
+                raise ValueError(f"Monto con separadores inválidos: {original!r}")
+            return signo + texto.replace(sep, "")
+    if _AMBIGUO.fullmatch(texto):
+        raise ValueError(f"Monto ambiguo: {original!r} (no se sabe si el separador es de miles o decimal)")
+    return signo + texto.replace(",", ".")
+
+
+def a_centavos(valor: Any) -> Centavos:
+    """Convierte un monto en unidades (str, float, Decimal, int) a centavos.
+
+    Acepta coma o punto como separador decimal y el otro como separador de
+    miles. Vacíos, None y NaN valen 0; un texto no numérico o con separadores
+    ambiguos ("1.234", "1,234") lanza ValueError.
+    """
+    if valor is None:
+        return 0
+    if isinstance(valor, float) and valor != valor:  # NaN (celdas vacías de pandas)
+        return 0
+    if isinstance(valor, str):
+        texto = valor.strip().replace(" ", "")
+        if not texto:
+            return 0
+        valor = _normalizar(texto)
+    try:
+        monto = Decimal(str(valor)).quantize(_CENTAVO, rounding=ROUND_HALF_UP)
+    except InvalidOperation:
+        raise ValueError(f"Monto inválido: {valor!r}")
+    return int(monto * 100)
+
+
+def a_unidades(centavos: Centavos | None) -> Decimal:
+    """Centavos -> Decimal exacto en unidades (p. ej. 12345 -> Decimal('123.45'))."""
+    return (Decimal(int(centavos or 0)) / 100).quantize(_CENTAVO)
+
+
+def formatear_monto(centavos: Centavos | None, miles: bool = False) -> str:
+    """Texto con dos decimales sin pasar por float: 12345 -> '123.45'."""
+    c = int(centavos or 0)
+    signo = "-" if c < 0 else ""
+    enteros, resto = divmod(abs(c), 100)
+    parte_entera = f"{enteros:,}" if miles else str(enteros)
+    return f"{signo}{parte_entera}.{resto:02d}"
@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from data.models.dinero import Centavos
+
+# Lado de la línea a filtrar
+LADO_DEBE = "debe"
+LADO_HABER = "haber"
+
+
+def _escapar_like(texto: str) -> str:
+    return texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@dataclass
+class FiltroDiario:
+    """Filtro del Libro Diario.
+
+    Las condiciones de fecha y descripción aplican al asiento; las de código,
+    monto y lado aplican a sus líneas (basta con que una línea cumpla todas).
+    Un asiento que pasa el filtro se muestra completo.
+    """
+    fecha_desde: str = ""  # AAAA-MM-DD, inclusive
+    fecha_hasta: str = ""
+    codigo_prefijo: str = ""
+    monto_min: Centavos | None = None
+    monto_max: Centavos | None = None
+    lado: str = ""  # "", LADO_DEBE o LADO_HABER
+    texto: str = ""
+
+    @property
+    def activo(self) -> bool:
+        return bool(
+            self.fecha_desde or self.fecha_hasta or self.codigo_prefijo.strip() or self.texto.strip()
+            or self.monto_min is not None or self.monto_max is not None or self.lado
+        )
+
+    def _filtra_lineas(self) -> bool:
+        return bool(self.codigo_prefijo.strip() or self.monto_min is not None or self.monto_max is not None or self.lado)
+
+    def a_sql(self, alias: str = "a") -> Tuple[str, List[Any]]:
+        """Condiciones SQL (para agregar con AND) sobre `asiento {alias}` y sus parámetros."""
+        condiciones: List[str] = []
+        params: List[Any] = []
+        if self.fecha_desde:
+            condiciones.append(f"{alias}.fecha >= ?")
+            params.append(self.fecha_desde)
+        if self.fecha_hasta:
+            condiciones.append(f"{alias}.fecha <= ?")
+            params.append(self.fecha_hasta)
+        texto = self.texto.strip()
+        if texto:
+            condiciones.append(f"{alias}.descripcion LIKE ? ESCAPE '\\'")
+            params.append(f"%{_escapar_like(texto)}%")
+        if self._filtra_lineas():
+            sub: List[str] = ["fl.id_asiento = " + f"{alias}.id_asiento"]
+            prefijo = self.codigo_prefijo.strip()
+            if prefijo:
+                # Rango en lugar de LIKE para que pueda usarse idx_cuenta_contable_codigo
+                sub.append("fc.codigo_cuenta >= ? AND fc.codigo_cuenta < ?")
+                params.extend([prefijo, prefijo + "\U0010ffff"])
+            if self.lado == LADO_DEBE:
+                monto = "fl.debe"
+                sub.append("fl.debe > 0")
+            elif self.lado == LADO_HABER:
+                monto = "fl.haber"
+                sub.append("fl.haber > 0")
+            else:
+                monto = "MAX(fl.debe, fl.haber)"
+            if self.monto_min is not None:
+                sub.append(f"{monto} >= ?")
+                params.append(int(self.monto_min))
+            if self.monto_max is not None:
+                sub.append(f"{monto} <= ?")
+                params.append(int(self.monto_max))
+            condiciones.append(
+                "EXISTS (SELECT 1 FROM linea_asiento fl"
+                " JOIN cuenta_contable fc ON fc.id_cuenta_contable = fl.id_cuenta_contable"
+                " WHERE " + " AND ".join(sub) + ")"
+            )
+        return " AND ".join(condiciones), params
+
+    def coincide(self, asiento: Dict[str, Any]) -> bool:
+        """Misma regla que a_sql sobre un asiento de obtenerPaginaAsientos (ya en memoria)."""
+        fecha = asiento.get("fecha") or ""
+        if self.fecha_desde and fecha < self.fecha_desde:
+            return False
+        if self.fecha_hasta and fecha > self.fecha_hasta:
+            return False
+        texto = self.texto.strip().lower()
+        if texto and texto not in (asiento.get("descripcion") or "").lower():
+            return False
+        if not self._filtra_lineas():
+            return True
+        prefijo = self.codigo_prefijo.strip()
+        for codigo, _nombre, debe, haber in asiento.get("lineas") or []:
+            if prefijo and not (codigo or "").startswith(prefijo):
+                continue
+            if self.lado == LADO_DEBE:
+                if debe <= 0:
+                    continue
+                monto = debe
+            elif self.lado == LADO_HABER:
+                if haber <= 0:
+                    continue
+                monto = haber
+            else:
+                monto = max(debe, haber)
+            if self.monto_min is not None and monto < self.monto_min:
+                continue
+            if self.monto_max is not None and monto > self.monto_max:
+                continue
+            return True
+        return False
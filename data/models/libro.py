@@ -3,7 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, TYPE_CHECKING
 from data.models.mes import Mes
-from src.utils.paths import get_db_path
+from data.models.dinero import Centavos
+from src.utils.contexto import obtener_contexto
 
 if TYPE_CHECKING:
     from data.models.asiento import Asiento
@@ -15,8 +16,8 @@ class LibroDiario:
     ano: int = 0
     nombre_empresa: str = ""
     contador: str = ""
-    total_debe: float = 0.0
-    total_haber: float = 0.0
+    total_debe: Centavos = 0
+    total_haber: Centavos = 0
     id_plan_cuenta: int = 0
     origen: str = "creado"
     fecha_importacion: str | None = None
@@ -54,7 +55,7 @@ class LibroDiario:
         """
         try:
             from data.obtenerLineaAsiento import obtenerAsientosPorCuenta
-            return obtenerAsientosPorCuenta(get_db_path(), self.id_libro_diario)
+            return obtenerAsientosPorCuenta(obtener_contexto().db_path, self.id_libro_diario)
         except Exception as ex:
             print(f"Error obteniendo asientos para libro {self.id_libro_diario}: {ex}")
             return []
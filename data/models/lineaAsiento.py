@@ -1,14 +1,15 @@
 from dataclasses import dataclass
 from typing import Optional
 from data.models.cuenta import CuentaContable
+from data.models.dinero import Centavos
 
 @dataclass
 class LineaAsiento:
     id_linea_asiento: int = 0
     id_asiento: int = 0
     id_cuenta_contable: int = 0
-    debe: float = 0.0
-    haber: float = 0.0
+    debe: Centavos = 0
+    haber: Centavos = 0
     cuenta_contable: Optional[CuentaContable] = None  # Relación directa
     
     def __str__(self):
@@ -1,16 +1,18 @@
-import sqlite3
 from typing import List, Dict, Any, Tuple
 
+from data.database.conexion import obtener_conexion
+from data.models.filtroDiario import FiltroDiario
+
 def obtenerAsientosDeLibro(db_path: str, id_libro_diario: int) -> List[Tuple]:
     """
     Devuelve todas las líneas de asientos de un libro, unidas con su cuenta.
     Cada fila incluye:
       (id_asiento, numero_asiento, fecha, descripcion, codigo_cuenta, nombre_cuenta, debe, haber)
+    con debe/haber en centavos.
     Ordenadas por fecha e id_asiento.
     """
-    conn = None
     try:
-        conn = sqlite3.connect(db_path)
+        conn = obtener_conexion(db_path)
         cur = conn.cursor()
         cur.execute(
             """
@@ -28,12 +30,6 @@ def obtenerAsientosDeLibro(db_path: str, id_libro_diario: int) -> List[Tuple]:
         return cur.fetchall() or []
     except Exception:
         return []
-    finally:
-        if conn:
-            try:
-                conn.close()
-            except Exception:
-                pass
 
 
 def obtenerResumenAsientos(db_path: str, id_libro_diario: int) -> List[Dict[str, Any]]:
@@ -41,9 +37,8 @@ def obtenerResumenAsientos(db_path: str, id_libro_diario: int) -> List[Dict[str,
     Devuelve resumen por asiento: totales debe/haber y conteo de líneas.
     Estructura: {id_asiento, fecha, descripcion, total_debe, total_haber, lineas}
     """
-    conn = None
     try:
-        conn = sqlite3.connect(db_path)
+        conn = obtener_conexion(db_path)
         cur = conn.cursor()
         cur.execute(
             """
@@ -65,17 +60,110 @@ def obtenerResumenAsientos(db_path: str, id_libro_diario: int) -> List[Dict[str,
                 "id_asiento": r[0],
                 "fecha": r[1],
                 "descripcion": r[2],
-                "total_debe": float(r[3] or 0),
-                "total_haber": float(r[4] or 0),
+                "total_debe": int(r[3] or 0),
+                "total_haber": int(r[4] or 0),
                 "lineas": int(r[5] or 0),
             }
             for r in rows
         ]
     except Exception:
         return []
-    finally:
-        if conn:
-            try:
-                conn.close()
-            except Exception:
-                pass
+
+
+def _con_lineas(cur, cabeceras: List[Tuple]) -> List[Dict[str, Any]]:
+    """Arma los dicts de asiento desde (id, numero, fecha, descripcion) y les carga las líneas."""
+    asientos = {
+        r[0]: {"id_asiento": r[0], "numero_asiento": r[1], "fecha": r[2], "descripcion": r[3], "lineas": []}
+        for r in cabeceras
+    }
+    marcas = ",".join("?" * len(asientos))
+    cur.execute(
+        f"""
+        SELECT la.id_asiento, c.codigo_cuenta, c.nombre_cuenta, la.debe, la.haber
+        FROM linea_asiento la
+        JOIN cuenta_contable c ON c.id_cuenta_contable = la.id_cuenta_contable
+        WHERE la.id_asiento IN ({marcas})
+        ORDER BY la.id_asiento, la.id_linea_asiento
+        """,
+        list(asientos)
+    )
+    for id_asiento, codigo, nombre, debe, haber in cur:
+        asientos[id_asiento]["lineas"].append((codigo, nombre, int(debe or 0), int(haber or 0)))
+    return list(asientos.values())
+
+
+def obtenerPaginaAsientos(
+    db_path: str,
+    id_libro_diario: int,
+    despues: Tuple[str, int] | None = None,
+    antes: Tuple[str, int] | None = None,
+    limite: int = 50,
+    filtro: FiltroDiario | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Devuelve una página de asientos del libro con paginación por clave (fecha, id_asiento).
+
+    - `despues=(fecha, id)`: los `limite` asientos siguientes a esa clave.
+    - `antes=(fecha, id)`: los `limite` asientos anteriores a esa clave.
+    - Sin clave: la primera página.
+    - `filtro`: condiciones de FiltroDiario resueltas en la misma consulta.
+    El resultado siempre queda en orden ascendente. Estructura por asiento:
+      {id_asiento, numero_asiento, fecha, descripcion, lineas: [(codigo, nombre, debe, haber)]}
+    con debe/haber en centavos; un asiento sin líneas viene con la lista vacía.
+    Una página con menos de `limite` asientos indica que se llegó al extremo.
+    """
+    try:
+        cur = obtener_conexion(db_path).cursor()
+        extra, extra_params = filtro.a_sql("a") if filtro is not None and filtro.activo else ("", [])
+        extra = f" AND {extra}" if extra else ""
+        if antes is not None:
+            cur.execute(
+                f"""
+                SELECT a.id_asiento, a.numero_asiento, a.fecha, a.descripcion
+                FROM asiento a
+                WHERE a.id_libro_diario = ? AND (a.fecha, a.id_asiento) < (?, ?){extra}
+                ORDER BY a.fecha DESC, a.id_asiento DESC
+                LIMIT ?
+                """,
+                (id_libro_diario, antes[0], antes[1], *extra_params, limite)
+            )
+            cabeceras = cur.fetchall()[::-1]
+        else:
+            fecha, id_asiento = despues if despues is not None else ("", 0)
+            cur.execute(
+                f"""
+                SELECT a.id_asiento, a.numero_asiento, a.fecha, a.descripcion
+                FROM asiento a
+                WHERE a.id_libro_diario = ? AND (a.fecha, a.id_asiento) > (?, ?){extra}
+                ORDER BY a.fecha ASC, a.id_asiento ASC
+                LIMIT ?
+                """,
+                (id_libro_diario, fecha, id_asiento, *extra_params, limite)
+            )
+            cabeceras = cur.fetchall()
+        if not cabeceras:
+            return []
+        return _con_lineas(cur, cabeceras)
+    except Exception as e:
+        print(f"Database error obtaining pagina de asientos for libro {id_libro_diario}: {e}")
+        return []
+
+
+def obtenerAsientoParaDiario(db_path: str, id_asiento: int) -> Dict[str, Any] | None:
+    """
+    Devuelve un solo asiento con la misma estructura que obtenerPaginaAsientos
+    (para actualizar la vista del diario tras guardarlo), o None si no existe.
+    """
+    try:
+        cur = obtener_conexion(db_path).cursor()
+        cur.execute(
+            "SELECT id_asiento, numero_asiento, fecha, descripcion FROM asiento WHERE id_asiento = ?",
+            (id_asiento,)
+        )
+        cabeceras = cur.fetchall()
+        if not cabeceras:
+            return None
+        return _con_lineas(cur, cabeceras)[0]
+    except Exception as e:
+        print(f"Database error obtaining asiento {id_asiento}: {e}")
+        return None
@@ -1,12 +1,12 @@
-import sqlite3
 from sqlite3 import Error
 
+from data.database.conexion import obtener_conexion
+
 from data.models.libro import LibroDiario
 
 def obtenerTodosLibros(nombre_bd: str) -> list[LibroDiario]:
-    conn = None
     try:
-        conn = sqlite3.connect(nombre_bd)
+        conn = obtener_conexion(nombre_bd)
         cursor = conn.cursor()
         cursor.execute(
             "SELECT id_libro_diario, id_mes, ano, nombre_empresa, contador, total_debe, total_haber, COALESCE(origen,'creado'), fecha_importacion FROM libro_diario"
@@ -26,15 +26,10 @@ def obtenerTodosLibros(nombre_bd: str) -> list[LibroDiario]:
     except Error as e:
         print(f"Database error: {e}")
         return []
-    
-    finally:
-        if conn:
-            conn.close()
-            
+
 def obtenerLibroPorId(nombre_bd: str, id_libro_diario: int) -> LibroDiario | None:
-    conn = None
     try:
-        conn = sqlite3.connect(nombre_bd)
+        conn = obtener_conexion(nombre_bd)
         cursor = conn.cursor()
         cursor.execute(
             "SELECT id_libro_diario, id_mes, ano, nombre_empresa, contador, total_debe, total_haber, COALESCE(origen,'creado'), fecha_importacion FROM libro_diario WHERE id_libro_diario = ?", 
@@ -59,7 +54,3 @@ def obtenerLibroPorId(nombre_bd: str, id_libro_diario: int) -> LibroDiario | Non
     except Error as e:
         print(f"Database error: {e}")
         return None
-    
-    finally:
-        if conn:
-            conn.close()
\ No newline at end of file
@@ -1,64 +1,86 @@
-import sqlite3
 from sqlite3 import Error
-from typing import List
+from typing import Dict, Iterable, List
 from data.models.lineaAsiento import LineaAsiento
 from data.models.cuenta import CuentaContable
+from data.database.conexion import obtener_conexion
+
+# Máximo de parámetros por consulta IN (...) para no superar el límite de SQLite
+_LOTE_IDS = 500
+
+_SELECT_LINEAS = """
+    SELECT la.id_linea_asiento, la.id_asiento, la.id_cuenta_contable, la.debe, la.haber,
+           c.id_cuenta_contable, c.id_generico, c.descripcion, c.nombre_cuenta, c.codigo_cuenta
+    FROM linea_asiento la
+    LEFT JOIN cuenta_contable c ON c.id_cuenta_contable = la.id_cuenta_contable
+"""
+
+
+def _fila_a_linea(row) -> LineaAsiento:
+    id_linea, id_asiento, id_cuenta, debe, haber = row[:5]
+    if row[5] is not None:
+        cuenta = CuentaContable(
+            id_cuenta_contable=row[5],
+            id_generico=row[6],
+            descripcion=row[7],
+            nombre_cuenta=row[8],
+            codigo_cuenta=row[9]
+        )
+    else:
+        cuenta = CuentaContable()
+    return LineaAsiento(
+        id_linea_asiento=id_linea,
+        id_asiento=id_asiento,
+        id_cuenta_contable=id_cuenta,
+        debe=debe,
+        haber=haber,
+        cuenta_contable=cuenta,
+    )
 
 
 def obtenerLineasPorAsiento(db_path: str, id_asiento: int) -> List[LineaAsiento]:
-	"""Obtiene las líneas de asiento para un `id_asiento` dado.
+    """Obtiene las líneas de asiento para un `id_asiento` dado.
 
-	Devuelve una lista de objetos `LineaAsiento` con la propiedad
-	`cuenta_contable` rellenada con los datos básicos (id, id_generico,
-	descripcion, nombre_cuenta, codigo_cuenta).
-	"""
-	lineas: List[LineaAsiento] = []
-	conn = None
-	try:
-		conn = sqlite3.connect(db_path)
-		cursor = conn.cursor()
-		cursor.execute(
-			"SELECT id_linea_asiento, id_asiento, id_cuenta_contable, debe, haber FROM linea_asiento WHERE id_asiento = ?",
-			(id_asiento,)
-		)
-		rows = cursor.fetchall()
-		for row in rows:
-			id_linea, id_asiento_row, id_cuenta, debe, haber = row
+    Devuelve una lista de objetos `LineaAsiento` con la propiedad
+    `cuenta_contable` rellenada con los datos básicos (id, id_generico,
+    descripcion, nombre_cuenta, codigo_cuenta).
+    """
+    try:
+        cursor = obtener_conexion(db_path).cursor()
+        cursor.execute(
+            _SELECT_LINEAS + " WHERE la.id_asiento = ? ORDER BY la.id_linea_asiento",
+            (id_asiento,)
+        )
+        return [_fila_a_linea(row) for row in cursor.fetchall()]
+    except Error as e:
+        print(f"Database error obtaining lineas for asiento {id_asiento}: {e}")
+        return []
 
-			# Obtener datos básicos de la cuenta vinculada
-			cursor.execute(
-				"SELECT id_cuenta_contable, id_generico, descripcion, nombre_cuenta, codigo_cuenta FROM cuenta_contable WHERE id_cuenta_contable = ?",
-				(id_cuenta,)
-			)
-			crow = cursor.fetchone()
-			if crow:
-				cuenta = CuentaContable(
-					id_cuenta_contable=crow[0],
-					id_generico=crow[1],
-					descripcion=crow[2],
-					nombre_cuenta=crow[3],
-					codigo_cuenta=crow[4]
-				)
-			else:
-				cuenta = CuentaContable()
 
-			linea = LineaAsiento(
-				id_linea_asiento=id_linea,
-				id_asiento=id_asiento_row,
-				id_cuenta_contable=id_cuenta,
-				debe=debe,
-				haber=haber,
-				cuenta_contable=cuenta,
-			)
-			lineas.append(linea)
+def obtenerLineasPorAsientos(db_path: str, ids_asiento: Iterable[int]) -> Dict[int, List[LineaAsiento]]:
+    """Obtiene las líneas de varios asientos en una sola pasada.
 
-	except Error as e:
-		print(f"Database error obtaining lineas for asiento {id_asiento}: {e}")
-	finally:
-		if conn:
-			conn.close()
+    Devuelve un dict `id_asiento -> [LineaAsiento]`; los asientos sin líneas
+    aparecen con lista vacía.
+    """
+    ids = list(dict.fromkeys(int(i) for i in ids_asiento if i))
+    resultado: Dict[int, List[LineaAsiento]] = {i: [] for i in ids}
+    if not ids:
+        return resultado
+    try:
+        cursor = obtener_conexion(db_path).cursor()
+        for inicio in range(0, len(ids), _LOTE_IDS):
+            lote = ids[inicio:inicio + _LOTE_IDS]
+            marcas = ",".join("?" * len(lote))
+            cursor.execute(
+                _SELECT_LINEAS + f" WHERE la.id_asiento IN ({marcas}) ORDER BY la.id_asiento, la.id_linea_asiento",
+                lote
+            )
+            for row in cursor.fetchall():
+                resultado[row[1]].append(_fila_a_linea(row))
+    except Error as e:
+        print(f"Database error obtaining lineas for asientos: {e}")
+    return resultado
 
-	return lineas
 
 def obtenerAsientosPorCuenta(db_path: str, id_cuenta_contable: int) -> List[LineaAsiento]:
     """Obtiene las líneas de asiento asociadas a una cuenta contable específica.
@@ -66,50 +88,13 @@ def obtenerAsientosPorCuenta(db_path: str, id_cuenta_contable: int) -> List[Line
     Devuelve una lista de objetos `LineaAsiento` que pertenecen a la cuenta
     contable indicada por `id_cuenta_contable`.
     """
-    lineas: List[LineaAsiento] = []
-    conn = None
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        cursor = obtener_conexion(db_path).cursor()
         cursor.execute(
-            "SELECT id_linea_asiento, id_asiento, id_cuenta_contable, debe, haber FROM linea_asiento WHERE id_cuenta_contable = ?",
+            _SELECT_LINEAS + " WHERE la.id_cuenta_contable = ? ORDER BY la.id_asiento, la.id_linea_asiento",
             (id_cuenta_contable,)
         )
-        rows = cursor.fetchall()
-        for row in rows:
-            id_linea, id_asiento_row, id_cuenta, debe, haber = row
-
-            # Obtener datos básicos de la cuenta vinculada
-            cursor.execute(
-                "SELECT id_cuenta_contable, id_generico, descripcion, nombre_cuenta, codigo_cuenta FROM cuenta_contable WHERE id_cuenta_contable = ?",
-                (id_cuenta,)
-            )
-            crow = cursor.fetchone()
-            if crow:
-                cuenta = CuentaContable(
-                    id_cuenta_contable=crow[0],
-                    id_generico=crow[1],
-                    descripcion=crow[2],
-                    nombre_cuenta=crow[3],
-                    codigo_cuenta=crow[4]
-                )
-            else:
-                cuenta = CuentaContable()
-
-            linea = LineaAsiento(
-                id_linea_asiento=id_linea,
-                id_asiento=id_asiento_row,
-                id_cuenta_contable=id_cuenta,
-                debe=debe,
-                haber=haber,
-                cuenta_contable=cuenta,
-            )
-            lineas.append(linea)
-
+        return [_fila_a_linea(row) for row in cursor.fetchall()]
     except Error as e:
         print(f"Database error obtaining lineas for cuenta {id_cuenta_contable}: {e}")
-    finally:
-        if conn:
-            conn.close()
-
-    return lineas
\ No newline at end of file
+        return []
@@ -0,0 +1,37 @@
+from sqlite3 import Error
+from typing import List
+
+from data.models.lineaAsiento import LineaAsiento
+from data.database.conexion import obtener_conexion
+
+
+def obtenerMovimientosCuenta(db_path: str, id_libro_diario: int, id_cuenta_contable: int) -> List[LineaAsiento]:
+    """
+    Devuelve las líneas de una cuenta dentro de un libro, ordenadas por fecha del asiento.
+    Es lo que necesita una tarjeta del Mayor al expandirse; montos en centavos.
+    """
+    try:
+        cur = obtener_conexion(db_path).cursor()
+        cur.execute(
+            """
+            SELECT la.id_linea_asiento, la.id_asiento, la.debe, la.haber
+            FROM linea_asiento la
+            JOIN asiento a ON a.id_asiento = la.id_asiento
+            WHERE la.id_cuenta_contable = ? AND a.id_libro_diario = ?
+            ORDER BY a.fecha ASC, la.id_linea_asiento ASC
+            """,
+            (id_cuenta_contable, id_libro_diario)
+        )
+        return [
+            LineaAsiento(
+                id_linea_asiento=id_linea,
+                id_asiento=id_asiento,
+                id_cuenta_contable=id_cuenta_contable,
+                debe=int(debe or 0),
+                haber=int(haber or 0),
+            )
+            for id_linea, id_asiento, debe, haber in cur.fetchall()
+        ]
+    except Error as e:
+        print(f"Database error obtaining movimientos for cuenta {id_cuenta_contable} in libro {id_libro_diario}: {e}")
+        return []
@@ -1,13 +1,10 @@
-import sqlite3
 from sqlite3 import Error
 from data.models.mes import Mes
-from src.utils.paths import get_db_path
+from data.database.conexion import obtener_conexion
 
 def obtenerMeses() -> list[Mes]:
-    conn=None
-    
     try:
-        conn=sqlite3.connect(get_db_path())
+        conn=obtener_conexion()
         cursor=conn.cursor()
         cursor.execute("SELECT id_mes, nombre_mes FROM mes")
         rows=cursor.fetchall()
@@ -17,9 +14,5 @@ def obtenerMeses() -> list[Mes]:
     except Error as e:
         print(f"Database error: {e}")
         meses = []
-        
-    finally:
-        if conn:
-            conn.close()
-            
+
     return meses
\ No newline at end of file
@@ -1,7 +1,8 @@
-import sqlite3
 from sqlite3 import Error
 from typing import Optional
 
+from data.database.conexion import obtener_conexion
+
 
 def crear_plan_cuenta(db_path: str, nombre_plan: str) -> Optional[int]:
     """
@@ -10,8 +11,7 @@ def crear_plan_cuenta(db_path: str, nombre_plan: str) -> Optional[int]:
     """
     conn = None
     try:
-        conn = sqlite3.connect(db_path, timeout=5)
-        conn.execute("PRAGMA busy_timeout=3000")
+        conn = obtener_conexion(db_path)
         cur = conn.cursor()
         # Evitar duplicados por nombre
         cur.execute("SELECT id_plan_cuenta FROM plan_cuentas WHERE nombre_plan_cuentas = ?", (nombre_plan,))
@@ -27,13 +27,9 @@ def crear_plan_cuenta(db_path: str, nombre_plan: str) -> Optional[int]:
         return cur.lastrowid
     except Error as e:
         print(f"Error creando plan de cuentas: {e}")
-        return None
-    finally:
         if conn:
-            try:
-                conn.close()
-            except Exception:
-                pass
+            conn.rollback()
+        return None
 
 
 def copiar_cuentas_de_plan(db_path: str, origen_id: int, destino_id: int) -> int:
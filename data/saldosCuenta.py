@@ -0,0 +1,102 @@
+import sys
+import sqlite3
+from sqlite3 import Error
+from typing import Any, Dict, List, Tuple
+
+from data.database.conexion import obtener_conexion
+
+
+def recalcular_saldos_en_cursor(cursor: sqlite3.Cursor, id_libro_diario: int | None = None) -> None:
+    """Reconstruye saldo_cuenta_libro desde linea_asiento (todo o un solo libro)."""
+    if id_libro_diario is None:
+        cursor.execute("DELETE FROM saldo_cuenta_libro")
+        filtro, params = "", ()
+    else:
+        cursor.execute("DELETE FROM saldo_cuenta_libro WHERE id_libro_diario = ?", (id_libro_diario,))
+        filtro, params = "WHERE a.id_libro_diario = ?", (id_libro_diario,)
+    cursor.execute(
+        f"""
+        INSERT INTO saldo_cuenta_libro (id_libro_diario, id_cuenta_contable, debe, haber, movimientos)
+        SELECT a.id_libro_diario, la.id_cuenta_contable,
+               COALESCE(SUM(la.debe), 0), COALESCE(SUM(la.haber), 0), COUNT(*)
+        FROM linea_asiento la
+        JOIN asiento a ON a.id_asiento = la.id_asiento
+        {filtro}
+        GROUP BY a.id_libro_diario, la.id_cuenta_contable
+        """,
+        params
+    )
+
+
+def recalcular_saldos_cuenta_libro(db_path: str | None = None, id_libro_diario: int | None = None) -> bool:
+    """Backfill de saldo_cuenta_libro. Los triggers lo mantienen al día después."""
+    conn = None
+    try:
+        conn = obtener_conexion(db_path)
+        with conn:
+            recalcular_saldos_en_cursor(conn.cursor(), id_libro_diario)
+        return True
+    except Error as e:
+        print(f"Error recalculando saldos: {e}")
+        return False
+
+
+def obtenerSaldosPorLibro(db_path: str, id_libro_diario: int) -> List[Dict[str, Any]]:
+    """
+    Devuelve los saldos por cuenta de un libro, ordenados por código.
+    Estructura: {id_cuenta_contable, codigo_cuenta, nombre_cuenta, total_debe, total_haber, movimientos}
+    con montos en centavos.
+    """
+    try:
+        cur = obtener_conexion(db_path).cursor()
+        cur.execute(
+            """
+            SELECT s.id_cuenta_contable, c.codigo_cuenta, c.nombre_cuenta,
+                   s.debe, s.haber, s.movimientos
+            FROM saldo_cuenta_libro s
+            JOIN cuenta_contable c ON c.id_cuenta_contable = s.id_cuenta_contable
+            WHERE s.id_libro_diario = ?
+            ORDER BY c.orden ASC, s.id_cuenta_contable ASC
+            """,
+            (id_libro_diario,)
+        )
+        return [
+            {
+                "id_cuenta_contable": r[0],
+                "codigo_cuenta": r[1] or "",
+                "nombre_cuenta": r[2] or "",
+                "total_debe": int(r[3] or 0),
+                "total_haber": int(r[4] or 0),
+                "movimientos": int(r[5] or 0),
+            }
+            for r in cur.fetchall()
+        ]
+    except Error as e:
+        print(f"Database error obtaining saldos for libro {id_libro_diario}: {e}")
+        return []
+
+
+def obtenerTotalesLibro(db_path: str, id_libro_diario: int) -> Tuple[int, int]:
+    """Devuelve (total_debe, total_haber) del libro, en centavos, sumando sus saldos por cuenta."""
+    try:
+        cur = obtener_conexion(db_path).cursor()
+        cur.execute(
+            "SELECT COALESCE(SUM(debe), 0), COALESCE(SUM(haber), 0) FROM saldo_cuenta_libro WHERE id_libro_diario = ?",
+            (id_libro_diario,)
+        )
+        debe, haber = cur.fetchone()
+        return int(debe or 0), int(haber or 0)
+    except Error as e:
+        print(f"Database error obtaining totales for libro {id_libro_diario}: {e}")
+        return 0, 0
+
+
+if __name__ == "__main__":
+    # Backfill manual: python -m data.saldosCuenta [ruta_bd]
+    from data.database.migraciones import VERSION_ESQUEMA, migrar_db
+    from src.utils.paths import get_db_path
+    ruta = sys.argv[1] if len(sys.argv) > 1 else get_db_path()
+    if migrar_db(ruta) != VERSION_ESQUEMA:
+        sys.exit(f"❌ La BD {ruta} no quedó en la versión {VERSION_ESQUEMA} del esquema")
+    if recalcular_saldos_cuenta_libro(ruta):
+        print(f"✅ Saldos por cuenta recalculados en {ruta}")
@@ -1,3 +1,4 @@
+from src.utils import arranque  # noqa: F401  (primero: marca el inicio del proceso)
 import flet as ft
 from app_entry import main
 
@@ -0,0 +1,79 @@
+"""
+Caché en disco de los Excel exportados.
+
+Cada archivo se guarda con la clave (libro, versión del libro, huella de formato):
+si el libro no cambió desde la última exportación, volver a exportarlo es copiar
+un archivo. La versión la mantienen triggers (ver migración 8) y solo se conserva
+la entrada más reciente de cada libro.
+
+Los ids de libro y sus versiones se repiten entre bases distintas, así que cada
+BD tiene su propia subcarpeta según su identificador (migración 9) y su ruta.
+"""
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+CARPETA = "exportaciones_cache"
+
+
+def carpeta_cache(db_path: str, id_bd: str) -> Path:
+    """Carpeta de la caché de esta BD, junto al archivo de la base de datos."""
+    ruta = Path(db_path).resolve()
+    return ruta.parent / CARPETA / f"bd_{huella(id_bd, str(ruta))}"
+
+
+def huella(*partes) -> str:
+    """Resumen corto y estable de lo que, además de la versión, define el archivo."""
+    h = hashlib.sha1()
+    for parte in partes:
+        h.update(repr(parte).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+def _ruta(db_path: str, id_bd: str, libro_id: int, version: int, clave: str) -> Path:
+    return carpeta_cache(db_path, id_bd) / f"libro_{libro_id}_v{version}_{clave}.xlsx"
+
+
+def copiar_a(origen: Path, destino: Path) -> None:
+    """Copia pasando por un .part para no dejar nunca un archivo a medias."""
+    temporal = destino.with_name(destino.name + ".part")
+    try:
+        shutil.copyfile(origen, temporal)
+        os.replace(temporal, destino)
+    finally:
+        temporal.unlink(missing_ok=True)
+
+
+def buscar(db_path: str, id_bd: str, libro_id: int, version: int, clave: str) -> Path | None:
+    """Ruta del archivo en caché para esa clave, o None si no está."""
+    ruta = _ruta(db_path, id_bd, libro_id, version, clave)
+    return ruta if ruta.is_file() else None
+
+
+def guardar(db_path: str, id_bd: str, libro_id: int, version: int, clave: str, archivo: Path) -> None:
+    """Guarda una copia de `archivo` como la entrada vigente del libro y borra las anteriores."""
+    try:
+        destino = _ruta(db_path, id_bd, libro_id, version, clave)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        copiar_a(archivo, destino)
+        _borrar(destino.parent, libro_id, excepto=destino)
+    except OSError as e:
+        print(f"No se pudo guardar la exportación en caché: {e}")
+
+
+def invalidar_libro(db_path: str, id_bd: str, libro_id: int) -> None:
+    """Borra las entradas de un libro (p. ej. al eliminarlo, porque su id puede reutilizarse)."""
+    carpeta = carpeta_cache(db_path, id_bd)
+    if carpeta.is_dir():
+        _borrar(carpeta, libro_id)
+
+
+def _borrar(carpeta: Path, libro_id: int, excepto: Path | None = None) -> None:
+    for ruta in carpeta.glob(f"libro_{libro_id}_v*.xlsx"):
+        if ruta != excepto:
+            try:
+                ruta.unlink()
+            except OSError as e:
+                print(f"No se pudo borrar {ruta.name} de la caché: {e}")
@@ -1,354 +1,625 @@
+import argparse
+import json
+import os
+import re
 import sqlite3
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from copy import copy
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
+from threading import Event
+from typing import Callable, Iterable, Sequence
 
-import pandas as pd
+import numpy as np
 from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from openpyxl.utils import get_column_letter
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
+from openpyxl.styles.cell_style import StyleArray
 
 # Ensure project root (parent of src/) is on sys.path so src package resolves
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
-from src.utils.paths import get_db_path
-
-
-def exportar_libro_diario(libro_id: int, output_file: str | Path | None = None) -> Path:
-    """Genera un Excel del libro diario indicado por id.
-
-    Devuelve la ruta del archivo generado. Si no hay datos, lanza ValueError.
+from src.utils.contexto import obtener_contexto
+from data.database.conexion import abrir_solo_lectura
+from data.database.migraciones import obtener_identidad
+from data.models.dinero import a_unidades
+from src.services import cacheExportacion
+
+# Una sola pasada por las líneas del libro, en el orden del Diario; solo columnas numéricas
+SQL_LINEAS = """
+    SELECT la.id_asiento, la.id_cuenta_contable, COALESCE(la.debe, 0), COALESCE(la.haber, 0)
+    FROM linea_asiento la
+    INNER JOIN asiento a ON la.id_asiento = a.id_asiento
+    INNER JOIN cuenta_contable cc ON la.id_cuenta_contable = cc.id_cuenta_contable
+    WHERE a.id_libro_diario = ?
+    ORDER BY a.id_asiento, la.id_linea_asiento
+"""
+
+SQL_CUENTAS = """
+    SELECT id_cuenta_contable, codigo_cuenta, nombre_cuenta, descripcion, COALESCE(orden, '')
+    FROM cuenta_contable
+    WHERE id_cuenta_contable IN ({marcas})
+"""
+
+# Libros del lote, los de más asientos primero para repartir mejor la carga entre procesos
+SQL_LIBROS = """
+    SELECT l.id_libro_diario, l.nombre_empresa, l.ano, l.id_mes
+    FROM libro_diario l
+    WHERE (? IS NULL OR l.ano = ?)
+    ORDER BY (SELECT COUNT(*) FROM asiento a WHERE a.id_libro_diario = l.id_libro_diario) DESC, l.id_libro_diario
+"""
+
+# (asientos, líneas) del libro, con el mismo criterio que SQL_LINEAS
+SQL_CONTEO = """
+    SELECT COUNT(DISTINCT la.id_asiento), COUNT(*)
+    FROM linea_asiento la
+    INNER JOIN asiento a ON la.id_asiento = a.id_asiento
+    INNER JOIN cuenta_contable cc ON la.id_cuenta_contable = cc.id_cuenta_contable
+    WHERE a.id_libro_diario = ?
+"""
+
+# Máximo de parámetros por consulta IN (...) para no superar el límite de SQLite
+_LOTE_IDS = 500
+
+SQL_PLAN = """
+    SELECT t.numero_cuenta, t.nombre_tipo_cuenta, r.numero_cuenta, r.nombre_rubro,
+           g.numero_cuenta, g.nombre_generico, c.codigo_cuenta, c.nombre_cuenta, c.descripcion
+    FROM tipo_cuenta t
+    LEFT JOIN rubro r ON r.id_tipo_cuenta = t.id_tipo_cuenta
+    LEFT JOIN generico g ON g.id_rubro = r.id_rubro
+    LEFT JOIN cuenta_contable c ON c.id_generico = g.id_generico
+    WHERE t.id_plan_cuenta = ?
+    ORDER BY t.orden, r.orden, g.orden, c.orden
+"""
+
+# Datos impresos de las cuentas que usan las líneas del libro (pueden ser de
+# otro plan); saldo_cuenta_libro tiene justo esos pares libro/cuenta
+SQL_CUENTAS_LIBRO = """
+    SELECT c.id_cuenta_contable, c.codigo_cuenta, c.nombre_cuenta, c.descripcion
+    FROM saldo_cuenta_libro s
+    JOIN cuenta_contable c ON c.id_cuenta_contable = s.id_cuenta_contable
+    WHERE s.id_libro_diario = ?
+    ORDER BY c.id_cuenta_contable
+"""
+
+ENCABEZADOS_PLAN = [
+    "TipoCodigo",
+    "TipoNombre",
+    "RubroCodigo",
+    "RubroNombre",
+    "GenericoCodigo",
+    "GenericoNombre",
+    "CuentaCodigo",
+    "CuentaNombre",
+    "CuentaDescripcion",
+]
+
+FORMATO_MONTO = "#,##0.00"
+
+# Subir al cambiar el diseño de las hojas: deja sin efecto los Excel ya guardados en caché
+VERSION_FORMATO = 1
+
+# Líneas escritas entre dos avisos de progreso
+PASO_PROGRESO = 2000
+
+# progreso(hoja, hechas, total, fraccion): líneas de la hoja y avance total de 0 a 1
+Progreso = Callable[[str, int, int, float], None]
+
+
+class ExportacionCancelada(Exception):
+    """La exportación se canceló antes de terminar; no queda archivo a medias."""
+
+
+class _Avance:
+    """Avisa el progreso por hoja y cada PASO_PROGRESO líneas, y corta si se pidió cancelar."""
+
+    # Tramo de la barra total que ocupa cada etapa: Diario y Mayor recorren todas las líneas
+    TRAMOS = {
+        "Libro Diario": (0.0, 0.48),
+        "Libro Mayor": (0.48, 0.96),
+        "Plan de Cuentas": (0.96, 0.98),
+        "Guardando": (0.98, 1.0),
+    }
+
+    def __init__(self, total_lineas: int, progreso: Progreso | None = None, cancelar: Event | None = None):
+        self.total_lineas = total_lineas
+        self.progreso = progreso
+        self.cancelar = cancelar
+
+    def __call__(self, etapa: str, hechas: int = 0, total: int | None = None) -> None:
+        if self.cancelar is not None and self.cancelar.is_set():
+            raise ExportacionCancelada("Exportación cancelada.")
+        if self.progreso is not None:
+            total = self.total_lineas if total is None else total
+            inicio, fin = self.TRAMOS[etapa]
+            self.progreso(etapa, hechas, total, inicio + (fin - inicio) * min(hechas, total) / max(1, total))
+
+    def terminado(self) -> None:
+        """Avisa el 100 %: el archivo ya está en su lugar y no se puede cancelar."""
+        if self.progreso is not None:
+            self.progreso("Guardando", 1, 1, 1.0)
+
+
+@dataclass
+class _DatosLibro:
+    """Líneas de un libro en columnas (orden del Diario) más sus asientos y cuentas.
+
+    Las hojas Diario y Mayor salen de estos mismos arreglos: el Diario los
+    recorre tal cual y el Mayor los reordena por cuenta con un argsort estable.
     """
-    bd_path = get_db_path()
-    conn = sqlite3.connect(bd_path)
-    df = pd.read_sql_query(
-        """
-        SELECT 
-            a.id_libro_diario AS Libro_Diario,
-            ld.nombre_empresa,
-            ld.contador,
-            a.id_asiento AS AsientoID,
-            a.fecha AS Fecha,
-            cc.codigo_cuenta AS Código,
-            cc.descripcion AS Descripción,
-            la.debe AS Debe,
-            la.haber AS Haber,
-            a.descripcion AS Comentario
-        FROM linea_asiento la 
-        INNER JOIN asiento a ON la.id_asiento=a.id_asiento
-        INNER JOIN cuenta_contable cc ON la.id_cuenta_contable = cc.id_cuenta_contable
-        INNER JOIN libro_diario ld ON a.id_libro_diario = ld.id_libro_diario
-        WHERE a.id_libro_diario = ?
-        ORDER BY a.id_asiento, la.id_linea_asiento
-        """,
-        conn,
-        params=(libro_id,),
-    )
-    conn.close()
-
-    if df.empty:
-        raise ValueError("No se encontraron registros para exportar.")
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Libro Diario"
-
-    thin_border = Border(
+    asiento: np.ndarray
+    cuenta: np.ndarray
+    debe: np.ndarray
+    haber: np.ndarray
+    # id_asiento -> (fecha, comentario)
+    asientos: dict[int, tuple[str, str]]
+    # id_cuenta_contable -> (codigo, nombre, descripcion, orden)
+    cuentas: dict[int, tuple[str, str, str, str]]
+
+
+def _cargar_datos(conn, libro_id: int) -> _DatosLibro | None:
+    """Lee las líneas del libro en una sola consulta. None si el libro no tiene líneas."""
+    filas = conn.execute(SQL_LINEAS, (libro_id,)).fetchall()
+    if not filas:
+        return None
+    columnas = np.array(filas, dtype=np.int64)
+    asiento, cuenta, debe, haber = (columnas[:, i].copy() for i in range(4))
+
+    asientos = {
+        r[0]: (r[1], r[2])
+        for r in conn.execute("SELECT id_asiento, fecha, descripcion FROM asiento WHERE id_libro_diario = ?", (libro_id,))
+    }
+    ids = np.unique(cuenta).tolist()
+    cuentas: dict[int, tuple[str, str, str, str]] = {}
+    for inicio in range(0, len(ids), _LOTE_IDS):
+        lote = ids[inicio:inicio + _LOTE_IDS]
+        for r in conn.execute(SQL_CUENTAS.format(marcas=",".join("?" * len(lote))), lote):
+            cuentas[r[0]] = (r[1], r[2], r[3], r[4])
+    return _DatosLibro(asiento, cuenta, debe, haber, asientos, cuentas)
+
+
+def _limites(claves: np.ndarray) -> list[tuple[int, int]]:
+    """Tramos [inicio, fin) de valores iguales consecutivos en `claves`."""
+    cortes = (np.flatnonzero(np.diff(claves)) + 1).tolist()
+    bordes = [0, *cortes, len(claves)]
+    return list(zip(bordes, bordes[1:]))
+
+
+def _orden_mayor(datos: _DatosLibro) -> np.ndarray:
+    """Índices de las líneas en el orden del Mayor: por cuenta (orden natural, id) y,
+    dentro de cada cuenta, en el orden del Diario (el argsort es estable)."""
+    ids = np.unique(datos.cuenta)
+    por_clave = sorted(range(len(ids)), key=lambda i: (datos.cuentas[int(ids[i])][3], int(ids[i])))
+    rango = np.empty(len(ids), dtype=np.int64)
+    rango[por_clave] = np.arange(len(ids))
+    return np.argsort(rango[np.searchsorted(ids, datos.cuenta)], kind="stable")
+
+
+def _registrar_estilos(wb: Workbook) -> None:
+    """Crea una sola vez los estilos con nombre que usan las tres hojas."""
+    borde = Border(
         left=Side(style="thin"),
         right=Side(style="thin"),
         top=Side(style="thin"),
         bottom=Side(style="thin"),
     )
+    centro = Alignment(horizontal="center", vertical="center")
+    estilos = [
+        NamedStyle("titulo", font=Font(bold=True, size=16), alignment=centro, fill=PatternFill("solid", fgColor="0C46E6"), border=borde),
+        NamedStyle("encabezado", font=Font(bold=True, size=14), alignment=centro, fill=PatternFill("solid", fgColor="2F9EE7"), border=borde),
+        NamedStyle("borde", border=borde),
+        NamedStyle("centro", alignment=centro, border=borde),
+        NamedStyle("fecha", alignment=centro, border=borde, number_format="DD/MM/YYYY"),
+        NamedStyle("monto", alignment=centro, border=borde, number_format=FORMATO_MONTO),
+        NamedStyle("cuenta_debe", alignment=Alignment(horizontal="left", vertical="center"), border=borde),
+        NamedStyle("cuenta_haber", alignment=Alignment(horizontal="left", vertical="center", indent=2), border=borde),
+        NamedStyle("comentario", font=Font(italic=True), alignment=centro, border=borde),
+        NamedStyle("cuenta_mayor", font=Font(bold=True, size=13), alignment=centro, fill=PatternFill("solid", fgColor="2F9EE7"), border=borde),
+        NamedStyle("columna_mayor", font=Font(bold=True), alignment=centro, fill=PatternFill("solid", fgColor="B7D8FF"), border=borde),
+        NamedStyle("total", font=Font(bold=True), alignment=centro, border=borde),
+        NamedStyle("total_monto", font=Font(bold=True), alignment=centro, border=borde, number_format=FORMATO_MONTO),
+    ]
+    for estilo in estilos:
+        wb.add_named_style(estilo)
 
-    nombre_empresa = df.iloc[0]["nombre_empresa"]
-    contador = df.iloc[0]["contador"]
-
-    def _apply_header(sheet, title_text: str):
-        sheet.insert_rows(1)
-        sheet.merge_cells("A1:E1")
-        cell_title = sheet["A1"]
-        cell_title.value = title_text
-        cell_title.font = Font(bold=True, size=16)
-        cell_title.alignment = Alignment(horizontal="center", vertical="center")
-        cell_title.fill = PatternFill("solid", fgColor="0C46E6")
-        cell_title.border = thin_border
-
-        headers = ["Fecha", "Código", "Descripción", "Debe", "Haber"]
-        for col_idx, h in enumerate(headers, start=1):
-            cell = sheet.cell(row=2, column=col_idx, value=h)
-            cell.font = Font(bold=True, size=14)
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.fill = PatternFill("solid", fgColor="2F9EE7")
-            cell.border = thin_border
-
-    def _apply_column_formats(sheet):
-        sheet.column_dimensions["A"].width = 15
-        sheet.column_dimensions["B"].width = 15
-        sheet.column_dimensions["C"].width = 50
-        sheet.column_dimensions["D"].width = 20
-        sheet.column_dimensions["E"].width = 20
-
-        for cell in sheet["A"]:
-            if cell.row != 1 and cell.value not in (None, ""):
-                cell.number_format = "DD/MM/YYYY"
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        for cell in sheet["B"]:
-            if cell.row != 1:
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        for col in ["D", "E"]:
-            for cell in sheet[col]:
-                if cell.row != 1:
-                    cell.number_format = "#,##0.00"
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-
-    _apply_header(ws, f"Libro Diario: Empresa({nombre_empresa}) (Contador: {contador})")
-
-    fila = 3
-    separador_num = 1
-
-    for id_asiento, grupo in df.groupby("AsientoID", sort=False):
-        fecha = grupo.iloc[0]["Fecha"]
-
-        ws.cell(row=fila, column=1, value=fecha)
-        ws.cell(row=fila, column=3, value=f"-------({separador_num})-------")
-        ws.cell(row=fila, column=1).alignment = Alignment(horizontal="center", vertical="center")
-        ws.cell(row=fila, column=3).alignment = Alignment(horizontal="center", vertical="center")
-        for col in range(1, 6):
-            ws.cell(row=fila, column=col).border = thin_border
-
-        fila += 1
-        separador_num += 1
-
-        for _, r in grupo.iterrows():
-            ws.cell(row=fila, column=1, value=None)
-            ws.cell(row=fila, column=2, value=r["Código"])
-
-            cell_desc = ws.cell(row=fila, column=3, value=r["Descripción"])
-            if r["Debe"] and r["Debe"] > 0:
-                cell_desc.alignment = Alignment(horizontal="left", vertical="center")
-            else:
-                cell_desc.alignment = Alignment(horizontal="left", vertical="center", indent=2)
-
-            cell_debe = ws.cell(row=fila, column=4, value=r["Debe"])
-            cell_debe.alignment = Alignment(horizontal="center", vertical="center")
-
-            cell_haber = ws.cell(row=fila, column=5, value=r["Haber"])
-            cell_haber.alignment = Alignment(horizontal="center", vertical="center")
-
-            for col in range(1, 6):
-                ws.cell(row=fila, column=col).border = thin_border
-
-            fila += 1
-
-        comentario = grupo.iloc[0]["Comentario"]
+
+class _Celdas:
+    """Arma las celdas de una hoja write_only con estilos con nombre resueltos una sola vez.
+
+    Asignar `cell.style = nombre` busca el estilo en el libro en cada celda;
+    aquí se resuelve una vez y las celdas copian el arreglo de estilo ya armado.
+    """
+
+    def __init__(self, ws):
+        self.ws = ws
+        self._resueltos: dict[str, StyleArray] = {}
+
+    def fila(self, valores: Sequence, estilos: Sequence[str | None]) -> list:
+        """Celdas de una fila en modo write_only, cada una con su estilo con nombre."""
+        celdas = []
+        for valor, estilo in zip(valores, estilos):
+            celda = WriteOnlyCell(self.ws, value=valor)
+            if estilo:
+                celda._style = copy(self._resolver(estilo))
+            celdas.append(celda)
+        return celdas
+
+    def _resolver(self, nombre: str) -> StyleArray:
+        arreglo = self._resueltos.get(nombre)
+        if arreglo is None:
+            celda = WriteOnlyCell(self.ws)
+            celda.style = nombre
+            arreglo = self._resueltos[nombre] = celda._style
+        return arreglo
+
+
+def _anchos(ws, anchos: dict[str, float]) -> None:
+    # En write_only las columnas se escriben con la primera fila: fijarlas antes de append
+    for letra, ancho in anchos.items():
+        ws.column_dimensions[letra].width = ancho
+
+
+def _hoja_diario(wb: Workbook, titulo: str, datos: _DatosLibro, avance: _Avance) -> None:
+    avance("Libro Diario")
+    ws = wb.create_sheet("Libro Diario")
+    celdas = _Celdas(ws)
+    _anchos(ws, {"A": 15, "B": 15, "C": 50, "D": 20, "E": 20})
+    ws.merged_cells.add("A1:E1")
+    ws.append(celdas.fila([titulo], ["titulo"]))
+    ws.append(celdas.fila(["Fecha", "Código", "Descripción", "Debe", "Haber"], ["encabezado"] * 5))
+
+    estilos_separador = ["fecha", "centro", "centro", "monto", "monto"]
+    estilos_debe = ["borde", "centro", "cuenta_debe", "monto", "monto"]
+    estilos_haber = ["borde", "centro", "cuenta_haber", "monto", "monto"]
+    estilos_comentario = ["borde", "borde", "comentario", "borde", "borde"]
+
+    asiento, cuenta = datos.asiento.tolist(), datos.cuenta.tolist()
+    debe, haber = datos.debe.tolist(), datos.haber.tolist()
+    for numero, (inicio, fin) in enumerate(_limites(datos.asiento), start=1):
+        fecha, comentario = datos.asientos[asiento[inicio]]
+        ws.append(celdas.fila([fecha, None, f"-------({numero})-------", None, None], estilos_separador))
+        for i in range(inicio, fin):
+            codigo, _, descripcion, _ = datos.cuentas[cuenta[i]]
+            ws.append(celdas.fila(
+                [None, codigo, descripcion, a_unidades(debe[i]), a_unidades(haber[i])],
+                estilos_debe if debe[i] > 0 else estilos_haber,
+            ))
         if comentario and comentario.strip() != "":
-            cell_coment = ws.cell(row=fila, column=3, value=comentario)
-            cell_coment.font = Font(italic=True)
-            cell_coment.alignment = Alignment(horizontal="center", vertical="center")
-            for col in range(1, 6):
-                ws.cell(row=fila, column=col).border = thin_border
-            fila += 1
-
-    _apply_column_formats(ws)
-
-    # --- Hoja Libro Mayor (formato Cuentas T) ---
-    conn = sqlite3.connect(bd_path)
-    df_mayor = pd.read_sql_query(
-        """
-        SELECT
-            a.id_asiento AS AsientoID,
-            cc.id_cuenta_contable AS CuentaID,
-            cc.codigo_cuenta AS Código,
-            cc.nombre_cuenta AS NombreCuenta,
-            la.debe AS Debe,
-            la.haber AS Haber
-        FROM linea_asiento la
-        INNER JOIN asiento a ON la.id_asiento=a.id_asiento
-        INNER JOIN cuenta_contable cc ON la.id_cuenta_contable = cc.id_cuenta_contable
-        WHERE a.id_libro_diario = ?
-        ORDER BY cc.codigo_cuenta, a.id_asiento, la.id_linea_asiento
-        """,
-        conn,
-        params=(libro_id,),
-    )
-    conn.close()
-
-    ws_mayor = wb.create_sheet("Libro Mayor")
-
-    # Título de hoja
-    ws_mayor.merge_cells("A1:E1")
-    cell_title = ws_mayor["A1"]
-    cell_title.value = f"Libro Mayor (Cuentas T): Empresa({nombre_empresa}) (Contador: {contador})"
-    cell_title.font = Font(bold=True, size=16)
-    cell_title.alignment = Alignment(horizontal="center", vertical="center")
-    cell_title.fill = PatternFill("solid", fgColor="0C46E6")
-    cell_title.border = thin_border
-
-    fila = 3
-    for _, grupo in df_mayor.groupby("CuentaID", sort=False):
-        codigo = grupo.iloc[0]["Código"]
-        nombre = grupo.iloc[0]["NombreCuenta"]
-
-        # Encabezado de cuenta
-        ws_mayor.merge_cells(start_row=fila, start_column=1, end_row=fila, end_column=5)
-        cell_account = ws_mayor.cell(row=fila, column=1, value=f"{codigo} - {nombre}")
-        cell_account.font = Font(bold=True, size=13)
-        cell_account.alignment = Alignment(horizontal="center", vertical="center")
-        cell_account.fill = PatternFill("solid", fgColor="2F9EE7")
-        for col in range(1, 6):
-            ws_mayor.cell(row=fila, column=col).border = thin_border
-        fila += 1
-
-        # Encabezado Debe / Haber
-        ws_mayor.merge_cells(start_row=fila, start_column=1, end_row=fila, end_column=2)
-        ws_mayor.merge_cells(start_row=fila, start_column=4, end_row=fila, end_column=5)
-        cell_debe_header = ws_mayor.cell(row=fila, column=1, value="Debe")
-        cell_haber_header = ws_mayor.cell(row=fila, column=4, value="Haber")
-        for cell in (cell_debe_header, cell_haber_header):
-            cell.font = Font(bold=True)
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.fill = PatternFill("solid", fgColor="B7D8FF")
-        for col in range(1, 6):
-            ws_mayor.cell(row=fila, column=col).border = thin_border
-        fila += 1
-
-        debe_rows = [(int(r["AsientoID"]), float(r["Debe"] or 0)) for _, r in grupo.iterrows() if (r["Debe"] or 0) > 0]
-        haber_rows = [(int(r["AsientoID"]), float(r["Haber"] or 0)) for _, r in grupo.iterrows() if (r["Haber"] or 0) > 0]
+            ws.append(celdas.fila([None, None, comentario, None, None], estilos_comentario))
+        if fin // PASO_PROGRESO != inicio // PASO_PROGRESO:
+            avance("Libro Diario", fin)
+
+
+def _hoja_mayor(wb: Workbook, titulo: str, datos: _DatosLibro, avance: _Avance) -> None:
+    """Libro Mayor en formato Cuentas T: Debe a la izquierda, Haber a la derecha."""
+    avance("Libro Mayor")
+    ws = wb.create_sheet("Libro Mayor")
+    celdas = _Celdas(ws)
+    _anchos(ws, {"A": 12, "B": 18, "C": 4, "D": 12, "E": 18})
+    ws.merged_cells.add("A1:E1")
+    ws.append(celdas.fila([titulo], ["titulo"]))
+    ws.append([])
+
+    estilos_movimiento = ["centro", "monto", "borde", "centro", "monto"]
+    estilos_total = ["total", "total_monto", "borde", "total", "total_monto"]
+    fila_actual = 3
+
+    orden = _orden_mayor(datos)
+    asiento, cuenta = datos.asiento[orden], datos.cuenta[orden]
+    debe, haber = datos.debe[orden], datos.haber[orden]
+    for inicio, fin in _limites(cuenta):
+        codigo, nombre, _, _ = datos.cuentas[int(cuenta[inicio])]
+        # Montos en centavos; se convierten a unidades solo al escribir la celda
+        a, d, h = asiento[inicio:fin], debe[inicio:fin], haber[inicio:fin]
+        en_debe, en_haber = d > 0, h > 0
+        debe_rows = list(zip(a[en_debe].tolist(), d[en_debe].tolist()))
+        haber_rows = list(zip(a[en_haber].tolist(), h[en_haber].tolist()))
+
+        # Encabezado de cuenta y de columnas Debe / Haber
+        ws.merged_cells.add(f"A{fila_actual}:E{fila_actual}")
+        ws.merged_cells.add(f"A{fila_actual + 1}:B{fila_actual + 1}")
+        ws.merged_cells.add(f"D{fila_actual + 1}:E{fila_actual + 1}")
+        ws.append(celdas.fila([f"{codigo} - {nombre}", None, None, None, None], ["cuenta_mayor"] * 5))
+        ws.append(celdas.fila(["Debe", None, None, "Haber", None], ["columna_mayor", "columna_mayor", "borde", "columna_mayor", "columna_mayor"]))
 
         max_len = max(len(debe_rows), len(haber_rows), 1)
-        total_debe = 0.0
-        total_haber = 0.0
         for i in range(max_len):
-            if i < len(debe_rows):
-                asiento_id, monto = debe_rows[i]
-                ws_mayor.cell(row=fila, column=1, value=asiento_id)
-                ws_mayor.cell(row=fila, column=2, value=monto)
-                ws_mayor.cell(row=fila, column=1).alignment = Alignment(horizontal="center", vertical="center")
-                ws_mayor.cell(row=fila, column=2).alignment = Alignment(horizontal="center", vertical="center")
-                total_debe += monto
-            if i < len(haber_rows):
-                asiento_id, monto = haber_rows[i]
-                ws_mayor.cell(row=fila, column=4, value=asiento_id)
-                ws_mayor.cell(row=fila, column=5, value=monto)
-                ws_mayor.cell(row=fila, column=4).alignment = Alignment(horizontal="center", vertical="center")
-                ws_mayor.cell(row=fila, column=5).alignment = Alignment(horizontal="center", vertical="center")
-                total_haber += monto
-            for col in range(1, 6):
-                ws_mayor.cell(row=fila, column=col).border = thin_border
-            fila += 1
-
-        # Totales
-        ws_mayor.cell(row=fila, column=1, value="Total")
-        ws_mayor.cell(row=fila, column=2, value=total_debe)
-        ws_mayor.cell(row=fila, column=4, value="Total")
-        ws_mayor.cell(row=fila, column=5, value=total_haber)
-        for col in (1, 2, 4, 5):
-            ws_mayor.cell(row=fila, column=col).font = Font(bold=True)
-            ws_mayor.cell(row=fila, column=col).alignment = Alignment(horizontal="center", vertical="center")
-        for col in range(1, 6):
-            ws_mayor.cell(row=fila, column=col).border = thin_border
-        fila += 2
-
-    ws_mayor.column_dimensions["A"].width = 12
-    ws_mayor.column_dimensions["B"].width = 18
-    ws_mayor.column_dimensions["C"].width = 4
-    ws_mayor.column_dimensions["D"].width = 12
-    ws_mayor.column_dimensions["E"].width = 18
-
-    for col in ["B", "E"]:
-        for cell in ws_mayor[col]:
-            if cell.row != 1 and cell.value not in (None, ""):
-                cell.number_format = "#,##0.00"
-
-    # --- Hoja Plan de Cuentas ---
+            debe_id, debe_monto = debe_rows[i] if i < len(debe_rows) else (None, None)
+            haber_id, haber_monto = haber_rows[i] if i < len(haber_rows) else (None, None)
+            ws.append(celdas.fila(
+                [debe_id, a_unidades(debe_monto) if debe_monto else None, None, haber_id, a_unidades(haber_monto) if haber_monto else None],
+                estilos_movimiento,
+            ))
+
+        total_debe = int(d[en_debe].sum())
+        total_haber = int(h[en_haber].sum())
+        ws.append(celdas.fila(["Total", a_unidades(total_debe), None, "Total", a_unidades(total_haber)], estilos_total))
+        ws.append([])
+        fila_actual += max_len + 4
+        if fin // PASO_PROGRESO != inicio // PASO_PROGRESO:
+            avance("Libro Mayor", fin)
+
+
+def _hoja_plan(wb: Workbook, filas: Iterable[tuple], avance: _Avance) -> None:
+    avance("Plan de Cuentas", 0, 1)
+    ws = wb.create_sheet("Plan de Cuentas")
+    celdas = _Celdas(ws)
+    _anchos(ws, {"A": 14, "B": 28, "C": 14, "D": 28, "E": 16, "F": 28, "G": 16, "H": 32, "I": 40})
+    ws.append(celdas.fila(ENCABEZADOS_PLAN, ["columna_mayor"] * len(ENCABEZADOS_PLAN)))
+    estilos = ["borde"] * len(ENCABEZADOS_PLAN)
+    for fila in filas:
+        ws.append(celdas.fila(fila, estilos))
+
+
+def _escribir_libro(
+    conn,
+    libro_id: int,
+    output_path: Path,
+    progreso: Progreso | None = None,
+    cancelar: Event | None = None,
+) -> tuple[int, int]:
+    """Escribe el Excel del libro con la conexión dada. Devuelve (asientos, líneas).
+
+    Lanza ValueError si el libro no existe o no tiene líneas, y
+    ExportacionCancelada si `cancelar` se activa a mitad de camino. El archivo
+    se guarda primero como .part y se renombra al final: nunca queda a medias.
+    """
+    libro = conn.execute(
+        "SELECT nombre_empresa, contador, COALESCE(id_plan_cuenta, 0) FROM libro_diario WHERE id_libro_diario = ?",
+        (libro_id,),
+    ).fetchone()
+    datos = _cargar_datos(conn, libro_id) if libro else None
+    if datos is None:
+        raise ValueError("No se encontraron registros para exportar.")
+    nombre_empresa, contador, plan_id = libro
+    avance = _Avance(len(datos.asiento), progreso, cancelar)
+
+    wb = Workbook(write_only=True)
+    _registrar_estilos(wb)
+
+    try:
+        _hoja_diario(wb, f"Libro Diario: Empresa({nombre_empresa}) (Contador: {contador})", datos, avance)
+        _hoja_mayor(wb, f"Libro Mayor (Cuentas T): Empresa({nombre_empresa}) (Contador: {contador})", datos, avance)
+        _hoja_plan(wb, conn.execute(SQL_PLAN, (int(plan_id),)), avance)
+        avance("Guardando")
+    except Exception:
+        # Cerrar las hojas a medio escribir; openpyxl borra sus temporales al salir
+        for ws in wb.worksheets:
+            if not ws.closed:
+                ws.close()
+        raise
+    temporal = output_path.with_name(output_path.name + ".part")
+    try:
+        wb.save(temporal)
+        os.replace(temporal, output_path)
+    finally:
+        temporal.unlink(missing_ok=True)
+    avance.terminado()
+    return len(_limites(datos.asiento)), len(datos.asiento)
+
+
+def _clave_cache(conn, libro_id: int) -> tuple[str, int, str] | None:
+    """(identificador de la BD, versión del libro, huella de formato) para la caché.
+
+    La huella incluye lo que sale en el archivo sin pasar por la versión: el
+    plan de cuentas del libro y el código, nombre y descripción de las cuentas
+    que usan sus líneas, sean o no de ese plan. None si la BD todavía no tiene
+    identificador o columna `version` (esquema anterior a las migraciones 8 y 9).
+    """
+    id_bd = obtener_identidad(conn)
+    if id_bd is None:
+        return None
     try:
-        conn = sqlite3.connect(bd_path)
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT COALESCE(id_plan_cuenta, 0) FROM libro_diario WHERE id_libro_diario = ?",
+        row = conn.execute(
+            "SELECT version, COALESCE(id_plan_cuenta, 0) FROM libro_diario WHERE id_libro_diario = ?",
             (libro_id,),
-        )
-        plan_id_row = cur.fetchone()
-        plan_id = int(plan_id_row[0]) if plan_id_row else 0
-
-        df_plan = pd.read_sql_query(
-            """
-            SELECT
-                t.numero_cuenta AS TipoCodigo,
-                t.nombre_tipo_cuenta AS TipoNombre,
-                r.numero_cuenta AS RubroCodigo,
-                r.nombre_rubro AS RubroNombre,
-                g.numero_cuenta AS GenericoCodigo,
-                g.nombre_generico AS GenericoNombre,
-                c.codigo_cuenta AS CuentaCodigo,
-                c.nombre_cuenta AS CuentaNombre,
-                c.descripcion AS CuentaDescripcion
-            FROM tipo_cuenta t
-            LEFT JOIN rubro r ON r.id_tipo_cuenta = t.id_tipo_cuenta
-            LEFT JOIN generico g ON g.id_rubro = r.id_rubro
-            LEFT JOIN cuenta_contable c ON c.id_generico = g.id_generico
-            WHERE t.id_plan_cuenta = ?
-            ORDER BY t.numero_cuenta, r.numero_cuenta, g.numero_cuenta, c.codigo_cuenta
-            """,
-            conn,
-            params=(plan_id,),
-        )
+        ).fetchone()
+        if row is None:
+            return None
+        plan = conn.execute(SQL_PLAN, (int(row[1]),)).fetchall()
+        cuentas = conn.execute(SQL_CUENTAS_LIBRO, (libro_id,)).fetchall()
+    except sqlite3.OperationalError:
+        return None
+    return id_bd, int(row[0]), cacheExportacion.huella("xlsx", VERSION_FORMATO, plan, cuentas)
+
+
+def _exportar(
+    conn,
+    db_path: str,
+    libro_id: int,
+    output_path: Path,
+    progreso: Progreso | None = None,
+    cancelar: Event | None = None,
+    usar_cache: bool = True,
+) -> tuple[int, int, bool]:
+    """Exporta el libro a `output_path`, desde la caché si el libro no cambió.
+
+    Devuelve (asientos, líneas, desde_cache).
+    """
+    # Una sola transacción de lectura: la versión y los datos son del mismo momento
+    conn.execute("BEGIN")
+    try:
+        clave = _clave_cache(conn, libro_id) if usar_cache else None
+        if clave:
+            id_bd, version, huella = clave
+        en_cache = cacheExportacion.buscar(db_path, id_bd, libro_id, version, huella) if clave else None
+        if en_cache is not None:
+            cacheExportacion.copiar_a(en_cache, output_path)
+            if progreso is not None:
+                progreso("Guardando", 1, 1, 1.0)
+            asientos, lineas = conn.execute(SQL_CONTEO, (libro_id,)).fetchone()
+            return int(asientos), int(lineas), True
+        asientos, lineas = _escribir_libro(conn, libro_id, output_path, progreso, cancelar)
+        if clave:
+            cacheExportacion.guardar(db_path, id_bd, libro_id, version, huella, output_path)
+        return asientos, lineas, False
     finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
-
-    ws_plan = wb.create_sheet("Plan de Cuentas")
-    # Header
-    headers_plan = [
-        "TipoCodigo",
-        "TipoNombre",
-        "RubroCodigo",
-        "RubroNombre",
-        "GenericoCodigo",
-        "GenericoNombre",
-        "CuentaCodigo",
-        "CuentaNombre",
-        "CuentaDescripcion",
-    ]
-    for col_idx, h in enumerate(headers_plan, start=1):
-        cell = ws_plan.cell(row=1, column=col_idx, value=h)
-        cell.font = Font(bold=True)
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.fill = PatternFill("solid", fgColor="B7D8FF")
-        cell.border = thin_border
-
-    # Data
-    if not df_plan.empty:
-        for r_idx, row in enumerate(df_plan.itertuples(index=False), start=2):
-            for c_idx, value in enumerate(row, start=1):
-                cell = ws_plan.cell(row=r_idx, column=c_idx, value=value)
-                cell.border = thin_border
-
-    # Column widths
-    ws_plan.column_dimensions["A"].width = 14
-    ws_plan.column_dimensions["B"].width = 28
-    ws_plan.column_dimensions["C"].width = 14
-    ws_plan.column_dimensions["D"].width = 28
-    ws_plan.column_dimensions["E"].width = 16
-    ws_plan.column_dimensions["F"].width = 28
-    ws_plan.column_dimensions["G"].width = 16
-    ws_plan.column_dimensions["H"].width = 32
-    ws_plan.column_dimensions["I"].width = 40
+        conn.rollback()
+
+
+def exportar_libro_diario(
+    libro_id: int,
+    output_file: str | Path | None = None,
+    db_path: str | None = None,
+    progreso: Progreso | None = None,
+    cancelar: Event | None = None,
+    usar_cache: bool = True,
+) -> Path:
+    """Genera un Excel del libro diario indicado por id.
+
+    Devuelve la ruta del archivo generado. Si no hay datos, lanza ValueError.
+    Sin `db_path` usa la BD del contexto de la aplicación.
+
+    Las líneas se leen una sola vez en columnas (ver _DatosLibro) y de ellas
+    salen el Diario y el Mayor. El libro se escribe en modo write_only: las
+    filas se vuelcan a disco a medida que se producen, con estilos con nombre
+    creados una sola vez. Si el libro no cambió desde la última exportación
+    (misma versión y formato), el archivo se copia desde la caché.
 
+    Se puede llamar desde un hilo de fondo: usa su propia conexión de solo
+    lectura, informa el avance con `progreso(etapa, hechas, total, fraccion)`
+    y se detiene con ExportacionCancelada si se activa `cancelar`.
+    """
+    bd_path = db_path or obtener_contexto().db_path
     output_path = Path(output_file) if output_file else Path(f"Libro_Diario_{libro_id}.xlsx")
-    wb.save(output_path)
+    conn = abrir_solo_lectura(bd_path)
+    try:
+        _exportar(conn, bd_path, libro_id, output_path, progreso, cancelar, usar_cache)
+    finally:
+        conn.close()
     return output_path
 
 
-if __name__ == "__main__":
+def _nombre_archivo(id_libro: int, empresa: str | None, ano, mes) -> str:
+    nombre = re.sub(r"[^\w\-]+", "_", str(empresa or "")).strip("_") or "libro"
+    return f"Libro_Diario_{id_libro}_{nombre}_{ano}-{int(mes or 0):02d}.xlsx"
+
+
+def _exportar_en_proceso(db_path: str, libro: tuple, carpeta: str, usar_cache: bool = True) -> dict:
+    """Trabajo de un proceso del lote: exporta un libro con su propia conexión de solo lectura."""
+    id_libro, empresa, ano, mes = libro
+    resultado = {
+        "id_libro_diario": id_libro,
+        "empresa": empresa,
+        "ano": ano,
+        "mes": mes,
+        "archivo": None,
+        "estado": "ok",
+        "asientos": 0,
+        "lineas": 0,
+        "desde_cache": False,
+        "segundos": 0.0,
+        "error": None,
+    }
+    inicio = time.perf_counter()
+    conn = abrir_solo_lectura(db_path)
     try:
-        libro = int(sys.argv[1]) if len(sys.argv) > 1 else 1
-        output = exportar_libro_diario(libro)
+        destino = Path(carpeta) / _nombre_archivo(id_libro, empresa, ano, mes)
+        resultado["asientos"], resultado["lineas"], resultado["desde_cache"] = _exportar(
+            conn, db_path, id_libro, destino, usar_cache=usar_cache
+        )
+        resultado["archivo"] = destino.name
+    except ValueError:
+        resultado["estado"] = "vacío"
+    except Exception as exc:
+        resultado["estado"] = "error"
+        resultado["error"] = str(exc)
+    finally:
+        conn.close()
+    resultado["segundos"] = round(time.perf_counter() - inicio, 3)
+    return resultado
+
+
+def exportar_lote(
+    db_path: str,
+    carpeta: str | Path,
+    ano: int | None = None,
+    procesos: int | None = None,
+    usar_cache: bool = True,
+) -> Path:
+    """Exporta todos los libros (o los de un año) en paralelo, un libro por proceso.
+
+    Cada proceso abre su propia conexión de solo lectura; los libros que no
+    cambiaron desde su última exportación se copian desde la caché. Al terminar
+    escribe `manifest.json` en `carpeta` con el resultado, las filas y el tiempo
+    de cada libro, y devuelve su ruta.
+    """
+    carpeta = Path(carpeta)
+    carpeta.mkdir(parents=True, exist_ok=True)
+    conn = abrir_solo_lectura(db_path)
+    try:
+        libros = conn.execute(SQL_LIBROS, (ano, ano)).fetchall()
+    finally:
+        conn.close()
+
+    procesos = max(1, min(procesos or os.cpu_count() or 1, len(libros) or 1))
+    inicio = time.perf_counter()
+    resultados = []
+    if libros:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            futuros = [pool.submit(_exportar_en_proceso, db_path, libro, str(carpeta), usar_cache) for libro in libros]
+            for futuro in as_completed(futuros):
+                r = futuro.result()
+                resultados.append(r)
+                print(f"[{len(resultados)}/{len(libros)}] Libro {r['id_libro_diario']}: {r['estado']} "
+                      f"({r['lineas']} líneas, {r['segundos']:.2f} s{', caché' if r['desde_cache'] else ''})")
+    resultados.sort(key=lambda r: r["id_libro_diario"])
+
+    manifiesto = {
+        "generado": datetime.now().isoformat(timespec="seconds"),
+        "base_de_datos": str(db_path),
+        "ano": ano,
+        "procesos": procesos,
+        "segundos": round(time.perf_counter() - inicio, 3),
+        "exportados": sum(1 for r in resultados if r["estado"] == "ok"),
+        "vacios": sum(1 for r in resultados if r["estado"] == "vacío"),
+        "errores": sum(1 for r in resultados if r["estado"] == "error"),
+        "desde_cache": sum(1 for r in resultados if r["desde_cache"]),
+        "lineas": sum(r["lineas"] for r in resultados),
+        "libros": resultados,
+    }
+    ruta = carpeta / "manifest.json"
+    ruta.write_text(json.dumps(manifiesto, ensure_ascii=False, indent=2), encoding="utf-8")
+    return ruta
+
+
+def _main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.services.exportarLibro",
+        description="Exporta libros diarios a Excel: uno por id, o todos en paralelo con --all.",
+    )
+    parser.add_argument("libro", nargs="?", type=int, default=1, help="id del libro a exportar (por defecto 1)")
+    parser.add_argument("--all", dest="todos", action="store_true", help="exportar todos los libros en paralelo")
+    parser.add_argument("--year", type=int, help="con --all, solo los libros de ese año")
+    parser.add_argument("--out", default=".", help="carpeta de salida (por defecto la actual)")
+    parser.add_argument("--db", help="ruta de la base de datos (por defecto la de la aplicación)")
+    parser.add_argument("--workers", type=int, help="procesos en paralelo (por defecto uno por núcleo)")
+    parser.add_argument("--no-cache", dest="usar_cache", action="store_false", help="regenerar aunque el libro no haya cambiado")
+    args = parser.parse_args(argv)
+    db_path = args.db or obtener_contexto().db_path
+
+    if args.todos:
+        ruta = exportar_lote(db_path, args.out, ano=args.year, procesos=args.workers, usar_cache=args.usar_cache)
+        manifiesto = json.loads(ruta.read_text(encoding="utf-8"))
+        print(f"{manifiesto['exportados']} libros exportados, {manifiesto['vacios']} vacíos, "
+              f"{manifiesto['errores']} con error en {manifiesto['segundos']:.1f} s. Manifiesto: {ruta}")
+        return 1 if manifiesto["errores"] else 0
+
+    try:
+        output = exportar_libro_diario(
+            args.libro, Path(args.out) / f"Libro_Diario_{args.libro}.xlsx", db_path=db_path, usar_cache=args.usar_cache
+        )
         print("Archivo Excel creado y formateado correctamente:", output)
     except ValueError as exc:
-        print(exc)
\ No newline at end of file
+        print(exc)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
@@ -0,0 +1,73 @@
+import flet as ft
+from typing import Callable, Optional
+
+from data.buscarAsientos import buscarAsientos
+from src.utils.contexto import obtener_contexto
+
+
+def create_busqueda_asientos(
+    page: ft.Page,
+    on_select: Callable[[dict], None],
+    id_libro_diario: Optional[int] = None,
+    width: int = 320,
+    hint_text: str = "Buscar asientos…",
+) -> ft.TextField:
+    """Campo de búsqueda de texto completo de asientos (un libro o todos).
+
+    Al presionar Enter muestra los resultados por relevancia; al elegir uno
+    se cierra el diálogo y se llama a `on_select` con el asiento encontrado.
+    """
+    resultados = ft.ListView(spacing=2, padding=4, height=380)
+
+    dialog = ft.AlertDialog(
+        title=ft.Text("Resultados de la búsqueda"),
+        content=ft.Container(width=560, content=resultados),
+        actions=[ft.TextButton("Cerrar", on_click=lambda e: cerrar())],
+        actions_alignment=ft.MainAxisAlignment.END,
+        bgcolor=ft.Colors.WHITE,
+    )
+
+    def cerrar():
+        dialog.open = False
+        page.update()
+
+    def elegir(asiento: dict):
+        cerrar()
+        on_select(asiento)
+
+    def fila(asiento: dict) -> ft.Control:
+        titulo = f"N° {asiento['numero_asiento']} · {asiento['fecha']}"
+        if id_libro_diario is None:
+            # Entre libros se indica a cuál pertenece cada asiento
+            titulo += f" · {asiento['nombre_empresa']} {asiento['ano']}-{str(asiento['id_mes'] or '').zfill(2)}"
+        return ft.ListTile(
+            leading=ft.Icon(ft.Icons.RECEIPT_LONG, color=ft.Colors.BLUE_700),
+            title=ft.Text(titulo, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_900),
+            subtitle=ft.Text(asiento["descripcion"], color=ft.Colors.GREY_800, max_lines=2),
+            on_click=lambda e, a=asiento: elegir(a),
+        )
+
+    def buscar(e=None):
+        texto = (campo.value or "").strip()
+        if not texto:
+            return
+        encontrados = buscarAsientos(obtener_contexto().db_path, texto, id_libro_diario=id_libro_diario)
+        if encontrados:
+            resultados.controls = [fila(a) for a in encontrados]
+        else:
+            resultados.controls = [ft.Container(padding=16, content=ft.Text(f"Sin resultados para «{texto}».", color=ft.Colors.GREY_600))]
+        if dialog not in page.overlay:
+            page.overlay.append(dialog)
+        dialog.open = True
+        page.update()
+
+    campo = ft.TextField(
+        hint_text=hint_text,
+        width=width,
+        dense=True,
+        prefix_icon=ft.Icons.SEARCH,
+        bgcolor=ft.Colors.WHITE,
+        border_radius=8,
+        on_submit=buscar,
+    )
+    return campo
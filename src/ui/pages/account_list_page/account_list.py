@@ -1,13 +1,9 @@
-import re
 import flet as ft
 from data.models.cuenta import CuentaContable, Generico, Rubro, TipoCuenta
+from data.catalogoCache import obtenerJerarquia
 from data.obtenerCuentas import (
     obtenerCuentasContablesPorPlanCuenta,
     obtenerTodasCuentasContables,
-    obtenerTodosGenericoPorRubro,
-    obtenerTodosRubroPorTipoCuenta,
-    obtenerTodasTipoCuentas,
-    obtenerTipoCuentasPorPlanCuenta,
 )
 from src.ui.pages.account_list_page.account_card import create_item_account
 from src.ui.pages.account_list_page.catalog_cards import (
@@ -15,6 +11,7 @@ from src.ui.pages.account_list_page.catalog_cards import (
     create_item_rubro,
     create_item_tipo,
 )
+from src.utils.texto import normalizar
 
 #gutyk
 class AccountListView:
@@ -32,6 +29,10 @@ class AccountListView:
         self._tipos_summary: list[dict] = []
         self._rubros_summary: list[dict] = []
         self._genericos_summary: list[dict] = []
+        # Índice de búsqueda: (texto normalizado, tipo normalizado, cuenta) en orden de código
+        self._indice: list[tuple[str, str, CuentaContable]] = []
+        # Último filtrado de cuentas (texto, tipo, entradas) para refinarlo al seguir escribiendo
+        self._resultado: tuple[str, str, list] | None = None
         self.view_mode = "cuentas"  # cuentas|tipos|rubros|genericos
         self.tipo_filter: str = ""
         self.last_filter_text: str = ""
@@ -39,7 +40,7 @@ class AccountListView:
         self.visible_count: int = self.page_size
         self._load_catalog_data()
         self._rebuild_summaries()
-        self._sort_cuentas_inplace()
+        self._build_search_index()
         self.account_list = ft.ListView(
             expand=True,
             #spacing=5,
@@ -62,6 +63,7 @@ class AccountListView:
             if plan_name:
                 self.cuentas = [c for c in self.cuentas if c.nombre_plan_cuenta == plan_name]
             self._rebuild_summaries()
+            self._build_search_index()
             self.visible_count = self.page_size
             self._update_list()
         except Exception:
@@ -71,22 +73,11 @@ class AccountListView:
     def _load_catalog_data(self):
         """Carga catálogo completo para mostrar elementos sin cuentas (estilo left join)."""
         try:
-            if self.plan_id is None:
-                tipos = obtenerTodasTipoCuentas(self.db_path)
-            else:
-                tipos = obtenerTipoCuentasPorPlanCuenta(self.db_path, int(self.plan_id))
-            self.tipos_map = {t.id_tipo_cuenta: t for t in tipos}
-            self.rubros_map = {}
-            self.genericos_map = {}
-            for t in tipos:
-                rubros = obtenerTodosRubroPorTipoCuenta(self.db_path, t.id_tipo_cuenta)
-                for r in rubros:
-                    r.tipo_cuenta = t
-                    self.rubros_map[r.id_rubro] = r
-                    genericos = obtenerTodosGenericoPorRubro(self.db_path, r.id_rubro)
-                    for g in genericos:
-                        g.rubro = r
-                        self.genericos_map[g.id_generico] = g
+            plan = None if self.plan_id is None else int(self.plan_id)
+            jerarquia = obtenerJerarquia(self.db_path, plan)
+            self.tipos_map = {t.id_tipo_cuenta: t for t in jerarquia.tipos}
+            self.rubros_map = dict(jerarquia.rubros)
+            self.genericos_map = dict(jerarquia.genericos)
         except Exception as ex:
             print(f"Error cargando catálogo para listas: {ex}")
 
@@ -164,18 +155,25 @@ class AccountListView:
                 )
                 entry["cuentas"] += 1
 
-        def numeric_key(val: str):
-            nums = re.findall(r"\d+", val or "")
-            if nums:
-                try:
-                    return tuple(int(n) for n in nums)
-                except Exception:
-                    return (val or "",)
-            return (val or "",)
+        # Claves de búsqueda normalizadas una sola vez por resumen
+        for entry in tipo_entries.values():
+            t = entry["tipo"]
+            entry["clave"] = normalizar(f"{t.numero_cuenta} - {t.nombre_tipo_cuenta}")
+            entry["tipo_clave"] = normalizar((t.nombre_tipo_cuenta or "").strip())
+        for entry in rubro_entries.values():
+            r = entry["rubro"]
+            entry["clave"] = normalizar(f"{r.numero_cuenta} - {r.nombre_rubro}")
+            entry["tipo_clave"] = normalizar((getattr(getattr(r, "tipo_cuenta", None), "nombre_tipo_cuenta", "") or "").strip())
+        for entry in generico_entries.values():
+            g = entry["generico"]
+            entry["clave"] = normalizar(f"{g.numero_cuenta} - {g.nombre_generico}")
+            tipo = getattr(getattr(getattr(g, "rubro", None), "tipo_cuenta", None), "nombre_tipo_cuenta", "")
+            entry["tipo_clave"] = normalizar((tipo or "").strip())
 
-        self._tipos_summary = sorted(tipo_entries.values(), key=lambda x: numeric_key(getattr(x["tipo"], "numero_cuenta", "")))
-        self._rubros_summary = sorted(rubro_entries.values(), key=lambda x: numeric_key(getattr(x["rubro"], "numero_cuenta", "")))
-        self._genericos_summary = sorted(generico_entries.values(), key=lambda x: numeric_key(getattr(x["generico"], "numero_cuenta", "")))
+        # Los mapas vienen de obtenerJerarquia ya en orden de código (columna `orden`)
+        self._tipos_summary = list(tipo_entries.values())
+        self._rubros_summary = list(rubro_entries.values())
+        self._genericos_summary = list(generico_entries.values())
     
     def _update_list(self):
         """Actualiza la lista con todas las cuentas"""
@@ -188,7 +186,7 @@ class AccountListView:
     
     def filter_accounts(self, filter_text: str = "", force: bool = False, reset_pagination: bool = True):
         """Filtra según el modo de vista actual con caché de texto para evitar renders innecesarios."""
-        filter_text = (filter_text or "").lower()
+        filter_text = normalizar(filter_text)
         if not force and filter_text == self.last_filter_text and reset_pagination:
             return
         self.last_filter_text = filter_text
@@ -200,7 +198,7 @@ class AccountListView:
 
     def set_tipo_filter(self, tipo_nombre: str | None):
         """Aplica filtro estricto por nombre de tipo de cuenta."""
-        self.tipo_filter = (tipo_nombre or "").strip().lower()
+        self.tipo_filter = normalizar((tipo_nombre or "").strip())
         self.visible_count = self.page_size
         self.filter_accounts(self.last_filter_text, force=True)
 
@@ -211,6 +209,7 @@ class AccountListView:
             if cuenta.nombre_plan_cuenta == plan_cuenta
         ]
         self._rebuild_summaries()
+        self._build_search_index()
         self.visible_count = self.page_size
         self.last_filter_text = ""
         self._update_list()
@@ -227,7 +226,7 @@ class AccountListView:
                 self.cuentas = obtenerCuentasContablesPorPlanCuenta(self.db_path, id_plan)
             self._load_catalog_data()
             self._rebuild_summaries()
-            self._sort_cuentas_inplace()
+            self._build_search_index()
             self.visible_count = self.page_size
             self._update_list()
             self._safe_update()
@@ -243,7 +242,7 @@ class AccountListView:
                 self.cuentas = obtenerCuentasContablesPorPlanCuenta(self.db_path, int(self.plan_id))
             self._load_catalog_data()
             self._rebuild_summaries()
-            self._sort_cuentas_inplace()
+            self._build_search_index()
             self.visible_count = self.page_size
             # Reaplicar el filtro activo si existe
             if self.last_filter_text:
@@ -255,23 +254,42 @@ class AccountListView:
         finally:
             self._safe_update()
 
-    def _sort_cuentas_inplace(self):
-        """Ordena las cuentas por código de forma numérica ascendente."""
-        def key(cuenta: CuentaContable):
-            code = cuenta.codigo_cuenta or ""
-            nums = re.findall(r"\d+", code)
-            if nums:
-                try:
-                    return tuple(int(n) for n in nums)
-                except Exception:
-                    pass
-            return (code,)
+    def _build_search_index(self):
+        """Arma el índice de búsqueda sobre las cuentas (ya ordenadas por la BD).
 
-        try:
-            self.cuentas = sorted(self.cuentas, key=key)
-        except Exception:
-            # Si falla la ordenación, mantener el orden actual
-            pass
+        Se llama una vez por carga del catálogo; al escribir en el buscador solo
+        se compara el texto ya normalizado, sin recorrer generico→rubro→tipo.
+        """
+        # \x00 separa los campos para que una búsqueda no coincida entre dos de ellos
+        self._indice = [
+            (
+                normalizar("\x00".join((
+                    c.codigo_cuenta or "",
+                    c.nombre_cuenta or "",
+                    c.nombre_tipo_cuenta or "",
+                    c.nombre_rubro or "",
+                    c.nombre_generico or "",
+                ))),
+                normalizar((c.nombre_tipo_cuenta or "").strip()),
+                c,
+            )
+            for c in self.cuentas
+        ]
+        self._resultado = None
+
+    def _filtrar_cuentas(self, ftxt: str, tipo_val: str) -> list[CuentaContable]:
+        """Cuentas que contienen `ftxt` y son del tipo `tipo_val` (ambos normalizados)."""
+        base = self._indice
+        previo = self._resultado
+        if previo is not None and previo[1] == tipo_val and previo[0] in ftxt:
+            # Si el texto nuevo contiene al anterior, el resultado solo puede achicarse
+            base = previo[2]
+        elif tipo_val:
+            base = [e for e in base if e[1] == tipo_val]
+        if ftxt:
+            base = [e for e in base if ftxt in e[0]]
+        self._resultado = (ftxt, tipo_val, base)
+        return [e[2] for e in base]
 
     def set_view_mode(self, mode: str):
         """Cambia el modo de vista (cuentas|tipos|rubros|genericos)."""
@@ -289,37 +307,15 @@ class AccountListView:
         self.filter_accounts(self.last_filter_text, force=True, reset_pagination=False)
 
     def _build_view_items(self, filter_text: str | None = None):
-        ftxt = (filter_text or "").lower()
+        ftxt = normalizar(filter_text)
         items = []
-        tipo_val = (self.tipo_filter or "").strip().lower()
+        tipo_val = self.tipo_filter or ""
 
-        def match_tipo(nombre_tipo: str) -> bool:
-            if not tipo_val:
-                return True
-            return (nombre_tipo or "").strip().lower() == tipo_val
-
-        def numeric_key(val: str):
-            nums = re.findall(r"\d+", val or "")
-            if nums:
-                try:
-                    return tuple(int(n) for n in nums)
-                except Exception:
-                    return (val or "",)
-            return (val or "",)
+        def match_tipo(data: dict) -> bool:
+            return not tipo_val or data["tipo_clave"] == tipo_val
 
         if self.view_mode == "cuentas":
-            data = self.cuentas
-            if tipo_val:
-                data = [c for c in data if match_tipo(c.nombre_tipo_cuenta)]
-            if ftxt:
-                data = [
-                    c for c in data
-                    if (ftxt in (c.codigo_cuenta or "").lower()
-                        or ftxt in (c.nombre_cuenta or "").lower()
-                        or ftxt in (c.nombre_tipo_cuenta or "").lower()
-                        or ftxt in (c.nombre_rubro or "").lower()
-                        or ftxt in (c.nombre_generico or "").lower())
-                ]
+            data = self._filtrar_cuentas(ftxt, tipo_val)
             slice_data = data[: self.visible_count]
             for idx, cuenta in enumerate(slice_data):
                 items.append(create_item_account(cuenta, self.page, refresh_callback=self.refresh, row_index=idx))
@@ -341,10 +337,9 @@ class AccountListView:
 
         if self.view_mode == "tipos":
             for idx, data in enumerate(self._tipos_summary):
-                label = f"{data['tipo'].numero_cuenta} - {data['tipo'].nombre_tipo_cuenta}"
-                if tipo_val and not match_tipo(data["tipo"].nombre_tipo_cuenta):
+                if not match_tipo(data):
                     continue
-                if ftxt and ftxt not in label.lower():
+                if ftxt and ftxt not in data["clave"]:
                     continue
                 items.append(
                     create_item_tipo(
@@ -361,11 +356,9 @@ class AccountListView:
 
         if self.view_mode == "rubros":
             for idx, data in enumerate(self._rubros_summary):
-                tipo_name = getattr(getattr(data["rubro"], "tipo_cuenta", None), "nombre_tipo_cuenta", "")
-                if tipo_val and not match_tipo(tipo_name):
+                if not match_tipo(data):
                     continue
-                label = f"{data['rubro'].numero_cuenta} - {data['rubro'].nombre_rubro}"
-                if ftxt and ftxt not in label.lower():
+                if ftxt and ftxt not in data["clave"]:
                     continue
                 items.append(
                     create_item_rubro(
@@ -381,15 +374,9 @@ class AccountListView:
 
         if self.view_mode == "genericos":
             for idx, data in enumerate(self._genericos_summary):
-                tipo_name = getattr(
-                    getattr(getattr(data["generico"], "rubro", None), "tipo_cuenta", None),
-                    "nombre_tipo_cuenta",
-                    "",
-                )
-                if tipo_val and not match_tipo(tipo_name):
+                if not match_tipo(data):
                     continue
-                label = f"{data['generico'].numero_cuenta} - {data['generico'].nombre_generico}"
-                if ftxt and ftxt not in label.lower():
+                if ftxt and ftxt not in data["clave"]:
                     continue
                 items.append(
                     create_item_generico(
@@ -7,7 +7,7 @@ from data.obternet_plan_cuentas import obtenerTodosPlanesCuentas
 from src.ui.components.backgrounds import create_modern_background
 from src.ui.pages.account_list_page.account_list import AccountListView
 from .create_account_dialog import create_account_dialog
-from src.utils.paths import get_db_path
+from src.utils.contexto import obtener_contexto
 from data.models.plan_cuenta import PlanCuenta
 from src.ui.pages.account_list_page.dialogs.create_catalog_dialog import (
     open_create_tipo_dialog,
@@ -123,7 +123,7 @@ def header_account_List_by_mode(view_mode: str):
 
 # --- CONTENIDO DE LA PÁGINA ---
 def contenido(page: ft.Page, back_action=None, plan_id: int | None = None):
-    db_path = get_db_path()
+    db_path = obtener_contexto().db_path
 
     # Dropdowns de Filtro
     vista_dropdown = ft.Dropdown(
@@ -3,16 +3,10 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import flet as ft
-import sqlite3
 import re
-from src.utils.paths import get_db_path
-from data.models.cuenta import Rubro, TipoCuenta, Generico
-from data.obtenerCuentas import (
-    obtenerTodasTipoCuentas,
-    obtenerTodosRubroPorTipoCuenta,
-    obtenerTodosGenericoPorRubro,
-    obtenerTipoCuentasPorPlanCuenta,
-)
+from src.utils.contexto import obtener_contexto
+from data.database.conexion import obtener_conexion
+from data.catalogoCache import JerarquiaCatalogo, invalidarCatalogo, obtenerJerarquia
 
 def resource_path(relative_path: str) -> str:
     """Resolve path for PyInstaller bundles and normal runs."""
@@ -32,21 +26,20 @@ def create_account_dialog(page: ft.Page, refresh_callback: callable = None, plan
     selected_generico = {"id": None, "nombre": None}
     
     # DEBUG: Verificar la ruta de la base de datos (writable)
-    db_path = get_db_path()
+    db_path = obtener_contexto().db_path
     print(f"🔴 DB Path: {db_path}")
     print(f"🔴 DB exists: {os.path.exists(db_path)}")
     
-    # Cargar tipos de cuenta desde BD
+    # Cargar el árbol tipo/rubro/genérico del plan (una consulta, compartida)
     try:
-        if plan_id is None:
-            tipocuentas = obtenerTodasTipoCuentas(db_path)
-        else:
-            tipocuentas = obtenerTipoCuentasPorPlanCuenta(db_path, int(plan_id))
+        jerarquia = obtenerJerarquia(db_path, None if plan_id is None else int(plan_id))
+        tipocuentas = jerarquia.tipos
         print(f"🔴 Tipos de cuenta cargados: {len(tipocuentas)}")
         for tc in tipocuentas:
             print(f"  - {tc.id_tipo_cuenta}: {tc.nombre_tipo_cuenta}")
     except Exception as ex:
         print(f"🔴 ERROR cargando tipos de cuenta: {ex}")
+        jerarquia = JerarquiaCatalogo(id_plan_cuenta=plan_id)
         tipocuentas = []
         page.snack_bar = ft.SnackBar(content=ft.Text(f"No se pudo cargar tipos de cuenta: {ex}"), bgcolor=ft.Colors.RED)
         page.snack_bar.open = True
@@ -153,7 +146,7 @@ def create_account_dialog(page: ft.Page, refresh_callback: callable = None, plan
         reset_rubro()
         try:
             print(f"🔴 Cargando rubros para tipo_cuenta_id: {data['id']}")
-            rubros = obtenerTodosRubroPorTipoCuenta(db_path, int(data["id"]))
+            rubros = jerarquia.rubros_de(int(data["id"]))
             print(f"🔴 Rubros cargados: {len(rubros)}")
             
             rubro_menu.items = [
@@ -183,7 +176,7 @@ def create_account_dialog(page: ft.Page, refresh_callback: callable = None, plan
         reset_generico()
         try:
             print(f"🔴 Cargando genéricos para rubro_id: {data['id']}")
-            genericos = obtenerTodosGenericoPorRubro(db_path, int(data["id"]))
+            genericos = jerarquia.genericos_de(int(data["id"]))
             print(f"🔴 Genéricos cargados: {len(genericos)}")
             
             generico_menu.items = [
@@ -216,19 +209,12 @@ def create_account_dialog(page: ft.Page, refresh_callback: callable = None, plan
         cuenta_field.disabled = False
         descripcion_field.disabled = False
         # Calcular código sugerido: usar numeración del catálogo (numero_cuenta)
-        try:
-            conn = sqlite3.connect(db_path)
-            cur = conn.cursor()
-            cur.execute(
-                "SELECT codigo_cuenta FROM cuenta_contable WHERE id_generico = ?",
-                (int(data["id"]),)
-            )
-            codigos = [row[0] for row in cur.fetchall() if row and row[0]]
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+        cur = obtener_conexion(db_path).cursor()
+        cur.execute(
+            "SELECT codigo_cuenta FROM cuenta_contable WHERE id_generico = ?",
+            (int(data["id"]),)
+        )
+        codigos = [row[0] for row in cur.fetchall() if row and row[0]]
 
         tipo_num = (selected_account_type.get("numero") or "").split(".")[0] or "0"
         rubro_parts = (selected_rubro.get("numero") or "").split(".")
@@ -275,9 +261,8 @@ def create_account_dialog(page: ft.Page, refresh_callback: callable = None, plan
 
             # Usar código sugerido calculado
             codigo = codigo_sugerido_val.get("value")
-            conn = sqlite3.connect(db_path, timeout=5)
-            conn.execute("PRAGMA busy_timeout=3000")
-            try:
+            conn = obtener_conexion(db_path)
+            with conn:
                 cur = conn.cursor()
                 if not codigo:
                     # Fallback mínimo si no hay sugerido
@@ -294,12 +279,7 @@ def create_account_dialog(page: ft.Page, refresh_callback: callable = None, plan
                     """,
                     (int(selected_generico["id"]), descripcion, nombre_cuenta, codigo)
                 )
-                conn.commit()
-            finally:
-                try:
-                    conn.close()
-                except Exception:
-                    pass
+            invalidarCatalogo(db_path)
 
             # Feedback y cierre
             page.snack_bar = ft.SnackBar(content=ft.Text(f"Cuenta agregada: {codigo}"), bgcolor=ft.Colors.GREEN)
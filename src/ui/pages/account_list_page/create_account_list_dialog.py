@@ -3,8 +3,8 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import flet as ft
-import sqlite3
-from src.utils.paths import get_db_path
+from src.utils.contexto import obtener_contexto
+from data.database.conexion import obtener_conexion
 from data.planCuentasOps import copiar_cuentas_de_plan
 
 def resource_path(relative_path: str) -> str:
@@ -20,7 +20,7 @@ def create_account_list_dialog(page: ft.Page, refresh_callback: callable = None)
     print("🔴 create_account_list_dialog CALLED")
     
     # DEBUG: Verificar la ruta de la base de datos (writable)
-    db_path = get_db_path()
+    db_path = obtener_contexto().db_path
     print(f"🔴 DB Path: {db_path}")
     print(f"🔴 DB exists: {os.path.exists(db_path)}")
 
@@ -66,9 +66,8 @@ def create_account_list_dialog(page: ft.Page, refresh_callback: callable = None)
                 return
 
             # Sugerir/obtener codigo_cuenta
-            conn = sqlite3.connect(db_path, timeout=5)
-            conn.execute("PRAGMA busy_timeout=3000")
-            try:
+            conn = obtener_conexion(db_path)
+            with conn:
                 cur = conn.cursor()
 
                 # Insertar cuenta
@@ -80,12 +79,6 @@ def create_account_list_dialog(page: ft.Page, refresh_callback: callable = None)
                     (nombre_cuenta,)
                 )
                 new_id = cur.lastrowid
-                conn.commit()
-            finally:
-                try:
-                    conn.close()
-                except Exception:
-                    pass
 
             if copy_checkbox.value:
                 try:
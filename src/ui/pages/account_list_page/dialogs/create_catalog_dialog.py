@@ -1,7 +1,7 @@
 import flet as ft
-import sqlite3
 import re
-from src.utils.paths import get_db_path
+from src.utils.contexto import obtener_contexto
+from data.database.conexion import obtener_conexion
 from data.catalogoOps import crear_tipo_cuenta, crear_rubro, crear_generico
 from data.obtenerCuentas import (
     obtenerTodasTipoCuentas,
@@ -17,14 +17,14 @@ def _snack(page: ft.Page, msg: str, ok: bool):
 
 
 def open_create_tipo_dialog(page: ft.Page, refresh_callback=None, plan_id: int | None = 0):
-    db_path = get_db_path()
+    db_path = obtener_contexto().db_path
     nombre_field = ft.TextField(label="Nombre del tipo", width=380, border_color=ft.Colors.BLUE, color=ft.Colors.BLACK)
     codigo_preview = ft.Text("Código sugerido: -", color=ft.Colors.GREY_700)
 
     # Calcular código sugerido: siguiente número dentro del plan con formato N.0.0.000
     sugerido = "1.0.0.000"
     try:
-        with sqlite3.connect(db_path) as conn:
+        with obtener_conexion(db_path) as conn:
             cur = conn.cursor()
             if plan_id is None:
                 cur.execute("SELECT numero_cuenta FROM tipo_cuenta")
@@ -80,7 +80,7 @@ def open_create_tipo_dialog(page: ft.Page, refresh_callback=None, plan_id: int |
 
 
 def open_create_rubro_dialog(page: ft.Page, refresh_callback=None, plan_id: int | None = None):
-    db_path = get_db_path()
+    db_path = obtener_contexto().db_path
     if plan_id is None:
         tipos = obtenerTodasTipoCuentas(db_path)
     else:
@@ -106,7 +106,7 @@ def open_create_rubro_dialog(page: ft.Page, refresh_callback=None, plan_id: int
 
         # Calcular sugerido para rubro como {tipo}.{n}.0.000
         try:
-            with sqlite3.connect(db_path) as conn:
+            with obtener_conexion(db_path) as conn:
                 cur = conn.cursor()
                 cur.execute("SELECT numero_cuenta FROM rubro WHERE id_tipo_cuenta = ?", (int(data["id"]),))
                 max_suffix = 0
@@ -176,7 +176,7 @@ def open_create_rubro_dialog(page: ft.Page, refresh_callback=None, plan_id: int
 
 
 def open_create_generico_dialog(page: ft.Page, refresh_callback=None, plan_id: int | None = None):
-    db_path = get_db_path()
+    db_path = obtener_contexto().db_path
     if plan_id is None:
         tipos = obtenerTodasTipoCuentas(db_path)
     else:
@@ -223,7 +223,7 @@ def open_create_generico_dialog(page: ft.Page, refresh_callback=None, plan_id: i
 
         # Calcular sugerido para genérico como {tipo}.{rubroSeq}.{n}.000
         try:
-            with sqlite3.connect(db_path) as conn:
+            with obtener_conexion(db_path) as conn:
                 cur = conn.cursor()
                 cur.execute("SELECT numero_cuenta FROM generico WHERE id_rubro = ?", (int(data["id"]),))
                 max_suffix = 0
@@ -3,7 +3,7 @@ from data.isCuentaUtilizada import is_cuenta_utilizada
 from data.models.cuenta import CuentaContable
 from .edit_account_dialog import open_edit_account_dialog
 from data.eliminarCuenta import eliminar_cuenta_contable
-from src.utils.paths import get_db_path
+from src.utils.contexto import obtener_contexto
 
 def open_detail_account_dialog(page: ft.Page, cuenta: CuentaContable, refresh_callback: callable = None):
     def close(dlg):
@@ -29,11 +29,11 @@ def open_detail_account_dialog(page: ft.Page, cuenta: CuentaContable, refresh_ca
 
     def do_delete(dlg):
         
-        if(is_cuenta_utilizada(get_db_path(), cuenta.id_cuenta_contable)):
+        if(is_cuenta_utilizada(obtener_contexto().db_path, cuenta.id_cuenta_contable)):
             close(dlg)
             show_error_dialog("Esta cuenta está en uso y no se puede eliminar.")
             return
-        ok = eliminar_cuenta_contable(get_db_path(), cuenta.id_cuenta_contable)
+        ok = eliminar_cuenta_contable(obtener_contexto().db_path, cuenta.id_cuenta_contable)
         close(dlg)
         if ok:
             show_snackbar(f"Cuenta {cuenta.codigo_cuenta} eliminada")
@@ -1,5 +1,4 @@
 import flet as ft
-import sqlite3
 from data.catalogoOps import (
     actualizar_generico,
     actualizar_rubro,
@@ -10,7 +9,8 @@ from data.catalogoOps import (
 )
 from data.models.cuenta import Generico, Rubro, TipoCuenta
 from data.obtenerCuentas import obtenerTodasTipoCuentas, obtenerTodosRubroPorTipoCuenta
-from src.utils.paths import get_db_path
+from src.utils.contexto import obtener_contexto
+from data.database.conexion import obtener_conexion
 
 
 def _show_snackbar(page: ft.Page, message: str, success: bool = True):
@@ -43,14 +43,14 @@ def _confirm_delete(page: ft.Page, message: str, on_confirm):
 
 
 def open_detail_tipo_dialog(page: ft.Page, tipo: TipoCuenta, stats: dict, refresh_callback=None):
-    db_path = get_db_path()
+    db_path = obtener_contexto().db_path
     nombre_field = ft.TextField(label="Nombre", value=tipo.nombre_tipo_cuenta, color=ft.Colors.BLACK)
     numero_field = ft.TextField(label="Código", value=tipo.numero_cuenta, color=ft.Colors.BLACK)
     codigo_sugerido_text = ft.Text("", size=12, color=ft.Colors.GREY_700)
 
     def sugerir_codigo_tipo() -> str:
         try:
-            with sqlite3.connect(db_path) as conn:
+            with obtener_conexion(db_path) as conn:
                 cur = conn.cursor()
                 cur.execute("SELECT numero_cuenta FROM tipo_cuenta")
                 rows = [r[0] for r in cur.fetchall() if r and r[0]]
@@ -131,7 +131,7 @@ def open_detail_tipo_dialog(page: ft.Page, tipo: TipoCuenta, stats: dict, refres
 
 
 def open_detail_rubro_dialog(page: ft.Page, rubro: Rubro, stats: dict, refresh_callback=None):
-    db_path = get_db_path()
+    db_path = obtener_contexto().db_path
     nombre_field = ft.TextField(label="Nombre", value=rubro.nombre_rubro, color=ft.Colors.BLACK)
     numero_field = ft.TextField(label="Código", value=rubro.numero_cuenta, color=ft.Colors.BLACK)
     tipos = obtenerTodasTipoCuentas(db_path)
@@ -158,7 +158,7 @@ def open_detail_rubro_dialog(page: ft.Page, rubro: Rubro, stats: dict, refresh_c
         parts = (tipo_obj.numero_cuenta or "").split(".")
         seg1 = parts[0] if parts and parts[0] else str(tipo_obj.id_tipo_cuenta)
         try:
-            with sqlite3.connect(db_path) as conn:
+            with obtener_conexion(db_path) as conn:
                 cur = conn.cursor()
                 cur.execute("SELECT numero_cuenta FROM rubro WHERE id_tipo_cuenta = ?", (int(tipo_obj.id_tipo_cuenta),))
                 rows = [r[0] for r in cur.fetchall() if r and r[0]]
@@ -253,7 +253,7 @@ def open_detail_rubro_dialog(page: ft.Page, rubro: Rubro, stats: dict, refresh_c
 
 
 def open_detail_generico_dialog(page: ft.Page, generico: Generico, stats: dict, refresh_callback=None):
-    db_path = get_db_path()
+    db_path = obtener_contexto().db_path
     nombre_field = ft.TextField(label="Nombre", value=generico.nombre_generico, color=ft.Colors.BLACK)
     numero_field = ft.TextField(label="Código", value=generico.numero_cuenta, color=ft.Colors.BLACK)
     tipos = obtenerTodasTipoCuentas(db_path)
@@ -311,7 +311,7 @@ def open_detail_generico_dialog(page: ft.Page, generico: Generico, stats: dict,
             seg2 = str(rubro_obj.id_rubro)
 
         try:
-            with sqlite3.connect(db_path) as conn:
+            with obtener_conexion(db_path) as conn:
                 cur = conn.cursor()
                 cur.execute("SELECT numero_cuenta FROM generico WHERE id_rubro = ?", (int(rubro_obj.id_rubro),))
                 rows = [r[0] for r in cur.fetchall() if r and r[0]]
@@ -1,21 +1,22 @@
 import flet as ft
-import sqlite3
-from src.utils.paths import get_db_path
+from src.utils.contexto import obtener_contexto
+from data.database.conexion import obtener_conexion
 from data.models.cuenta import CuentaContable
 from data.actualizarCuenta import actualizar_cuenta_contable
-from data.obtenerCuentas import (
-    obtenerTodasTipoCuentas,
-    obtenerTodosRubroPorTipoCuenta,
-    obtenerTodosGenericoPorRubro,
-)
+from data.catalogoCache import JerarquiaCatalogo, obtenerJerarquia
 
 def open_edit_account_dialog(page: ft.Page, cuenta: CuentaContable, refresh_callback: callable = None, parent_dialog: ft.AlertDialog | None = None):
     if parent_dialog:
         parent_dialog.open = False
     page.update()
 
-    db_path = get_db_path()
-    tipos = obtenerTodasTipoCuentas(db_path)
+    db_path = obtener_contexto().db_path
+    try:
+        jerarquia = obtenerJerarquia(db_path)
+    except Exception as ex:
+        print(f"Error cargando catálogo de cuentas: {ex}")
+        jerarquia = JerarquiaCatalogo(id_plan_cuenta=None)
+    tipos = jerarquia.tipos
 
     codigo_field = ft.TextField(label="Código", value=str(cuenta.codigo_cuenta), width=160,border_color=ft.Colors.BLUE, color=ft.Colors.BLACK)
     nombre_field = ft.TextField(label="Nombre", value=cuenta.nombre_cuenta, width=320,border_color=ft.Colors.BLUE, color=ft.Colors.BLACK)
@@ -85,7 +86,7 @@ def open_edit_account_dialog(page: ft.Page, cuenta: CuentaContable, refresh_call
         tipo_menu.content.content.controls[0].value = f"{data['numero']} - {data['nombre']}"
         tipo_menu.content.border = ft.border.all(1, ft.Colors.BLUE)
         reset_rubro()
-        rubros = obtenerTodosRubroPorTipoCuenta(db_path, int(data["id"]))
+        rubros = jerarquia.rubros_de(int(data["id"]))
         rubro_menu.items = [
             ft.PopupMenuItem(
                 content=ft.Row([
@@ -106,7 +107,7 @@ def open_edit_account_dialog(page: ft.Page, cuenta: CuentaContable, refresh_call
         rubro_menu.content.content.controls[0].value = f"{data['numero']} - {data['nombre']}"
         rubro_menu.content.border = ft.border.all(1, ft.Colors.BLUE)
         reset_generico()
-        genericos = obtenerTodosGenericoPorRubro(db_path, int(data["id"]))
+        genericos = jerarquia.genericos_de(int(data["id"]))
         generico_menu.items = [
             ft.PopupMenuItem(
                 content=ft.Row([
@@ -133,17 +134,10 @@ def open_edit_account_dialog(page: ft.Page, cuenta: CuentaContable, refresh_call
             page.update()
             return
 
-        try:
-            conn = sqlite3.connect(db_path)
-            cur = conn.cursor()
-            # Obtener todos los códigos existentes para este genérico
-            cur.execute("SELECT codigo_cuenta FROM cuenta_contable WHERE id_generico = ?", (id_generico,))
-            codigos = [row[0] for row in cur.fetchall() if row and row[0]]
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+        cur = obtener_conexion(db_path).cursor()
+        # Obtener todos los códigos existentes para este genérico
+        cur.execute("SELECT codigo_cuenta FROM cuenta_contable WHERE id_generico = ?", (id_generico,))
+        codigos = [row[0] for row in cur.fetchall() if row and row[0]]
 
         tipo_id = selected_tipo["id"]
         rubro_id = selected_rubro["id"]
@@ -194,7 +188,7 @@ def open_edit_account_dialog(page: ft.Page, cuenta: CuentaContable, refresh_call
                 "numero": tipo_obj.numero_cuenta,
             })
 
-            rubros = obtenerTodosRubroPorTipoCuenta(db_path, int(tipo_obj.id_tipo_cuenta))
+            rubros = jerarquia.rubros_de(int(tipo_obj.id_tipo_cuenta))
             rubro_obj = next((r for r in rubros if r.id_rubro == rubro_id), None)
             if not rubro_obj:
                 return
@@ -205,7 +199,7 @@ def open_edit_account_dialog(page: ft.Page, cuenta: CuentaContable, refresh_call
                 "numero": rubro_obj.numero_cuenta,
             })
 
-            genericos = obtenerTodosGenericoPorRubro(db_path, int(rubro_obj.id_rubro))
+            genericos = jerarquia.genericos_de(int(rubro_obj.id_rubro))
             generico_obj = next((g for g in genericos if g.id_generico == generico_id), None)
             if not generico_obj:
                 return
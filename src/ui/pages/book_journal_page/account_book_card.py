@@ -1,9 +1,10 @@
 import flet as ft
 from typing import Optional
 from data.models.lineaAsiento import LineaAsiento
+from data.models.dinero import Centavos, formatear_monto
 
 class TAccountBookCard:
-    def __init__(self, account_name: str, account_code: str, debe: float, haber: float, listacuentas: list[LineaAsiento]):
+    def __init__(self, account_name: str, account_code: str, debe: Centavos, haber: Centavos, listacuentas: list[LineaAsiento]):
         self.account_name = account_name
         self.account_code = account_code
         self.debe = debe
@@ -17,7 +18,7 @@ class TAccountBookCard:
                 items.append(
                     ft.Row([
                         ft.Text(str(cuenta.id_asiento), color=ft.Colors.GREY_700),
-                        ft.Text(f"{float(cuenta.debe or 0):.2f}", color=ft.Colors.GREEN_700),
+                        ft.Text(formatear_monto(cuenta.debe), color=ft.Colors.GREEN_700),
                     ], spacing=8)
                 )
         if not items:
@@ -33,7 +34,7 @@ class TAccountBookCard:
                     ft.Row([
                         ft.Text(str(cuenta.id_asiento), color=ft.Colors.GREY_700),
                         ft.Container(
-                            content=ft.Text(f"{float(cuenta.haber or 0):.2f}", color=ft.Colors.RED_700),
+                            content=ft.Text(formatear_monto(cuenta.haber), color=ft.Colors.RED_700),
                             padding=ft.padding.only(left=24)  # sangría para Haber
                         ),
                     ], spacing=8)
@@ -101,7 +102,7 @@ class TAccountBookCard:
                             ft.Text("Total", weight=ft.FontWeight.BOLD, color=azul_texto),
                             ft.Container(expand=True),
                             ft.Text(
-                                f"Debe: {self.debe:.2f}",
+                                f"Debe: {formatear_monto(self.debe)}",
                                 color=ft.Colors.GREEN_700,
                                 size=12,
                                 max_lines=1,
@@ -109,7 +110,7 @@ class TAccountBookCard:
                             ),
                             ft.Text(" | ", color=ft.Colors.GREY_600, size=12),
                             ft.Text(
-                                f"Haber: {self.haber:.2f}",
+                                f"Haber: {formatear_monto(self.haber)}",
                                 color=ft.Colors.RED_700,
                                 size=12,
                                 max_lines=1,
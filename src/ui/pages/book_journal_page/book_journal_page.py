@@ -1,16 +1,22 @@
+import bisect
 import flet as ft
-import sqlite3
 from pathlib import Path
 from sqlite3 import Error
+import threading
 import time
+from datetime import datetime
 from src.ui.pages.book_journal_page.dialog.accounting_voucher_dialog import AccountingVoucherDialog
 import urllib.parse
-from src.services.exportarLibro import exportar_libro_diario
 
 from data.models.libro import LibroDiario
 from src.ui.components.backgrounds import create_modern_background
-from data.obtenerAsientos import obtenerAsientosDeLibro
-from src.utils.paths import get_db_path
+from src.ui.components.busqueda_asientos import create_busqueda_asientos
+from data.obtenerAsientos import obtenerPaginaAsientos
+from data.saldosCuenta import obtenerSaldosPorLibro, obtenerTotalesLibro
+from data.models.dinero import a_centavos, formatear_monto
+from data.models.filtroDiario import LADO_DEBE, LADO_HABER, FiltroDiario
+from src.utils.contexto import obtener_contexto
+from data.database.conexion import cerrar_conexiones, obtener_conexion
 
 def title_widget():
     return ft.Container(
@@ -62,12 +68,22 @@ def title_book_journal(empresa: str = "", contador: str = "", anio: str = "", me
     )
 
 
-def contenido(page: ft.Page, libro: LibroDiario):
-    # Callback de refresco: re-render del grid cuando ya está en la página
-    def refresh_diario():
+# Asientos por página del diario y máximo de páginas vivas en el ListView
+PAGINA_ASIENTOS = 50
+VENTANA_MAX_PAGINAS = 6
+
+
+def contenido(page: ft.Page, libro: LibroDiario, filtros_abiertos: bool = False):
+    # Callback del diálogo de asientos: con el asiento guardado solo se
+    # parchea su bloque; sin él se vuelve a renderizar la primera página.
+    def refresh_diario(asiento: dict | None = None, nuevo: bool = True):
         try:
-            render_journal_grid(do_update=True)
-        except Exception:
+            if asiento is None:
+                render_journal_grid(do_update=True)
+            else:
+                aplicar_asiento_guardado(asiento, nuevo)
+        except Exception as ex:
+            print(f"Error actualizando el diario: {ex}")
             page.update()
 
     # Envolver el contenido en un contenedor blanco para asegurar contraste
@@ -112,171 +128,392 @@ def contenido(page: ft.Page, libro: LibroDiario):
         bgcolor=ft.Colors.WHITE,
     )
 
-    def render_journal_grid(do_update: bool = False):
-        rows = obtenerAsientosDeLibro(get_db_path(), libro.id_libro_diario)
-        header = ft.Container(
-            gradient=ft.LinearGradient(begin=ft.Alignment(-1, -1), end=ft.Alignment(1, 1), colors=[ft.Colors.BLUE_100, ft.Colors.BLUE_50]),
-            border=ft.border.only(bottom=ft.border.BorderSide(2, ft.Colors.BLUE_300)),
-            padding=12,
-            content=ft.Row([
-                ft.Text('Fecha', weight=ft.FontWeight.BOLD, expand=1, color=ft.Colors.BLUE_900),
-                ft.Text('Código', weight=ft.FontWeight.BOLD, expand=1, color=ft.Colors.BLUE_900),
-                ft.Text('Descripción', weight=ft.FontWeight.BOLD, expand=4, color=ft.Colors.BLUE_900),
-                ft.Text('Debe', weight=ft.FontWeight.BOLD, expand=1, color=ft.Colors.BLUE_900),
-                ft.Text('Haber', weight=ft.FontWeight.BOLD, expand=1, color=ft.Colors.BLUE_900),
-            ], spacing=12, vertical_alignment=ft.CrossAxisAlignment.CENTER)
-        )
+    # Ventana de asientos cargados: páginas por clave (fecha, id_asiento).
+    # Solo se mantienen VENTANA_MAX_PAGINAS en el ListView; al pasar ese
+    # límite se descartan las del extremo opuesto y se pueden volver a pedir.
+    # El filtro activo se aplica en SQL a cada página que se pide.
+    ventana = {"paginas": [], "hay_anteriores": False, "hay_siguientes": False, "cargando": False, "filtro": None}
+    totales = {"debe": 0, "haber": 0}
+    journal_list = ft.ListView(spacing=0, padding=0, expand=True, scroll_interval=150)
 
-        def on_row_click(asiento_id: int):
-            try:
-                # Abrir en modo edición y refrescar la grilla al guardar
-                AccountingVoucherDialog(page, libro.id_libro_diario, asiento_id=asiento_id, on_saved=refresh_diario).open()
-            except Exception as ex:
-                err = ft.AlertDialog(title=ft.Text("Error"), content=ft.Text(f"No se pudo abrir edición: {ex}"))
-                page.dialog = err
-                err.open = True
-                page.update()
+    header = ft.Container(
+        gradient=ft.LinearGradient(begin=ft.Alignment(-1, -1), end=ft.Alignment(1, 1), colors=[ft.Colors.BLUE_100, ft.Colors.BLUE_50]),
+        border=ft.border.only(bottom=ft.border.BorderSide(2, ft.Colors.BLUE_300)),
+        padding=12,
+        content=ft.Row([
+            ft.Text('Fecha', weight=ft.FontWeight.BOLD, expand=1, color=ft.Colors.BLUE_900),
+            ft.Text('Código', weight=ft.FontWeight.BOLD, expand=1, color=ft.Colors.BLUE_900),
+            ft.Text('Descripción', weight=ft.FontWeight.BOLD, expand=4, color=ft.Colors.BLUE_900),
+            ft.Text('Debe', weight=ft.FontWeight.BOLD, expand=1, color=ft.Colors.BLUE_900),
+            ft.Text('Haber', weight=ft.FontWeight.BOLD, expand=1, color=ft.Colors.BLUE_900),
+        ], spacing=12, vertical_alignment=ft.CrossAxisAlignment.CENTER)
+    )
+
+    def on_row_click(asiento_id: int):
+        try:
+            # Abrir en modo edición y refrescar la grilla al guardar
+            AccountingVoucherDialog(
+                page, libro.id_libro_diario, asiento_id=asiento_id,
+                on_saved=lambda asiento: refresh_diario(asiento, nuevo=False),
+            ).open()
+        except Exception as ex:
+            err = ft.AlertDialog(title=ft.Text("Error"), content=ft.Text(f"No se pudo abrir edición: {ex}"))
+            page.dialog = err
+            err.open = True
+            page.update()
+
+    def controles_asiento(asiento: dict) -> list[ft.Control]:
+        aid = asiento["id_asiento"]
+        fecha = asiento["fecha"]
+        descripcion = asiento["descripcion"] or ''
+        lines = asiento["lineas"]
+        controles: list[ft.Control] = []
+
+        # Asiento header line: ----(numero_asiento)---- fecha; other columns empty
+        controles.append(
+            ft.Container(
+                padding=10,
+                bgcolor=ft.Colors.BLUE_50,
+                border=ft.border.only(bottom=ft.border.BorderSide(1, ft.Colors.BLUE_100), top=ft.border.BorderSide(1, ft.Colors.BLUE_100)),
+                on_click=lambda e, xid=aid: on_row_click(xid),
+                content=ft.Row([
+                    ft.Text(f" {fecha}", expand=1, color=ft.Colors.BLUE_800),
+                    ft.Text("", expand=1),
+                    ft.Text(f"— Asiento {asiento['numero_asiento']} —", expand=4, text_align=ft.TextAlign.CENTER, color=ft.Colors.BLUE_700),
+                    ft.Text("", expand=1),
+                    ft.Text("", expand=1),
+                ], spacing=12)
+            )
+        )
 
-        # Agrupar por asiento; soporta filas con o sin numero_asiento
-        grouped = {}
-        for row in rows:
-            if len(row) == 8:
-                id_asiento, numero_asiento, fecha, descripcion, codigo, nombre, debe, haber = row
-            elif len(row) == 7:
-                id_asiento, fecha, descripcion, codigo, nombre, debe, haber = row
-                numero_asiento = id_asiento  # fallback si no viene el campo
+        # Line items: no date; ensure indentation for Haber and correct description per line
+        for idx, (codigo, nombre, debe, haber) in enumerate(lines):
+            es_ultima = (idx == len(lines) - 1)
+            base_nombre = (nombre or '').strip()
+            comentario = descripcion.strip() if isinstance(descripcion, str) else ''
+            # Descripción de la línea
+            if es_ultima:
+                # Última línea: mostrar solo el nombre de la cuenta (el comentario se agrega en la fila aparte abajo)
+                desc_line = base_nombre or comentario
             else:
-                # estructura inesperada; saltar fila
-                continue
-            grouped.setdefault(id_asiento, {
-                "numero_asiento": numero_asiento,
-                "fecha": fecha,
-                "descripcion": descripcion,
-                "lines": []
-            })
-            grouped[id_asiento]["lines"].append((codigo, nombre, debe, haber))
-
-        grid_rows = []
-        total_debe = 0.0
-        total_haber = 0.0
-        row_index = 0
-        for aid, data in grouped.items():
-            fecha = data["fecha"]
-            descripcion = data["descripcion"] or ''
-            lines = data["lines"]
-
-            # Asiento header line: ----(numero_asiento)---- fecha; other columns empty
-            grid_rows.append(
+                desc_line = base_nombre
+            # Determinar sangría según montos (centavos)
+            monto_haber = int(haber or 0)
+            monto_debe = int(debe or 0)
+            indent_desc = ft.Container(
+                content=ft.Text(desc_line, color=ft.Colors.BLACK),
+                padding=ft.padding.only(left=24) if (monto_haber > 0 and monto_debe == 0) else ft.padding.all(0),
+                expand=4,
+            )
+            # Alternar color de fondo (usar BLUE_50 como tono claro disponible)
+            row_bg = ft.Colors.WHITE if (idx % 2 == 0) else ft.Colors.BLUE_50
+            controles.append(
+                ft.Container(
+                    padding=8,
+                    bgcolor=row_bg,
+                    border=ft.border.only(bottom=ft.border.BorderSide(1, ft.Colors.BLUE_50)),
+                    on_click=lambda e, xid=aid: on_row_click(xid),
+                    content=ft.Row([
+                        ft.Text("", expand=1),
+                        ft.Text(codigo or '', expand=1, color=ft.Colors.GREY_800),
+                        indent_desc,
+                        ft.Container(
+                            expand=1,
+                            alignment=ft.Alignment(1, 0),
+                            content=ft.Text(formatear_monto(debe), color=ft.Colors.GREEN_700),
+                        ),
+                        ft.Container(
+                            expand=1,
+                            alignment=ft.Alignment(1, 0),
+                            content=ft.Text(formatear_monto(haber), color=ft.Colors.RED_700),
+                        ),
+                    ], spacing=12, vertical_alignment=ft.CrossAxisAlignment.CENTER)
+                )
+            )
+        # Extra comment-only row appended once after all lines
+        comentario_final = descripcion.strip() if isinstance(descripcion, str) else ''
+        if comentario_final:
+            controles.append(
                 ft.Container(
-                    padding=10,
+                    padding=8,
                     bgcolor=ft.Colors.BLUE_50,
-                    border=ft.border.only(bottom=ft.border.BorderSide(1, ft.Colors.BLUE_100), top=ft.border.BorderSide(1, ft.Colors.BLUE_100)),
+                    border=ft.border.only(bottom=ft.border.BorderSide(1, ft.Colors.BLUE_100)),
                     on_click=lambda e, xid=aid: on_row_click(xid),
                     content=ft.Row([
-                        ft.Text(f" {fecha}", expand=1, color=ft.Colors.BLUE_800),
                         ft.Text("", expand=1),
-                        ft.Text(f"— Asiento {data['numero_asiento']} —", expand=4, text_align=ft.TextAlign.CENTER, color=ft.Colors.BLUE_700),
+                        ft.Text("", expand=1),
+                        ft.Text(comentario_final, expand=4, color=ft.Colors.BLUE_800, style=ft.TextStyle(italic=True)),
                         ft.Text("", expand=1),
                         ft.Text("", expand=1),
                     ], spacing=12)
                 )
             )
+        return controles
 
-            # Line items: no date; ensure indentation for Haber and correct description per line
-            for idx, (codigo, nombre, debe, haber) in enumerate(lines):
-                es_ultima = (idx == len(lines) - 1)
-                base_nombre = (nombre or '').strip()
-                comentario = descripcion.strip() if isinstance(descripcion, str) else ''
-                # Descripción de la línea
-                if es_ultima:
-                    # Última línea: mostrar solo el nombre de la cuenta (el comentario se agrega en la fila aparte abajo)
-                    desc_line = base_nombre or comentario
-                else:
-                    desc_line = base_nombre
-                # Determinar sangría según montos
-                try:
-                    monto_haber = float(haber or 0)
-                except Exception:
-                    monto_haber = 0.0
-                try:
-                    monto_debe = float(debe or 0)
-                except Exception:
-                    monto_debe = 0.0
-                # Acumular totales globales
-                total_debe += monto_debe
-                total_haber += monto_haber
-                indent_desc = ft.Container(
-                    content=ft.Text(desc_line, color=ft.Colors.BLACK),
-                    padding=ft.padding.only(left=24) if (monto_haber > 0 and monto_debe == 0) else ft.padding.all(0),
-                    expand=4,
-                )
-                # Alternar color de fondo (usar BLUE_50 como tono claro disponible)
-                row_bg = ft.Colors.WHITE if (row_index % 2 == 0) else ft.Colors.BLUE_50
-                grid_rows.append(
-                    ft.Container(
-                        padding=8,
-                        bgcolor=row_bg,
-                        border=ft.border.only(bottom=ft.border.BorderSide(1, ft.Colors.BLUE_50)),
-                        on_click=lambda e, xid=aid: on_row_click(xid),
-                        content=ft.Row([
-                            ft.Text("", expand=1),
-                            ft.Text(codigo or '', expand=1, color=ft.Colors.GREY_800),
-                            indent_desc,
-                            ft.Container(
-                                expand=1,
-                                alignment=ft.Alignment(1, 0),
-                                content=ft.Text(f"{float(debe or 0):.2f}", color=ft.Colors.GREEN_700),
-                            ),
-                            ft.Container(
-                                expand=1,
-                                alignment=ft.Alignment(1, 0),
-                                content=ft.Text(f"{float(haber or 0):.2f}", color=ft.Colors.RED_700),
-                            ),
-                        ], spacing=12, vertical_alignment=ft.CrossAxisAlignment.CENTER)
-                    )
-                )
-                row_index += 1
-            # Extra comment-only row appended once after all lines
-            comentario_final = descripcion.strip() if isinstance(descripcion, str) else ''
-            if comentario_final:
-                grid_rows.append(
-                    ft.Container(
-                        padding=8,
-                        bgcolor=ft.Colors.BLUE_50,
-                        border=ft.border.only(bottom=ft.border.BorderSide(1, ft.Colors.BLUE_100)),
-                        on_click=lambda e, xid=aid: on_row_click(xid),
-                        content=ft.Row([
-                            ft.Text("", expand=1),
-                            ft.Text("", expand=1),
-                            ft.Text(comentario_final, expand=4, color=ft.Colors.BLUE_800, style=ft.TextStyle(italic=True)),
-                            ft.Text("", expand=1),
-                            ft.Text("", expand=1),
-                        ], spacing=12)
-                    )
-                )
+    def nueva_pagina(asientos: list[dict]) -> dict:
+        # Bloque de controles por asiento para poder reemplazar uno solo
+        bloques = {a["id_asiento"]: controles_asiento(a) if a["lineas"] else [] for a in asientos}
+        return {"asientos": asientos, "bloques": bloques}
 
-        grid_container.content = ft.ListView(
-            controls=[header] + grid_rows,
-            spacing=0,
-            padding=0,
+    def clave(asiento: dict) -> tuple:
+        return (asiento["fecha"], asiento["id_asiento"])
+
+    def fila_cargar(texto: str, icono, on_click) -> ft.Control:
+        return ft.Container(
+            padding=10,
+            alignment=ft.Alignment(0, 0),
+            content=ft.TextButton(texto, icon=icono, on_click=on_click),
         )
-        # Render totales debajo de la grilla
+
+    def armar_lista():
+        controles: list[ft.Control] = [header]
+        if ventana["hay_anteriores"]:
+            controles.append(fila_cargar("Cargar asientos anteriores", ft.Icons.EXPAND_LESS, lambda e: cargar_anteriores()))
+        for pagina in ventana["paginas"]:
+            for asiento in pagina["asientos"]:
+                # Igual que antes: los asientos sin líneas no se muestran
+                controles.extend(pagina["bloques"][asiento["id_asiento"]])
+        if ventana["hay_siguientes"]:
+            controles.append(fila_cargar("Cargar más asientos", ft.Icons.EXPAND_MORE, lambda e: cargar_siguientes()))
+        if not ventana["paginas"]:
+            vacio = "No hay asientos que cumplan el filtro." if ventana["filtro"] else "No hay asientos en este libro."
+            controles.append(ft.Container(padding=16, content=ft.Text(vacio, color=ft.Colors.GREY_600)))
+        journal_list.controls = controles
+
+    def actualizar_lista():
+        armar_lista()
+        if getattr(journal_list, "_Control__page", None) is not None:
+            journal_list.update()
+
+    def cargar_siguientes():
+        if ventana["cargando"] or not ventana["hay_siguientes"] or not ventana["paginas"]:
+            return
+        ventana["cargando"] = True
+        try:
+            ultimo = ventana["paginas"][-1]["asientos"][-1]
+            asientos = obtenerPaginaAsientos(obtener_contexto().db_path, libro.id_libro_diario, despues=clave(ultimo), limite=PAGINA_ASIENTOS, filtro=ventana["filtro"])
+            ventana["hay_siguientes"] = len(asientos) >= PAGINA_ASIENTOS
+            if asientos:
+                ventana["paginas"].append(nueva_pagina(asientos))
+                if len(ventana["paginas"]) > VENTANA_MAX_PAGINAS:
+                    ventana["paginas"].pop(0)
+                    ventana["hay_anteriores"] = True
+            actualizar_lista()
+        finally:
+            ventana["cargando"] = False
+
+    def cargar_anteriores():
+        if ventana["cargando"] or not ventana["hay_anteriores"] or not ventana["paginas"]:
+            return
+        ventana["cargando"] = True
+        try:
+            primero = ventana["paginas"][0]["asientos"][0]
+            asientos = obtenerPaginaAsientos(obtener_contexto().db_path, libro.id_libro_diario, antes=clave(primero), limite=PAGINA_ASIENTOS, filtro=ventana["filtro"])
+            ventana["hay_anteriores"] = len(asientos) >= PAGINA_ASIENTOS
+            if asientos:
+                ventana["paginas"].insert(0, nueva_pagina(asientos))
+                if len(ventana["paginas"]) > VENTANA_MAX_PAGINAS:
+                    ventana["paginas"].pop()
+                    ventana["hay_siguientes"] = True
+            actualizar_lista()
+        finally:
+            ventana["cargando"] = False
+
+    def on_journal_scroll(e):
+        # Cargar la página siguiente al acercarse al final de la lista
+        try:
+            if e.max_scroll_extent and e.pixels >= e.max_scroll_extent - 400:
+                cargar_siguientes()
+        except Exception:
+            pass
+
+    journal_list.on_scroll = on_journal_scroll
+
+    total_debe_text = ft.Text("", weight=ft.FontWeight.BOLD, color=ft.Colors.GREEN_700)
+    total_haber_text = ft.Text("", weight=ft.FontWeight.BOLD, color=ft.Colors.RED_700)
+
+    def mostrar_totales():
+        total_debe_text.value = f"Debe: {formatear_monto(totales['debe'])}"
+        total_haber_text.value = f"Haber: {formatear_monto(totales['haber'])}"
+
+    def render_totales():
+        # Render totales debajo de la grilla (saldos materializados por cuenta)
+        totales["debe"], totales["haber"] = obtenerTotalesLibro(obtener_contexto().db_path, libro.id_libro_diario)
+        mostrar_totales()
         totals_container.content = ft.Row(
             [
                 ft.Text("Totales:", weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_900),
                 ft.Container(expand=True),
-                ft.Text(f"Debe: {total_debe:.2f}", weight=ft.FontWeight.BOLD, color=ft.Colors.GREEN_700),
-                ft.Text(f"Haber: {total_haber:.2f}", weight=ft.FontWeight.BOLD, color=ft.Colors.RED_700),
+                total_debe_text,
+                total_haber_text,
             ],
             spacing=12,
             vertical_alignment=ft.CrossAxisAlignment.CENTER,
         )
+
+    def sumas(asiento: dict | None) -> tuple[int, int]:
+        if not asiento:
+            return 0, 0
+        return sum(l[2] for l in asiento["lineas"]), sum(l[3] for l in asiento["lineas"])
+
+    def quitar_de_ventana(id_asiento: int) -> dict | None:
+        """Saca el asiento de la ventana (si está cargado) y devuelve su versión anterior."""
+        for pagina in ventana["paginas"]:
+            for i, a in enumerate(pagina["asientos"]):
+                if a["id_asiento"] == id_asiento:
+                    del pagina["asientos"][i]
+                    pagina["bloques"].pop(id_asiento, None)
+                    if not pagina["asientos"]:
+                        # Las claves de paginación se toman del primer/último asiento
+                        ventana["paginas"].remove(pagina)
+                    return a
+        return None
+
+    def insertar_en_ventana(asiento: dict) -> None:
+        """Ubica el asiento por (fecha, id) si cae dentro del rango cargado."""
+        filtro = ventana["filtro"]
+        if filtro is not None and not filtro.coincide(asiento):
+            return
+        paginas = ventana["paginas"]
+        if not paginas:
+            if ventana["hay_anteriores"] or ventana["hay_siguientes"]:
+                return
+            ventana["paginas"] = [nueva_pagina([asiento])]
+            return
+        k = clave(asiento)
+        if k < clave(paginas[0]["asientos"][0]) and ventana["hay_anteriores"]:
+            return
+        destino = next((p for p in paginas if k <= clave(p["asientos"][-1])), None)
+        if destino is None:
+            if ventana["hay_siguientes"]:
+                return
+            destino = paginas[-1]
+        claves = [clave(a) for a in destino["asientos"]]
+        destino["asientos"].insert(bisect.bisect_left(claves, k), asiento)
+        destino["bloques"][asiento["id_asiento"]] = controles_asiento(asiento) if asiento["lineas"] else []
+
+    def aplicar_asiento_guardado(asiento: dict, nuevo: bool):
+        anterior = quitar_de_ventana(asiento["id_asiento"])
+        insertar_en_ventana(asiento)
+        actualizar_lista()
+        # Totales: se ajustan por la diferencia del asiento si se conoce su versión
+        # anterior (o si es nuevo); si no, se releen de los saldos por cuenta
+        if anterior is not None or nuevo:
+            debe_old, haber_old = sumas(anterior)
+            debe_new, haber_new = sumas(asiento)
+            totales["debe"] += debe_new - debe_old
+            totales["haber"] += haber_new - haber_old
+            mostrar_totales()
+        else:
+            render_totales()
+        if getattr(totals_container, "_Control__page", None) is not None:
+            totals_container.update()
+
+    def render_journal_grid(do_update: bool = False):
+        # Primera página del libro; el resto se pide al desplazarse
+        asientos = obtenerPaginaAsientos(obtener_contexto().db_path, libro.id_libro_diario, limite=PAGINA_ASIENTOS, filtro=ventana["filtro"])
+        ventana["paginas"] = [nueva_pagina(asientos)] if asientos else []
+        ventana["hay_anteriores"] = False
+        ventana["hay_siguientes"] = len(asientos) >= PAGINA_ASIENTOS
+        armar_lista()
+        grid_container.content = journal_list
+        render_totales()
         # Solo actualizar si el contenedor ya está adjunto a la página
         if do_update and getattr(grid_container, "_Control__page", None) is not None:
             grid_container.update()
             if getattr(totals_container, "_Control__page", None) is not None:
                 totals_container.update()
 
+    # Panel de filtros: arma un FiltroDiario y vuelve a pedir la primera página
+    filtro_desde = ft.TextField(label="Desde", hint_text="AAAA-MM-DD", width=130, dense=True)
+    filtro_hasta = ft.TextField(label="Hasta", hint_text="AAAA-MM-DD", width=130, dense=True)
+    filtro_codigo = ft.TextField(label="Código (prefijo)", width=140, dense=True)
+    filtro_monto_min = ft.TextField(label="Monto mín.", width=110, dense=True)
+    filtro_monto_max = ft.TextField(label="Monto máx.", width=110, dense=True)
+    filtro_lado = ft.Dropdown(
+        label="Lado", width=120, dense=True, value="",
+        options=[
+            ft.dropdown.Option("", "Ambos"),
+            ft.dropdown.Option(LADO_DEBE, "Debe"),
+            ft.dropdown.Option(LADO_HABER, "Haber"),
+        ],
+    )
+    filtro_texto = ft.TextField(label="Descripción contiene", width=200, dense=True)
+    filtro_error = ft.Text("", color=ft.Colors.RED, size=12)
+
+    def leer_filtro() -> FiltroDiario | None:
+        """FiltroDiario con los valores del panel, o None si alguno es inválido."""
+        fechas = []
+        for campo in (filtro_desde, filtro_hasta):
+            valor = (campo.value or "").strip()
+            if valor:
+                try:
+                    valor = datetime.strptime(valor, "%Y-%m-%d").strftime("%Y-%m-%d")
+                except ValueError:
+                    filtro_error.value = f"Fecha inválida: {valor} (use AAAA-MM-DD)."
+                    return None
+            fechas.append(valor)
+        montos = []
+        for campo in (filtro_monto_min, filtro_monto_max):
+            valor = (campo.value or "").strip()
+            try:
+                montos.append(a_centavos(valor) if valor else None)
+            except ValueError:
+                filtro_error.value = f"Monto inválido: {valor}"
+                return None
+        filtro_error.value = ""
+        return FiltroDiario(
+            fecha_desde=fechas[0],
+            fecha_hasta=fechas[1],
+            codigo_prefijo=(filtro_codigo.value or "").strip(),
+            monto_min=montos[0],
+            monto_max=montos[1],
+            lado=filtro_lado.value or "",
+            texto=(filtro_texto.value or "").strip(),
+        )
+
+    def aplicar_filtro(_e=None):
+        filtro = leer_filtro()
+        if filtro is not None:
+            ventana["filtro"] = filtro if filtro.activo else None
+            render_journal_grid(do_update=True)
+        if getattr(filtro_error, "_Control__page", None) is not None:
+            filtro_error.update()
+
+    def limpiar_filtro(_e=None):
+        for campo in (filtro_desde, filtro_hasta, filtro_codigo, filtro_monto_min, filtro_monto_max, filtro_texto):
+            campo.value = ""
+        filtro_lado.value = ""
+        filtro_error.value = ""
+        ventana["filtro"] = None
+        render_journal_grid(do_update=True)
+        if getattr(filtros_panel, "_Control__page", None) is not None:
+            filtros_panel.update()
+
+    for campo in (filtro_desde, filtro_hasta, filtro_codigo, filtro_monto_min, filtro_monto_max, filtro_texto):
+        campo.on_submit = aplicar_filtro
+
+    filtros_panel = ft.Container(
+        visible=filtros_abiertos,
+        padding=ft.padding.symmetric(vertical=8, horizontal=12),
+        border=ft.border.all(1, ft.Colors.BLUE_200),
+        border_radius=12,
+        bgcolor=ft.Colors.WHITE,
+        content=ft.Column([
+            ft.Row([
+                filtro_desde, filtro_hasta, filtro_codigo, filtro_monto_min, filtro_monto_max, filtro_lado, filtro_texto,
+                ft.FilledButton("Aplicar", icon=ft.Icons.FILTER_ALT, on_click=aplicar_filtro),
+                ft.TextButton("Limpiar", icon=ft.Icons.FILTER_ALT_OFF, on_click=limpiar_filtro),
+            ], spacing=8, wrap=True, vertical_alignment=ft.CrossAxisAlignment.CENTER),
+            filtro_error,
+        ], spacing=4, tight=True),
+    )
+
+    def toggle_filtros(_e=None):
+        filtros_panel.visible = not filtros_panel.visible
+        if getattr(filtros_panel, "_Control__page", None) is not None:
+            filtros_panel.update()
+
     # Render inicial sin update; el contenedor aún no está adjunto
     render_journal_grid(do_update=False)
 
@@ -286,7 +523,18 @@ def contenido(page: ft.Page, libro: LibroDiario):
             ft.Container(
                 expand=True,
                 content=ft.Column([
-                    ft.Text("Tabla", size=20, weight=ft.FontWeight.BOLD),
+                    ft.Row([
+                        ft.Text("Tabla", size=20, weight=ft.FontWeight.BOLD),
+                        ft.Container(expand=True),
+                        create_busqueda_asientos(
+                            page,
+                            on_select=lambda asiento: on_row_click(asiento["id_asiento"]),
+                            id_libro_diario=libro.id_libro_diario,
+                            hint_text="Buscar en este libro…",
+                        ),
+                        ft.TextButton("Filtros", icon=ft.Icons.FILTER_LIST, on_click=toggle_filtros),
+                    ], vertical_alignment=ft.CrossAxisAlignment.CENTER),
+                    filtros_panel,
                     grid_container,
                     totals_container,
                 ], spacing=10, expand=True),
@@ -298,8 +546,7 @@ def contenido(page: ft.Page, libro: LibroDiario):
     )
 
 from src.ui.pages.book_journal_page.account_book_card import TAccountBookCard
-from data.obtenerCuentas import obtenerTodasCuentasContables
-from data.models.lineaAsiento import LineaAsiento
+from data.obtenerMayor import obtenerMovimientosCuenta
 
 def contenido_mayor(page: ft.Page, libro: LibroDiario):
     # Encabezado
@@ -308,61 +555,50 @@ def contenido_mayor(page: ft.Page, libro: LibroDiario):
         ft.Text("Libro Mayor", size=26, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_800),
     ], spacing=10, alignment=ft.MainAxisAlignment.START)
 
-    # Consultar todas las cuentas usadas en el libro diario
-    db_path = get_db_path()
-    import sqlite3
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT DISTINCT c.id_cuenta_contable, c.codigo_cuenta, c.nombre_cuenta
-        FROM cuenta_contable c
-        JOIN linea_asiento la ON la.id_cuenta_contable = c.id_cuenta_contable
-        JOIN asiento a ON a.id_asiento = la.id_asiento
-        WHERE a.id_libro_diario = ?
-        ORDER BY c.codigo_cuenta ASC
-        """,
-        (libro.id_libro_diario,)
-    )
-    cuentas_usadas = cur.fetchall() or []
-
-    cards: list[ft.Control] = []
-    for (id_cuenta, codigo, nombre) in cuentas_usadas:
-        # Traer todas las líneas de esta cuenta para el libro
-        cur.execute(
-            """
-            SELECT la.id_linea_asiento, la.id_asiento, la.debe, la.haber, la.id_cuenta_contable
-            FROM linea_asiento la
-            JOIN asiento a ON a.id_asiento = la.id_asiento
-            WHERE la.id_cuenta_contable = ? AND a.id_libro_diario = ?
-            ORDER BY a.fecha ASC, la.id_linea_asiento ASC
-            """,
-            (id_cuenta, libro.id_libro_diario)
+    # Resumen por cuenta (saldos materializados): una sola consulta agregada.
+    # Las partidas de cada cuenta se cargan recién al expandir su fila.
+    db_path = obtener_contexto().db_path
+    saldos = obtenerSaldosPorLibro(db_path, libro.id_libro_diario)
+
+    def fila_cuenta(cuenta: dict) -> ft.Control:
+        saldo = cuenta["total_debe"] - cuenta["total_haber"]
+        naturaleza = "Deudor" if saldo > 0 else ("Acreedor" if saldo < 0 else "Saldado")
+        tile = ft.ExpansionTile(
+            title=ft.Text(f"{cuenta['codigo_cuenta']} - {cuenta['nombre_cuenta'] or 'Cuenta'}", weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_800),
+            subtitle=ft.Row([
+                ft.Text(f"Debe: {formatear_monto(cuenta['total_debe'])}", color=ft.Colors.GREEN_700, size=12),
+                ft.Text(f"Haber: {formatear_monto(cuenta['total_haber'])}", color=ft.Colors.RED_700, size=12),
+                ft.Text(f"Saldo: {formatear_monto(abs(saldo))} {naturaleza}", color=ft.Colors.BLUE_900, size=12, weight=ft.FontWeight.BOLD),
+                ft.Text(f"{cuenta['movimientos']} mov.", color=ft.Colors.GREY_600, size=12),
+            ], spacing=16),
+            controls=[],
+            maintain_state=True,
         )
-        rows = cur.fetchall() or []
-        lineas: list[LineaAsiento] = [
-            LineaAsiento(
-                id_linea_asiento=r[0], id_asiento=r[1], debe=float(r[2] or 0), haber=float(r[3] or 0), id_cuenta_contable=r[4]
-            ) for r in rows
-        ]
-        total_debe = sum(l.debe or 0 for l in lineas)
-        total_haber = sum(l.haber or 0 for l in lineas)
-        card = TAccountBookCard(account_name=nombre or "Cuenta", account_code=codigo or "", debe=total_debe, haber=total_haber, listacuentas=lineas)
-        cards.append(ft.Container(content=card.build(), padding=ft.padding.symmetric(vertical=8)))
 
-    try:
-        conn.close()
-    except Exception:
-        pass
+        def on_change(e, tile=tile, cuenta=cuenta):
+            # Construir la tarjeta T solo la primera vez que se expande
+            if tile.controls:
+                return
+            card = TAccountBookCard(
+                account_name=cuenta["nombre_cuenta"] or "Cuenta",
+                account_code=cuenta["codigo_cuenta"],
+                debe=cuenta["total_debe"],
+                haber=cuenta["total_haber"],
+                listacuentas=obtenerMovimientosCuenta(db_path, libro.id_libro_diario, cuenta["id_cuenta_contable"]),
+            )
+            tile.controls = [ft.Container(content=card.build(), padding=ft.padding.symmetric(vertical=8, horizontal=12))]
+            tile.update()
+
+        tile.on_change = on_change
+        return tile
 
-    # Fila de tarjetas con scroll horizontal (o mensaje si no hay)
-    cards_row = ft.Row(cards, spacing=16, scroll=ft.ScrollMode.ALWAYS) if cards else None
+    lista_cuentas = ft.ListView([fila_cuenta(c) for c in saldos], spacing=4, expand=True) if saldos else None
 
     inner = ft.Container(
         content=ft.Column([
             header,
             ft.Container(
-                content=(cards_row if cards_row else ft.Text("No hay cuentas utilizadas en este libro.", color=ft.Colors.GREY_600)),
+                content=(lista_cuentas if lista_cuentas else ft.Text("No hay cuentas utilizadas en este libro.", color=ft.Colors.GREY_600)),
                 expand=True,
             ),
         ], spacing=16, expand=True),
@@ -425,9 +661,7 @@ def agregar_libro(libro: LibroDiario, path_bd: str, allow_duplicates: bool = Fal
     while attempts < max_attempts:
         conn = None
         try:
-            conn = sqlite3.connect(path_bd, timeout=5)
-            conn.execute("PRAGMA busy_timeout=3000")
-            conn.execute("PRAGMA journal_mode=WAL")
+            conn = obtener_conexion(path_bd)
             cursor = conn.cursor()
 
             if not allow_duplicates:
@@ -442,13 +676,15 @@ def agregar_libro(libro: LibroDiario, path_bd: str, allow_duplicates: bool = Fal
 
             cursor.execute(
                 "INSERT INTO libro_diario (id_mes, ano, contador, nombre_empresa, total_debe, total_haber, id_plan_cuenta, origen, fecha_importacion) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                (libro.id_mes, libro.ano, libro.contador, libro.nombre_empresa, 0.0, 0.0, int(libro.id_plan_cuenta or 0), libro.origen or "creado", libro.fecha_importacion)
+                (libro.id_mes, libro.ano, libro.contador, libro.nombre_empresa, 0, 0, int(libro.id_plan_cuenta or 0), libro.origen or "creado", libro.fecha_importacion)
             )
             conn.commit()
             new_id = cursor.lastrowid
             print(f"Libro agregado exitosamente. id={new_id}")
             return new_id
         except Error as e:
+            if conn:
+                conn.rollback()
             msg = str(e)
             if "database is locked" in msg.lower():
                 attempts += 1
@@ -457,12 +693,6 @@ def agregar_libro(libro: LibroDiario, path_bd: str, allow_duplicates: bool = Fal
                 continue
             print(f"Error al agregar el libro: {e}")
             return None
-        finally:
-            if conn:
-                try:
-                    conn.close()
-                except Exception:
-                    pass
     print("No se pudo insertar el libro tras varios reintentos.")
     return None
     
@@ -483,10 +713,9 @@ def book_journal_page(page: ft.Page, empresa: str = "", contador: str = "", anio
     # Construir libro base con parámetros
     libro_diario = create_journal_book(empresa, contador, anio, mes, plan_id=plan_int)
     # Si viene un ID, cargar datos desde BD y evitar inserción automática
-    from src.utils.paths import get_db_path
     if isinstance(libro_id, int):
         try:
-            conn = sqlite3.connect(get_db_path())
+            conn = obtener_conexion(obtener_contexto().db_path)
             cur = conn.cursor()
             cur.execute(
                 "SELECT id_libro_diario, id_mes, ano, contador, nombre_empresa, COALESCE(id_plan_cuenta,0) FROM libro_diario WHERE id_libro_diario = ?",
@@ -506,11 +735,6 @@ def book_journal_page(page: ft.Page, empresa: str = "", contador: str = "", anio
                 libro_diario.id_libro_diario = libro_id
         except Exception as ex:
             print(f"Error cargando libro por id={libro_id}: {ex}")
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
 
     # --- Export dialog setup ---
     # Fields for filename and target directory
@@ -550,36 +774,125 @@ def book_journal_page(page: ft.Page, empresa: str = "", contador: str = "", anio
             except Exception:
                 pass
 
-    def do_export(e=None):
+    # Exportación en segundo plano: el diálogo se cierra al instante y el avance
+    # se ve en la barra superior (con botón para cancelar)
+    exportacion = {"cancelar": None}
+    export_label = ft.Text("", size=12, color=ft.Colors.WHITE)
+    export_bar = ft.ProgressBar(width=160, value=0, color=ft.Colors.WHITE, bgcolor=ft.Colors.with_opacity(0.3, ft.Colors.WHITE))
+
+    def _run_on_ui(fn):
+        """Ejecuta una función en el hilo de UI cuando sea posible."""
         try:
-            fname = (name_field.value or "").strip()
-            dest = (path_field.value or "").strip()
-            if not fname:
-                page.snack_bar = ft.SnackBar(content=ft.Text("Ingresa un nombre de archivo."), bgcolor=ft.Colors.RED_600, duration=3000)
-                page.snack_bar.open = True
-                page.update()
+            call_from_thread = getattr(page, "call_from_thread", None)
+            if callable(call_from_thread):
+                call_from_thread(fn)
                 return
-            if not dest:
-                page.snack_bar = ft.SnackBar(content=ft.Text("Selecciona una ruta de destino."), bgcolor=ft.Colors.RED_600, duration=3000)
-                page.snack_bar.open = True
-                page.update()
+            run_on_main = getattr(page, "run_on_main", None)
+            if callable(run_on_main):
+                run_on_main(fn)
                 return
-            if not fname.lower().endswith(".xlsx"):
-                fname = f"{fname}.xlsx"
-            output_path = Path(dest) / fname
-            exportar_libro_diario(libro_diario.id_libro_diario, output_path)
-            export_dialog.open = False
-            page.snack_bar = ft.SnackBar(
-                content=ft.Text(f"Exportado exitosamente: {output_path.name}"),
-                bgcolor=ft.Colors.GREEN_600,
-                duration=4000,
-            )
-            page.snack_bar.open = True
+        except Exception:
+            pass
+        try:
+            fn()
+        except Exception:
+            pass
+
+    def show_export_snack(message: str, color, duration: int = 4000):
+        page.snack_bar = ft.SnackBar(content=ft.Text(message), bgcolor=color, duration=duration)
+        page.snack_bar.open = True
+        page.update()
+
+    def cancel_export(_e=None):
+        cancelar = exportacion["cancelar"]
+        if cancelar is not None:
+            cancelar.set()
+            export_label.value = "Cancelando…"
+            export_bar.value = None
             page.update()
+
+    export_status = ft.Container(
+        visible=False,
+        content=ft.Row([
+            ft.Icon(ft.Icons.FILE_DOWNLOAD, size=18, color=ft.Colors.WHITE),
+            ft.Column([export_label, export_bar], spacing=2, tight=True),
+            ft.IconButton(icon=ft.Icons.CLOSE, icon_size=18, icon_color=ft.Colors.WHITE, tooltip="Cancelar exportación", on_click=cancel_export),
+        ], spacing=6, vertical_alignment=ft.CrossAxisAlignment.CENTER),
+    )
+
+    def do_export(e=None):
+        if exportacion["cancelar"] is not None:
+            show_export_snack("Ya hay una exportación en curso.", ft.Colors.ORANGE_700, 3000)
+            return
+        fname = (name_field.value or "").strip()
+        dest = (path_field.value or "").strip()
+        if not fname:
+            show_export_snack("Ingresa un nombre de archivo.", ft.Colors.RED_600, 3000)
+            return
+        if not dest:
+            show_export_snack("Selecciona una ruta de destino.", ft.Colors.RED_600, 3000)
+            return
+        if not fname.lower().endswith(".xlsx"):
+            fname = f"{fname}.xlsx"
+        output_path = Path(dest) / fname
+        try:
+            # Import diferido: openpyxl solo se carga al exportar
+            from src.services.exportarLibro import ExportacionCancelada, exportar_libro_diario
         except Exception as exc:
-            page.snack_bar = ft.SnackBar(content=ft.Text(f"Error al exportar: {exc}"), bgcolor=ft.Colors.RED_600, duration=5000)
-            page.snack_bar.open = True
-            page.update()
+            show_export_snack(f"Error al exportar: {exc}", ft.Colors.RED_600, 5000)
+            return
+
+        cancelar = threading.Event()
+        exportacion["cancelar"] = cancelar
+        export_dialog.open = False
+        export_label.value = "Preparando exportación…"
+        export_bar.value = None
+        export_status.visible = True
+        page.update()
+
+        def progreso(etapa: str, hechas: int, total: int, fraccion: float):
+            def pintar():
+                if cancelar.is_set():
+                    return
+                if etapa in ("Libro Diario", "Libro Mayor"):
+                    export_label.value = f"{etapa}: {hechas}/{total} líneas"
+                else:
+                    export_label.value = f"{etapa}…"
+                export_bar.value = fraccion
+                try:
+                    page.update()
+                except Exception:
+                    pass
+            _run_on_ui(pintar)
+
+        def on_export_finish(error: Exception | None):
+            exportacion["cancelar"] = None
+            export_status.visible = False
+            if error is None:
+                show_export_snack(f"Exportado exitosamente: {output_path.name}", ft.Colors.GREEN_600)
+            elif isinstance(error, ExportacionCancelada):
+                show_export_snack("Exportación cancelada.", ft.Colors.GREY_700, 3000)
+            else:
+                show_export_snack(f"Error al exportar: {error}", ft.Colors.RED_600, 5000)
+
+        def thread_target():
+            error = None
+            try:
+                exportar_libro_diario(
+                    libro_diario.id_libro_diario,
+                    output_path,
+                    db_path=obtener_contexto().db_path,
+                    progreso=progreso,
+                    cancelar=cancelar,
+                )
+            except Exception as exc:
+                error = exc
+            finally:
+                # Las conexiones compartidas son por hilo: las de este mueren con él
+                cerrar_conexiones()
+            _run_on_ui(lambda: on_export_finish(error))
+
+        threading.Thread(target=thread_target, daemon=True).start()
 
     def open_browse(e):
         dest = pick_directory_with_tk()
@@ -667,14 +980,16 @@ def book_journal_page(page: ft.Page, empresa: str = "", contador: str = "", anio
             page.snack_bar.open = True
             page.update()
 
-    def show_filter_placeholder(_e=None):
-        page.snack_bar = ft.SnackBar(content=ft.Text("Filtro en construcción"), duration=2500)
-        page.snack_bar.open = True
+    def show_filter_panel(_e=None):
+        # Abre el Libro Diario con el panel de filtros desplegado
+        current_tab["name"] = "diario"
+        page_main.controls[1] = contenido(page, libro=libro_diario, filtros_abiertos=True)
         page.update()
 
     # Use the sliding drawer style from menulateral_demo.py but keep our options
     destinations = [
         {"label": "Ver plan de cuentas", "icon": ft.Icons.ACCOUNT_BALANCE_OUTLINED, "selected_icon": ft.Icons.ACCOUNT_BALANCE, "action": navigate_to_plan_cuentas , "selectable": True},
+        {"label": "Filtrar asientos", "icon": ft.Icons.FILTER_LIST, "selected_icon": ft.Icons.FILTER_LIST, "action": show_filter_panel, "selectable": False},
         {"label": "Exportar a Excel", "icon": ft.Icons.FILE_DOWNLOAD, "selected_icon": ft.Icons.FILE_DOWNLOAD, "action": lambda e: open_export_dialog(), "selectable": False},
         {"label": "Salir", "icon": ft.Icons.EXIT_TO_APP_OUTLINED, "selected_icon": ft.Icons.EXIT_TO_APP, "action": navigate_to_menu, "selectable": True},
     ]
@@ -816,6 +1131,7 @@ def book_journal_page(page: ft.Page, empresa: str = "", contador: str = "", anio
             diario_btn,
             mayor_btn,
             ft.Container(expand=True),
+            export_status,
         ], spacing=12, vertical_alignment=ft.CrossAxisAlignment.CENTER),
         height=56,
     )
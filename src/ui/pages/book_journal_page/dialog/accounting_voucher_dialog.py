@@ -1,18 +1,17 @@
 import flet as ft
 from typing import List, Optional
-from datetime import datetime
-import sqlite3
 import asyncio
 import asyncio
 
-from src.utils.paths import get_db_path
-from data.obtenerCuentas import (
-    obtenerTodasCuentasContables,
-    obtenerCuentasContablesPorPlanCuenta,
-    obtenerCuentasContablesGenerales,
-)
+from src.utils.contexto import obtener_contexto
+from data.database.conexion import obtener_conexion
+from data.catalogoCache import CatalogoCuentas, obtenerCatalogo
+from data.guardarAsiento import guardarAsiento
 from data.models.cuenta import CuentaContable
 from data.models.lineaAsiento import LineaAsiento
+from data.models.dinero import Centavos, a_centavos, formatear_monto
+from data.obtenerLineaAsiento import obtenerLineasPorAsientos
+from data.obtenerAsientos import obtenerAsientoParaDiario
 
 
 class VoucherRow:
@@ -42,19 +41,17 @@ class VoucherRow:
     def get_code(self) -> str:
         return (self.code_field.value or '').strip()
 
-    def get_debe(self) -> float:
+    def get_debe(self) -> Centavos:
         try:
-            v = self.debe_field.value or ''
-            return float(v.replace(',', '.')) if v else 0.0
-        except Exception:
-            return 0.0
+            return a_centavos(self.debe_field.value or '')
+        except ValueError:
+            return 0
 
-    def get_haber(self) -> float:
+    def get_haber(self) -> Centavos:
         try:
-            v = self.haber_field.value or ''
-            return float(v.replace(',', '.')) if v else 0.0
-        except Exception:
-            return 0.0
+            return a_centavos(self.haber_field.value or '')
+        except ValueError:
+            return 0
 
 
 class AccountingVoucherDialog:
@@ -65,11 +62,13 @@ class AccountingVoucherDialog:
         self.on_saved = on_saved
 
         # Data
-        self.CUENTAS: List[CuentaContable] = []
+        # Catálogo del plan del libro, tomado de la caché en memoria
+        # (índices por id y por código; no se reconstruye en cada apertura)
+        self.catalogo = CatalogoCuentas(id_plan_cuenta=None)
         try:
-            dbp = get_db_path()
+            dbp = obtener_contexto().db_path
             # Intentar usar el plan de cuentas del libro
-            conn = sqlite3.connect(dbp)
+            conn = obtener_conexion(dbp)
             cur = conn.cursor()
             cur.execute("SELECT COALESCE(id_plan_cuenta, 0) FROM libro_diario WHERE id_libro_diario = ?", (self.id_libro_diario,))
             row = cur.fetchone()
@@ -77,26 +76,14 @@ class AccountingVoucherDialog:
                 plan_id = int(row[0] or 0) if row else 0
             except Exception:
                 plan_id = 0
-            try:
-                conn.close()
-            except Exception:
-                pass
-            if plan_id is None:
-                # Sin plan: todas las cuentas
-                self.CUENTAS = obtenerTodasCuentasContables(dbp)
-            elif plan_id == 0:
-                # Plan General: intentar id=0; si vacío, incluir NULL como general
-                cuentas_plan = obtenerCuentasContablesPorPlanCuenta(dbp, 0) or []
-                self.CUENTAS = cuentas_plan if cuentas_plan else obtenerCuentasContablesGenerales(dbp)
-            else:
-                # Plan específico: NO hacer fallback a todas; si vacío, dejar sin sugerencias
-                cuentas_plan = obtenerCuentasContablesPorPlanCuenta(dbp, plan_id) or []
-                self.CUENTAS = cuentas_plan
+            # Plan específico: NO hacer fallback a todas; si vacío, dejar sin sugerencias
+            self.catalogo = obtenerCatalogo(dbp, plan_id)
         except Exception:
             try:
-                self.CUENTAS = obtenerTodasCuentasContables(get_db_path())
+                self.catalogo = obtenerCatalogo(obtener_contexto().db_path, None)
             except Exception:
-                self.CUENTAS = []
+                pass
+        self.CUENTAS: List[CuentaContable] = self.catalogo.cuentas
 
         # UI refs
         self.dialog: Optional[ft.AlertDialog] = None
@@ -175,40 +162,22 @@ class AccountingVoucherDialog:
         self.page.on_pointer_down = _page_pointer_down
 
     def buscar_cuentas_por_codigo(self, query: str, max_items: int = 50):
-        q = (query or "").strip().lower()
+        q = (query or "").strip()
         if not q:
             return self.CUENTAS[:max_items]
 
-        # Si el usuario escribe prefijo jerárquico (ej: "2." o "2.1."), filtrar sólo códigos que comienzan con ese prefijo
-        def is_hierarchical_prefix(s: str) -> bool:
-            return "." in s or s.endswith(".") or s.isdigit()
-
-        hierarchical = is_hierarchical_prefix(q)
-        scored = []
-        for c in self.CUENTAS:
-            codigo = (c.codigo_cuenta or "").lower()
-            nombre = (c.nombre_cuenta or "").lower()
-            s = 0
-            if hierarchical:
-                # Coincidencia estricta de prefijo al inicio del código
-                if codigo.startswith(q):
-                    s = 80 if codigo != q else 100
-            else:
-                # Búsqueda flexible si no parece prefijo jerárquico
-                if codigo == q:
-                    s = 100
-                elif codigo.startswith(q):
-                    s = 70
-                elif q in codigo:
-                    s = 40
-                elif q in nombre:
-                    s = 15
-            if s > 0:
-                scored.append((s, c))
-
-        # Ordenar por score y por código para estabilidad
-        scored.sort(key=lambda x: ( -x[0], (x[1].codigo_cuenta or "") ))
-        return [c for _, c in scored[:max_items]]
+        # Índices del catálogo del plan (compartido entre diálogos): código exacto,
+        # prefijo de código por bisect y, si no parece un código, palabras del nombre
+        exacta = self.catalogo.buscar_por_codigo(q)
+        resultado = [exacta] if exacta else []
+        for c in self.catalogo.buscar_por_prefijo(q, max_items + 1):
+            if c is not exacta:
+                resultado.append(c)
+        hierarchical = "." in q or q.isdigit()
+        if not hierarchical and len(resultado) < max_items:
+            vistos = {id(c) for c in resultado}
+            resultado.extend(c for c in self.catalogo.buscar_por_nombre(q, max_items) if id(c) not in vistos)
+        return resultado[:max_items]
 
     def show_overlay(self, idx: int, items: List[ft.Control]):
         ROW_H = 64
@@ -286,8 +255,8 @@ class AccountingVoucherDialog:
     def recalc_totals(self):
         total_debe = sum(r.get_debe() for r in self.rows)
         total_haber = sum(r.get_haber() for r in self.rows)
-        self.total_debe_text.value = f"{total_debe:.2f}"
-        self.total_haber_text.value = f"{total_haber:.2f}"
+        self.total_debe_text.value = formatear_monto(total_debe)
+        self.total_haber_text.value = formatear_monto(total_haber)
         if not self.suspend_updates:
             self.total_debe_text.update(); self.total_haber_text.update()
 
@@ -347,7 +316,7 @@ class AccountingVoucherDialog:
             else:
                 self.hide_overlay()
             codigo_actual = (tf_codigo.value or '').strip()
-            encontrada = next((c for c in self.CUENTAS if (c.codigo_cuenta or '').strip() == codigo_actual), None) if codigo_actual else None
+            encontrada = self.catalogo.buscar_por_codigo(codigo_actual) if codigo_actual else None
             if encontrada:
                 tipo_encontrada = getattr(encontrada, 'nombre_tipo_cuenta', '') or ''
                 actualizar_nombre(encontrada.nombre_cuenta or '', tipo_encontrada)
@@ -381,8 +350,8 @@ class AccountingVoucherDialog:
         if prefill is not None:
             # Montos
             try:
-                row_obj.debe_field.value = f"{float(prefill.debe or 0):.2f}"
-                row_obj.haber_field.value = f"{float(prefill.haber or 0):.2f}"
+                row_obj.debe_field.value = formatear_monto(prefill.debe)
+                row_obj.haber_field.value = formatear_monto(prefill.haber)
                 if not self.suspend_updates:
                     row_obj.debe_field.update(); row_obj.haber_field.update()
             except Exception:
@@ -392,7 +361,7 @@ class AccountingVoucherDialog:
             if prefill.cuenta_contable:
                 cuenta = prefill.cuenta_contable
             elif getattr(prefill, 'id_cuenta_contable', 0):
-                cuenta = next((c for c in self.CUENTAS if c.id_cuenta_contable == prefill.id_cuenta_contable), None)
+                cuenta = self.catalogo.por_id.get(prefill.id_cuenta_contable)
             if cuenta:
                 tipo = getattr(cuenta, 'nombre_tipo_cuenta', '') or ''
                 tipo_color = self.TIPO_COLORES.get(tipo, ft.Colors.BLUE_600) if tipo else ft.Colors.GREY_500
@@ -473,17 +442,23 @@ class AccountingVoucherDialog:
         used_rows = []
         for r in self.rows:
             code = r.get_code()
-            d = r.get_debe()
-            h = r.get_haber()
-            if code:
-                used_rows.append((code, d, h))
+            if not code:
+                continue
+            # get_debe/get_haber toman un monto ilegible como 0 (sirven para los totales en vivo)
+            for campo in (r.debe_field, r.haber_field):
+                try:
+                    a_centavos(campo.value or '')
+                except ValueError as e:
+                    self.error_text.value = f"Cuenta {code}: {e}"; self.error_text.update(); return False
+            used_rows.append((code, r.get_debe(), r.get_haber()))
         if len(used_rows) < 2:
             self.error_text.value = "Debe ingresar al menos 2 cuentas con código."; self.error_text.update(); return False
         for code, d, h in used_rows:
             if d <= 0 and h <= 0:
                 self.error_text.value = f"La cuenta {code} debe tener un valor en Debe o Haber."; self.error_text.update(); return False
-        debe = float((self.total_debe_text.value or "0").replace(',', '.'))
-        haber = float((self.total_haber_text.value or "0").replace(',', '.'))
+        # Comparación exacta en centavos, sin tolerancias de punto flotante
+        debe = sum(d for _, d, _ in used_rows)
+        haber = sum(h for _, _, h in used_rows)
         if debe != haber:
             self.error_text.value = "El comprobante no está balanceado. El total del Debe debe ser igual al total del Haber."; self.error_text.update(); return False
         self.error_text.value = ""; self.error_text.update(); return True
@@ -500,7 +475,7 @@ class AccountingVoucherDialog:
             if r.cuenta and getattr(r.cuenta, 'id_cuenta_contable', 0):
                 id_cuenta = int(r.cuenta.id_cuenta_contable)
             else:
-                encontrada = next((c for c in self.CUENTAS if (c.codigo_cuenta or '').strip() == code), None)
+                encontrada = self.catalogo.buscar_por_codigo(code)
                 if encontrada:
                     id_cuenta = int(getattr(encontrada, 'id_cuenta_contable', 0) or 0)
             rows.append(
@@ -515,105 +490,46 @@ class AccountingVoucherDialog:
             )
         return rows
 
-    def save(self):
+    def save(self) -> Optional[dict]:
+        """Guarda el asiento y devuelve su versión para el diario (ver obtenerAsientoParaDiario)."""
         if not self.validate():
-            return
+            return None
         lines = self._collect_rows()
-        total_debe = sum(l.debe for l in lines)
-        total_haber = sum(l.haber for l in lines)
 
-        # Construir fecha usando año/mes del libro_diario
+        # Día dentro del período del libro (año/mes los pone guardarAsiento)
         raw_day = (self.dia_field.value or '').strip()
-        day_int = None
-        if raw_day.isdigit():
-            day_int = max(1, min(31, int(raw_day)))
-        # Obtener año y mes desde libro_diario
-        db_path = get_db_path()
-        conn_tmp = sqlite3.connect(db_path)
-        try:
-            cur_tmp = conn_tmp.cursor()
-            cur_tmp.execute("SELECT ano, id_mes FROM libro_diario WHERE id_libro_diario = ?", (self.id_libro_diario,))
-            row_lib = cur_tmp.fetchone()
-            if row_lib:
-                ano_lib, mes_id = row_lib
-                # Si el día no es válido, usar 1
-                if day_int is None:
-                    day_int = 1
-                # Asegurar mes 1-12
-                mes_num = int(mes_id or 1)
-                mes_num = 1 if mes_num < 1 else (12 if mes_num > 12 else mes_num)
-                fecha_str = f"{int(ano_lib):04d}-{mes_num:02d}-{int(day_int):02d}"
-            else:
-                # Fallback a hoy si no se encuentra el libro
-                today = datetime.now()
-                fecha_str = today.strftime("%Y-%m-%d")
-        except Exception:
-            today = datetime.now()
-            fecha_str = today.strftime("%Y-%m-%d")
-        finally:
-            try:
-                conn_tmp.close()
-            except Exception:
-                pass
+        day_int = max(1, min(31, int(raw_day))) if raw_day.isdigit() else None
         descripcion = (self.comentario_field.value or '').strip() or "(Sin descripción)"
 
-        conn = sqlite3.connect(db_path)
-        cur = conn.cursor()
-
         # Mapear códigos a id_cuenta_contable (respaldo)
-        cuenta_map = { (c.codigo_cuenta or '').strip(): c.id_cuenta_contable for c in self.CUENTAS }
-
-        try:
-            if self.asiento_id:
-                # Actualizar asiento + reemplazar líneas
-                cur.execute("UPDATE asiento SET fecha = ?, descripcion = ? WHERE id_asiento = ?", (fecha_str, descripcion, self.asiento_id))
-                # Obtener totales anteriores
-                cur.execute("SELECT COALESCE(SUM(debe),0), COALESCE(SUM(haber),0) FROM linea_asiento WHERE id_asiento = ?", (self.asiento_id,))
-                old_debe, old_haber = cur.fetchone() or (0.0, 0.0)
-                cur.execute("DELETE FROM linea_asiento WHERE id_asiento = ?", (self.asiento_id,))
-                for ln in lines:
-                    id_cuenta = ln.id_cuenta_contable or cuenta_map.get((ln.cuenta_contable.codigo_cuenta if ln.cuenta_contable else '').strip(), 0)
-                    if not id_cuenta:
-                        continue
-                    cur.execute(
-                        "INSERT INTO linea_asiento (id_asiento, debe, haber, id_cuenta_contable) VALUES (?, ?, ?, ?)",
-                        (self.asiento_id, ln.debe, ln.haber, id_cuenta)
-                    )
-                # Ajuste delta a libro
-                delta_debe = total_debe - (old_debe or 0.0)
-                delta_haber = total_haber - (old_haber or 0.0)
-                cur.execute("UPDATE libro_diario SET total_debe = total_debe + ?, total_haber = total_haber + ? WHERE id_libro_diario = ?", (delta_debe, delta_haber, self.id_libro_diario))
-            else:
-                # Crear asiento nuevo con numero_asiento secuencial dentro del libro
-                cur.execute("SELECT COALESCE(MAX(numero_asiento), 0) FROM asiento WHERE id_libro_diario = ?", (self.id_libro_diario,))
-                last_num = cur.fetchone()[0] if cur.fetchone() is None else 0
-                # fetchone was consumed above; re-run properly
-                cur.execute("SELECT COALESCE(MAX(numero_asiento), 0) FROM asiento WHERE id_libro_diario = ?", (self.id_libro_diario,))
-                row_max = cur.fetchone()
-                next_num = int((row_max[0] or 0)) + 1 if row_max else 1
-                cur.execute("INSERT INTO asiento (id_libro_diario, fecha, numero_asiento, descripcion) VALUES (?, ?, ?, ?)", (self.id_libro_diario, fecha_str, next_num, descripcion))
-                new_id = cur.lastrowid
-                for ln in lines:
-                    id_cuenta = ln.id_cuenta_contable or cuenta_map.get((ln.cuenta_contable.codigo_cuenta if ln.cuenta_contable else '').strip(), 0)
-                    if not id_cuenta:
-                        continue
-                    cur.execute(
-                        "INSERT INTO linea_asiento (id_asiento, debe, haber, id_cuenta_contable) VALUES (?, ?, ?, ?)",
-                        (new_id, ln.debe, ln.haber, id_cuenta)
-                    )
-                cur.execute("UPDATE libro_diario SET total_debe = total_debe + ?, total_haber = total_haber + ? WHERE id_libro_diario = ?", (total_debe, total_haber, self.id_libro_diario))
-            conn.commit()
-        finally:
-            conn.close()
+        def id_por_codigo(codigo: str) -> int:
+            cuenta = self.catalogo.buscar_por_codigo(codigo)
+            return cuenta.id_cuenta_contable if cuenta else 0
+
+        lineas = []
+        for ln in lines:
+            id_cuenta = ln.id_cuenta_contable or id_por_codigo(ln.cuenta_contable.codigo_cuenta if ln.cuenta_contable else '')
+            if id_cuenta:
+                lineas.append((id_cuenta, ln.debe, ln.haber))
+
+        db_path = obtener_contexto().db_path
+        id_guardado = guardarAsiento(db_path, self.id_libro_diario, day_int, descripcion, lineas, id_asiento=self.asiento_id)
+        if id_guardado is None:
+            self.error_text.value = "No se pudo guardar el asiento."
+            self.error_text.update()
+            return None
+        # Solo este asiento se relee; la vista del diario parchea su bloque
+        guardado = obtenerAsientoParaDiario(db_path, id_guardado)
         # Trigger refresh callback if provided
         try:
             if callable(self.on_saved):
-                self.on_saved()
+                self.on_saved(guardado)
         except Exception:
             pass
         if self.dialog:
             self.dialog.open = False
             self.page.update()
+        return guardado
 
     def open(self):
         content_ctrl = self.build_content()
@@ -621,8 +537,8 @@ class AccountingVoucherDialog:
         if self.asiento_id:
             try:
                 self.suspend_updates = True
-                db_path = get_db_path()
-                conn = sqlite3.connect(db_path)
+                db_path = obtener_contexto().db_path
+                conn = obtener_conexion(db_path)
                 cur = conn.cursor()
                 cur.execute("SELECT fecha, descripcion FROM asiento WHERE id_asiento = ?", (self.asiento_id,))
                 row = cur.fetchone()
@@ -635,35 +551,25 @@ class AccountingVoucherDialog:
                     except Exception:
                         pass
                     self.comentario_field.value = descripcion or ''
-                # Cargar líneas con join para obtener código y nombre de cuenta
-                cur.execute(
-                    """
-                    SELECT la.id_cuenta_contable, c.codigo_cuenta, c.nombre_cuenta, la.debe, la.haber
-                    FROM linea_asiento la
-                    LEFT JOIN cuenta_contable c ON c.id_cuenta_contable = la.id_cuenta_contable
-                    WHERE la.id_asiento = ?
-                    ORDER BY la.id_linea_asiento ASC
-                    """,
-                    (self.asiento_id,)
-                )
-                cuenta_por_id = {c.id_cuenta_contable: c for c in self.CUENTAS}
-                lines = cur.fetchall() or []
-                if not lines:
-                    pass
+                # Cargar líneas (con su cuenta) en una sola consulta
+                lines = obtenerLineasPorAsientos(db_path, [self.asiento_id]).get(self.asiento_id, [])
+                cuenta_por_id = self.catalogo.por_id
                 # Limpiar filas iniciales, recrear con datos
                 self.rows.clear()
                 filas_column = self.filas_column or content_ctrl.content.controls[2].content.controls[0].controls[0]
                 filas_column.controls.clear()
-                for idx, (id_cuenta, codigo, nombre, d, h) in enumerate(lines):
+                for idx, ln in enumerate(lines):
+                    id_cuenta = ln.id_cuenta_contable
+                    codigo = ln.codigo_cuenta
                     cuenta = cuenta_por_id.get(id_cuenta) if id_cuenta else (
-                        next((c for c in self.CUENTAS if (c.codigo_cuenta or '').strip() == (codigo or '').strip()), None)
+                        self.catalogo.buscar_por_codigo(codigo)
                     )
                     prefill = LineaAsiento(
                         id_linea_asiento=0,
                         id_asiento=self.asiento_id or 0,
                         id_cuenta_contable=id_cuenta or (cuenta.id_cuenta_contable if cuenta else 0),
-                        debe=float(d or 0),
-                        haber=float(h or 0),
+                        debe=int(ln.debe or 0),
+                        haber=int(ln.haber or 0),
                         cuenta_contable=cuenta
                     )
                     fila = self._fila(idx, prefill=prefill, prefill_code=(codigo or '').strip() or None)
@@ -676,11 +582,6 @@ class AccountingVoucherDialog:
                 self.recalc_totals()
             except Exception:
                 self.suspend_updates = False
-            finally:
-                try:
-                    conn.close()
-                except Exception:
-                    pass
 
         self.dialog = ft.AlertDialog(
             title=ft.Text('Comprobante contable', color=ft.Colors.BLACK, size=18, weight=ft.FontWeight.BOLD),
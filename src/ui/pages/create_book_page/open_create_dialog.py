@@ -4,7 +4,7 @@ from data.models.mes import Mes
 from data.obtenerMeses import obtenerMeses
 from data.obternet_plan_cuentas import obtenerTodosPlanesCuentas
 from data.models.plan_cuenta import PlanCuenta
-from src.utils.paths import get_db_path
+from src.utils.contexto import obtener_contexto
 from src.ui.pages.book_journal_page.book_journal_page import create_journal_book, agregar_libro, book_journal_page
 
 
@@ -55,7 +55,7 @@ def open_create_dialog(page: ft.Page):
         )
 
     # Plan de cuentas: cargar desde BD, default "General" (id=0)
-    planes: list[PlanCuenta] = obtenerTodosPlanesCuentas(get_db_path())
+    planes: list[PlanCuenta] = obtenerTodosPlanesCuentas(obtener_contexto().db_path)
     plan_options = [ft.dropdown.Option(str(p.id_plan_cuenta), p.nombre_plan_cuenta) for p in planes]
     # Asegurar que siempre haya opción General (id=0)
     if not any(str(p.id_plan_cuenta) == "0" for p in planes):
@@ -104,7 +104,7 @@ def open_create_dialog(page: ft.Page):
                     id_mes = meses_map.get(str(mes_val).strip().lower(), 0)
 
                 libro = create_journal_book(empresa, contador, anio, id_mes, plan_id=plan_int, origen="creado")
-                new_id = agregar_libro(libro, get_db_path())
+                new_id = agregar_libro(libro, obtener_contexto().db_path)
                 if isinstance(new_id, int):
                     # Navegación sin router: limpiar y renderizar la vista del libro
                     try:
@@ -1,18 +1,27 @@
+from __future__ import annotations
+
 import flet as ft
-import sqlite3
 from pathlib import Path
-import pandas as pd
 import threading
 import time
+from typing import TYPE_CHECKING
 
 # Tus importaciones personalizadas
 from src.ui.components.backgrounds import create_modern_background
+from src.ui.components.busqueda_asientos import create_busqueda_asientos
 from src.ui.pages.menu_page.title_buttons import title_buttons
 from src.ui.pages.menu_page.title_viewfiles import title_viewfiles
 from src.ui.pages.menu_page.title_menu import titlemenu
 from src.ui.pages.book_journal_page.book_journal_page import book_journal_page, create_journal_book, agregar_libro
-from src.utils.paths import get_db_path
+from src.utils.contexto import obtener_contexto
+from data.database.conexion import cerrar_conexiones, obtener_conexion
+from data.catalogoCache import invalidarCatalogo
 from data.planCuentasOps import crear_plan_cuenta
+from data.models.dinero import a_centavos
+
+if TYPE_CHECKING:
+    # pandas se importa al procesar un Excel, no al abrir el menú
+    import pandas as pd
 
 
 def menu_page(page: ft.Page):
@@ -113,8 +122,7 @@ def menu_page(page: ft.Page):
     # --- 4. LÓGICA PESADA (EJECUTADA EN SEGUNDO PLANO) ---
     def _get_plan_id_by_name(db_path: str, plan_name: str) -> int | None:
         try:
-            conn = sqlite3.connect(db_path)
-            cur = conn.cursor()
+            cur = obtener_conexion(db_path).cursor()
             cur.execute(
                 "SELECT id_plan_cuenta FROM plan_cuentas WHERE nombre_plan_cuentas = ?",
                 (plan_name.strip(),),
@@ -123,13 +131,9 @@ def menu_page(page: ft.Page):
             return int(row[0]) if row else None
         except Exception:
             return None
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
 
     def _load_plan_sheet(file_path: str) -> pd.DataFrame | None:
+        import pandas as pd
         try:
             xl = pd.ExcelFile(file_path)
             if "Plan de Cuentas" in xl.sheet_names:
@@ -173,9 +177,8 @@ def menu_page(page: ft.Page):
         gen_map: dict[str, int] = {}
         cuenta_map: dict[str, int] = {}
 
+        conn = obtener_conexion(db_path)
         try:
-            conn = sqlite3.connect(db_path)
-            conn.execute("PRAGMA busy_timeout=3000")
             cur = conn.cursor()
 
             for _, row in plan_df.iterrows():
@@ -264,13 +267,10 @@ def menu_page(page: ft.Page):
                             cuenta_map[cuenta_code] = int(cur.lastrowid or 0)
 
             conn.commit()
+            invalidarCatalogo(db_path)
         except Exception as ex:
             print(f"Error creando plan desde Excel: {ex}")
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+            conn.rollback()
 
         return plan_id, cuenta_map
 
@@ -280,6 +280,7 @@ def menu_page(page: ft.Page):
         Se ejecutará en un hilo aparte para no congelar la UI.
         """
         try:
+            import pandas as pd
             print(f"[THREAD] Leyendo Excel: {file_path}")
             df = pd.read_excel(file_path, header=None)
             
@@ -336,17 +337,17 @@ def menu_page(page: ft.Page):
             cuenta_map_from_plan: dict[str, int] = {}
             if plan_df is not None:
                 plan_name_final = (plan_name or "").strip() or Path(file_path).stem
-                plan_id, cuenta_map_from_plan = _create_plan_from_sheet(get_db_path(), plan_name_final, plan_df)
+                plan_id, cuenta_map_from_plan = _create_plan_from_sheet(obtener_contexto().db_path, plan_name_final, plan_df)
 
             # --- Crear Libro en BD ---
             libro = create_journal_book(empresa, contador_val, str(ano or ""), id_mes, plan_id=plan_id, origen="importado", fecha_importacion=sello_import)
-            libro_id = agregar_libro(libro, get_db_path(), allow_duplicates=True)
+            libro_id = agregar_libro(libro, obtener_contexto().db_path, allow_duplicates=True)
             
             if not isinstance(libro_id, int):
                 return {"error": "No se pudo crear el libro en la BD"}
 
             # --- INSERCIÓN DE ASIENTOS (OPTIMIZADO CON TRANSACCIÓN) ---
-            conn = sqlite3.connect(get_db_path())
+            conn = obtener_conexion(obtener_contexto().db_path)
             cur = conn.cursor()
             
             # Cargar mapa de cuentas
@@ -362,8 +363,8 @@ def menu_page(page: ft.Page):
             try:
                 numero_asiento = 1
                 asiento_id = None
-                total_debe = 0.0
-                total_haber = 0.0
+                total_debe = 0
+                total_haber = 0
 
                 for idx in range(start_row, len(df)):
                     fecha_cell = df.iloc[idx, 0]
@@ -403,8 +404,11 @@ def menu_page(page: ft.Page):
 
                         id_cuenta = cuenta_map.get(str(codigo).strip())
                         if id_cuenta:
-                            d_val = float(debe or 0)
-                            h_val = float(haber or 0)
+                            try:
+                                d_val = a_centavos(debe)
+                                h_val = a_centavos(haber)
+                            except ValueError as e:
+                                raise ValueError(f"fila {idx + 1}: {e}") from e
                             cur.execute(
                                 "INSERT INTO linea_asiento (id_asiento, debe, haber, id_cuenta_contable) VALUES (?, ?, ?, ?)",
                                 (asiento_id, d_val, h_val, id_cuenta)
@@ -423,10 +427,8 @@ def menu_page(page: ft.Page):
             
             except Exception as e:
                 conn.rollback()
-                conn.close()
                 return {"error": f"Error SQL durante la importación: {e}"}
-            
-            conn.close()
+
             return {"success": True, "libro_id": libro_id}
 
         except Exception as ex:
@@ -459,7 +461,11 @@ def menu_page(page: ft.Page):
         import_finish_handler["fn"] = on_thread_finish
 
         def thread_target():
-            res = procesar_excel_en_hilo(file_path, plan_name=plan_name)
+            try:
+                res = procesar_excel_en_hilo(file_path, plan_name=plan_name)
+            finally:
+                # Las conexiones compartidas son por hilo: las de este mueren con él
+                cerrar_conexiones()
             call_from_thread = getattr(page, "call_from_thread", None)
             if callable(call_from_thread):
                 call_from_thread(lambda: on_thread_finish(res))
@@ -576,6 +582,14 @@ def menu_page(page: ft.Page):
     
     # Pasar la función al botón
     buttons_content = title_buttons(open_file_explorer, page)
+
+    # Búsqueda de asientos en todos los libros: abre el libro del asiento elegido
+    def abrir_libro_de_asiento(asiento: dict):
+        page.clean()
+        page.add(book_journal_page(page, libro_id=asiento["id_libro_diario"]))
+        page.update()
+
+    busqueda = create_busqueda_asientos(page, on_select=abrir_libro_de_asiento, hint_text="Buscar asientos en todos los libros…")
     
     # Contenido visual
     fondo = create_modern_background(page)
@@ -597,6 +611,7 @@ def menu_page(page: ft.Page):
                         expand=True,
                     ),
                 ),
+                busqueda,
                 # Lista de archivos recientes
                 title_viewfiles(page),
             ],
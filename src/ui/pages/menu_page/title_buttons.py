@@ -2,7 +2,7 @@ import flet as ft
 from src.ui.components.widgets.buttons import create_image_button
 from src.ui.pages.account_list_page.account_list_page import account_list_page
 from data.obternet_plan_cuentas import obtenerTodosPlanesCuentas
-from src.utils.paths import get_db_path
+from src.utils.contexto import obtener_contexto
 
 # Import opcional con fallback durante la migración
 try:
@@ -45,7 +45,7 @@ def title_buttons(open_file_explorer_callback=None, page: ft.Page = None):
         if p is None:
             return
         try:
-            planes = obtenerTodosPlanesCuentas(get_db_path())
+            planes = obtenerTodosPlanesCuentas(obtener_contexto().db_path)
         except Exception as ex:
             planes = []
             snack = ft.SnackBar(content=ft.Text(f"No se pudieron cargar planes: {ex}"))
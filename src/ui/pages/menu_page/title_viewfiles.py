@@ -8,7 +8,7 @@ try:
     from data.models.libro import LibroDiario  # noqa: F401
     from data.obtenerLibros import obtenerTodosLibros
     from data.eliminarLibro import eliminar_libro_diario
-    from src.utils.paths import get_db_path
+    from src.utils.contexto import obtener_contexto
     DATA_AVAILABLE = True
 except Exception:
     DATA_AVAILABLE = False
@@ -32,7 +32,7 @@ def title_viewfiles(page: ft.Page | None = None):
         libros = []
         if DATA_AVAILABLE:
             try:
-                libros = obtenerTodosLibros(get_db_path())
+                libros = obtenerTodosLibros(obtener_contexto().db_path)
             except Exception as ex:
                 # Mostrar mensaje si hay error consultando datos
                 print(f"Error cargando libros: {ex}")
@@ -62,7 +62,7 @@ def title_viewfiles(page: ft.Page | None = None):
                     def _do_delete(_):
                         ok = False
                         if DATA_AVAILABLE:
-                            ok = eliminar_libro_diario(get_db_path(), l.id_libro_diario)
+                            ok = eliminar_libro_diario(obtener_contexto().db_path, l.id_libro_diario)
                         _close(confirm)
                         if ok:
                             snack = ft.SnackBar(content=ft.Text("Libro eliminado correctamente"))
@@ -0,0 +1,25 @@
+"""
+Medición del tiempo de arranque.
+
+Se importa primero desde main.py, por lo que INICIO marca (aproximadamente)
+el inicio del proceso, antes de cargar flet y el resto de la aplicación.
+"""
+import time
+
+INICIO = time.perf_counter()
+_reportado = False
+
+
+def registrar_primer_render(etapa: str = "primer page.update()") -> float | None:
+    """Imprime una sola vez los ms transcurridos desde INICIO hasta `etapa`.
+
+    Returns:
+        Milisegundos medidos, o None si ya se había reportado
+    """
+    global _reportado
+    if _reportado:
+        return None
+    _reportado = True
+    ms = (time.perf_counter() - INICIO) * 1000
+    print(f"[arranque] {etapa}: {ms:.0f} ms desde el inicio del proceso")
+    return ms
@@ -0,0 +1,39 @@
+"""
+Contexto de la aplicación.
+
+Se crea una sola vez al arrancar (app_entry.main) y guarda lo que antes se
+recalculaba en cada render o diálogo: la ruta resuelta de la BD.
+"""
+import threading
+from dataclasses import dataclass
+
+
+@dataclass
+class ContextoApp:
+    db_path: str
+
+
+_contexto: ContextoApp | None = None
+_lock_contexto = threading.Lock()
+
+
+def iniciar_contexto(db_path: str | None = None) -> ContextoApp:
+    """Crea el contexto global resolviendo la ruta de la BD una única vez."""
+    global _contexto
+    if db_path is None:
+        from src.utils.paths import get_db_path
+        db_path = get_db_path()
+    with _lock_contexto:
+        _contexto = ContextoApp(db_path=db_path)
+    return _contexto
+
+
+def obtener_contexto() -> ContextoApp:
+    """Devuelve el contexto global; lo inicia si todavía no existe (scripts, tests)."""
+    contexto = _contexto
+    if contexto is None:
+        with _lock_contexto:
+            contexto = _contexto
+        if contexto is None:
+            contexto = iniciar_contexto()
+    return contexto
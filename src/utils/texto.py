@@ -0,0 +1,10 @@
+"""
+Normalización de texto para búsquedas en memoria.
+"""
+import unicodedata
+
+
+def normalizar(texto: str | None) -> str:
+    """Minúsculas y sin acentos: 'Depósitos' -> 'depositos'."""
+    texto = unicodedata.normalize("NFKD", (texto or "").casefold())
+    return "".join(ch for ch in texto if not unicodedata.combining(ch))
@@ -0,0 +1,30 @@
+import unittest
+
+from data.models.dinero import a_centavos, formatear_monto
+
+
+class ACentavosTest(unittest.TestCase):
+
+    def test_separadores(self):
+        casos = {
+            "12,5": 1250, "12.50": 1250, "1.234,50": 123450, "1,234.50": 123450,
+            "-1.234,5": -123450, "1.234.567": 123456700, "0,125": 13, "1234.567": 123457,
+            "": 0, None: 0, 1.5: 150,
+        }
+        for valor, esperado in casos.items():
+            with self.subTest(valor=valor):
+                self.assertEqual(a_centavos(valor), esperado)
+
+    def test_rechaza_ambiguos_e_invalidos(self):
+        for valor in ("1,234", "1.234", "-9.999", "1.23.4", "12,34.5", "1.2,3", "abc"):
+            with self.subTest(valor=valor):
+                with self.assertRaises(ValueError):
+                    a_centavos(valor)
+
+    def test_ida_y_vuelta(self):
+        for centavos in (0, 5, 123450, -98765432):
+            self.assertEqual(a_centavos(formatear_monto(centavos, miles=True)), centavos)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+import sqlite3
+import unittest
+
+from data.database.orden import clave_orden, sql_clave_orden
+
+
+class ClaveOrdenTest(unittest.TestCase):
+    """La clave de Python y la expresión de los triggers deben coincidir."""
+
+    CODIGOS = [
+        "1.1.10.02", "1.2", "1.10", "", " 1.2 ", "1..2", "a.b", "1.", ".1", "-5.3", "+3.04",
+        " 12abc.\t7", "1.2.3.4.5.6.7.8.9.10", "99999999999999999999.1", None, 5, 1.1,
+    ]
+
+    def test_sql_igual_a_python(self):
+        conn = sqlite3.connect(":memory:")
+        consulta = f"SELECT {sql_clave_orden('?')}"
+        for codigo in self.CODIGOS:
+            with self.subTest(codigo=codigo):
+                self.assertEqual(conn.execute(consulta, (codigo,)).fetchone()[0], clave_orden(codigo))
+        conn.close()
+
+    def test_orden_natural(self):
+        codigos = ["1.10", "1.2.1", "2", "1.2", "1.1.10.02", "1.1.9"]
+        self.assertEqual(sorted(codigos, key=clave_orden), ["1.1.9", "1.1.10.02", "1.2", "1.2.1", "1.10", "2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
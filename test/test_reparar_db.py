@@ -0,0 +1,104 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from data.database.conexion import cerrar_todas_conexiones, obtener_conexion
+from data.database import migraciones
+from data.database.migraciones import VERSION_ESQUEMA, obtener_version
+from data.database.plantilla import estado_db, instalar_plantilla, preparar_db
+
+
+class RepararDbTest(unittest.TestCase):
+    """Reparar una BD ya migrada a la que le faltan asiento y linea_asiento."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.dir.name, "libro.db")
+        self.assertTrue(instalar_plantilla(self.db))
+        conn = obtener_conexion(self.db)
+        self.cuentas = [r[0] for r in conn.execute(
+            "SELECT id_cuenta_contable FROM cuenta_contable ORDER BY id_cuenta_contable LIMIT 2")]
+        with conn:
+            cur = conn.execute(
+                "INSERT INTO libro_diario (id_mes, ano, contador, nombre_empresa, id_plan_cuenta) "
+                "VALUES (1, 2025, 'Contador', 'Empresa', 1)")
+            self.libro = cur.lastrowid
+            self._asiento(conn, 7, "Venta inicial")
+            # Se pierden las tablas de asientos (y con ellas sus índices y triggers)
+            conn.execute("DROP TABLE linea_asiento")
+            conn.execute("DROP TABLE asiento")
+
+    def tearDown(self):
+        cerrar_todas_conexiones()
+        self.dir.cleanup()
+
+    def _asiento(self, conn, numero, descripcion):
+        cur = conn.execute(
+            "INSERT INTO asiento (id_libro_diario, fecha, numero_asiento, descripcion) VALUES (?, '2025-01-10', ?, ?)",
+            (self.libro, numero, descripcion))
+        conn.executemany(
+            "INSERT INTO linea_asiento (id_asiento, debe, haber, id_cuenta_contable) VALUES (?, ?, ?, ?)",
+            [(cur.lastrowid, 12550, 0, self.cuentas[0]), (cur.lastrowid, 0, 12550, self.cuentas[1])])
+        return cur.lastrowid
+
+    def test_reparar_restaura_indices_y_triggers(self):
+        self.assertEqual(estado_db(self.db), "incompleta")
+        self.assertTrue(preparar_db(self.db))
+        self.assertEqual(estado_db(self.db), "ok")
+
+        conn = obtener_conexion(self.db)
+        self.assertEqual(obtener_version(conn), VERSION_ESQUEMA)
+        indices = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertTrue({"idx_linea_asiento_asiento", "idx_linea_asiento_cuenta", "idx_asiento_libro_fecha"} <= indices)
+
+        # Las líneas borradas ya no cuentan en los saldos
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM saldo_cuenta_libro").fetchone()[0], 0)
+
+        with conn:
+            id_asiento = self._asiento(conn, 3, "Cobro de factura")
+
+        saldos = conn.execute(
+            "SELECT id_cuenta_contable, debe, haber, movimientos FROM saldo_cuenta_libro "
+            "WHERE id_libro_diario = ? ORDER BY id_cuenta_contable", (self.libro,)).fetchall()
+        self.assertEqual(saldos, [(self.cuentas[0], 12550, 0, 1), (self.cuentas[1], 0, 12550, 1)])
+
+        encontrados = conn.execute("SELECT rowid FROM asiento_fts WHERE asiento_fts MATCH 'factura'").fetchall()
+        self.assertEqual(encontrados, [(id_asiento,)])
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM asiento_fts WHERE asiento_fts MATCH 'venta'").fetchone()[0], 0)
+
+        # El contador no retrocede a números ya usados y el trigger lo sigue manteniendo
+        ultimo = "SELECT ultimo_numero_asiento FROM libro_diario WHERE id_libro_diario = ?"
+        self.assertEqual(conn.execute(ultimo, (self.libro,)).fetchone()[0], 7)
+        with conn:
+            self._asiento(conn, 9, "Pago a proveedor")
+        self.assertEqual(conn.execute(ultimo, (self.libro,)).fetchone()[0], 9)
+
+
+class MigracionFallidaTest(unittest.TestCase):
+    """Una migración que falla no debe dar la BD por lista."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.dir.name, "libro.db")
+        self.assertTrue(instalar_plantilla(self.db))
+        obtener_conexion(self.db).execute(f"PRAGMA user_version = {VERSION_ESQUEMA - 1}")
+
+    def tearDown(self):
+        cerrar_todas_conexiones()
+        self.dir.cleanup()
+
+    def test_preparar_db_informa_la_falla(self):
+        def bloqueada(_cursor):
+            raise sqlite3.OperationalError("database is locked")
+
+        ultima = [(VERSION_ESQUEMA, bloqueada)]
+        with mock.patch.object(migraciones, "MIGRACIONES", migraciones.MIGRACIONES[:-1] + ultima):
+            self.assertFalse(preparar_db(self.db))
+        self.assertEqual(obtener_version(obtener_conexion(self.db)), VERSION_ESQUEMA - 1)
+        self.assertTrue(preparar_db(self.db))
+
+
+if __name__ == "__main__":
+    unittest.main()